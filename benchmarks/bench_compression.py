@@ -0,0 +1,78 @@
+"""
+Compression ratio and speed per encoding and level on real tool results.
+
+Payloads are MCP tool results as they go over HTTP (the CallToolResult
+JSON): one enhance_with_breed_aesthetic result, enhancement results for
+every breed in one response (the size of a batch call), a 200-breed
+catalog page and a 24-frame interpolation. For each gzip level, and each
+zstd level when zstd is available, prints the compression ratio, the
+time to compress and the throughput, to choose the levels and the size
+threshold used by CompressionMiddleware.
+
+Usage:
+    python benchmarks/bench_compression.py
+    python benchmarks/bench_compression.py --repeat 50
+"""
+
+import argparse
+import time
+
+from mcp.types import CallToolResult, TextContent
+
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.breed_data import get_database
+from dog_breed_aesthetics_mcp.compression import GzipStream, ZstdStream, available_encodings
+from dog_breed_aesthetics_mcp.encoding import dumps
+
+GZIP_LEVELS = (1, 3, 5, 6, 9)
+ZSTD_LEVELS = (1, 3, 6, 9, 12, 19)
+
+
+def _wire(result):
+    message = CallToolResult(content=[TextContent(type="text", text=dumps(result))], structuredContent=result)
+    return message.model_dump_json(by_alias=True, exclude_none=True).encode()
+
+
+def _payloads():
+    enhance = server.enhance_with_breed_aesthetic
+    return [
+        ("enhance (1 breed)", _wire(enhance("Greyhound", "a quiet harbour at dawn"))),
+        # Database keys, not display names: names such as "Poodle (Standard)" do not resolve
+        ("enhance (all breeds)", _wire({"results": [enhance(key, "a quiet harbour at dawn") for key in get_database()]})),
+        ("list_breeds_page (200)", _wire(server.list_breeds_page(page_size=200))),
+        ("interpolate (24 frames)", _wire(server.interpolate_breed_aesthetics("Greyhound", "Pug", "a quiet harbour", 24))),
+    ]
+
+
+def _compress(stream_class, level, payload):
+    stream = stream_class(level)
+    return stream.compress(payload) + stream.finish()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    codecs = [("gzip", GzipStream, GZIP_LEVELS)]
+    if "zstd" in available_encodings():
+        codecs.append(("zstd", ZstdStream, ZSTD_LEVELS))
+    else:
+        print("zstd not available (install zstandard); gzip only\n")
+
+    print(f"{'payload':>24}  {'bytes':>8}  {'encoding':>8}  {'level':>5}  {'out_bytes':>9}  "
+          f"{'ratio':>6}  {'compress_us':>11}  {'MB/s':>7}")
+    for payload_name, payload in _payloads():
+        for encoding, stream_class, levels in codecs:
+            for level in levels:
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    compressed = _compress(stream_class, level, payload)
+                seconds = (time.perf_counter() - start) / args.repeat
+                print(f"{payload_name:>24}  {len(payload):>8}  {encoding:>8}  {level:>5}  {len(compressed):>9}  "
+                      f"{len(payload) / len(compressed):>6.1f}  {seconds * 1e6:>11.1f}  "
+                      f"{len(payload) / seconds / 1e6:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
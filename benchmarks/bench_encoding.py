@@ -0,0 +1,82 @@
+"""
+Tool result encoding: FastMCP's default conversion vs the fast JSON path.
+
+For a set of representative tool results, measures the time to turn the
+returned dict into a ToolResult and the size of the resulting
+CallToolResult on the wire, for:
+
+- default: a stock FunctionTool declared to return dict, as the tools
+  were registered before they had typed results
+- fast/json: FastJsonTool with the standard library encoder
+- fast/orjson: FastJsonTool with orjson (skipped if it is not installed)
+
+Usage:
+    python benchmarks/bench_encoding.py
+    python benchmarks/bench_encoding.py --repeat 500
+"""
+
+import argparse
+import inspect
+import time
+
+from fastmcp.tools import FunctionTool
+from mcp.types import CallToolResult
+
+from dog_breed_aesthetics_mcp import encoding, server
+from dog_breed_aesthetics_mcp.encoding import FastJsonTool
+from dog_breed_aesthetics_mcp.models import output_schema
+from bench_scaling import SCORING_PROMPTS
+
+RESULTS = [
+    ("enhance_with_breed_aesthetic", lambda: server.enhance_with_breed_aesthetic("Greyhound", "a quiet harbour")),
+    ("interpolate_breed_aesthetics",
+     lambda: server.interpolate_breed_aesthetics("Greyhound", "Pug", "a quiet harbour", 24)),
+    ("compare_breeds", lambda: server.compare_breeds(["Greyhound", "Pug", "Boxer", "Golden Retriever"])),
+    ("list_breeds_page", lambda: server.list_breeds_page(page_size=50)),
+    ("score_enhanced_prompts", lambda: server.score_enhanced_prompts("Greyhound", SCORING_PROMPTS)),
+]
+
+
+def _wire_bytes(tool_result):
+    content, structured_content = tool_result.to_mcp_result()
+    message = CallToolResult(content=content, structuredContent=structured_content)
+    return len(message.model_dump_json(by_alias=True, exclude_none=True).encode())
+
+
+def _time(convert, result, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        convert(result)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    orjson = encoding.orjson
+    paths = ["default", "fast/json"] + (["fast/orjson"] if orjson is not None else [])
+    print(f"{'tool':>28}  {'path':>12}  {'encode_us':>10}  {'speedup':>8}  {'wire_bytes':>10}")
+    for tool_name, call in RESULTS:
+        fn = getattr(server, tool_name)
+        schema = output_schema(inspect.signature(fn).return_annotation)
+        default_tool = FunctionTool.from_function(fn).model_copy(
+            update={"return_type": dict, "output_schema": {"type": "object", "additionalProperties": True}}
+        )
+        fast_tool = FastJsonTool.from_function(fn, output_schema=schema)
+        result = call()
+
+        baseline = None
+        for path in paths:
+            tool = default_tool if path == "default" else fast_tool
+            encoding.orjson = orjson if path == "fast/orjson" else None
+            seconds = _time(tool.convert_result, result, args.repeat)
+            baseline = baseline or seconds
+            print(f"{tool_name:>28}  {path:>12}  {seconds * 1e6:>10.1f}  {baseline / seconds:>7.1f}x  "
+                  f"{_wire_bytes(tool.convert_result(result)):>10}")
+        encoding.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Memory of the breed database as plain dicts versus a PhraseStore.
+
+For each synthetic catalog size, measures with tracemalloc the bytes held
+by the generated dict database and by a PhraseStore built from it (after
+the dicts are released), plus the cost of decoding a breed on access.
+
+Usage:
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --sizes 1000 10000
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from dog_breed_aesthetics_mcp.phrase_store import PhraseStore
+from dog_breed_aesthetics_mcp.synthetic import BENCHMARK_SIZES, generate_breed_database
+
+
+def _traced(build):
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(BENCHMARK_SIZES))
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    print(f"{'catalog_size':>12}  {'dict_kb':>10}  {'store_kb':>10}  {'ratio':>6}  {'phrases':>8}"
+          f"  {'decode_us':>10}  {'cached_us':>10}")
+    for size in args.sizes:
+        database, dict_bytes = _traced(lambda: generate_breed_database(size))
+
+        def build_store():
+            nonlocal database
+            store = PhraseStore(database, cache_size=0)
+            database = None
+            return store
+        store, store_bytes = _traced(build_store)
+
+        keys = random.Random(0).choices(list(store), k=args.lookups)
+        start = time.perf_counter()
+        for breed_key in keys:
+            store[breed_key]
+        decode = (time.perf_counter() - start) / len(keys)
+
+        store.decoded.resize(max_entries=len(store))
+        for breed_key in keys:
+            store[breed_key]
+        start = time.perf_counter()
+        for breed_key in keys:
+            store[breed_key]
+        cached = (time.perf_counter() - start) / len(keys)
+
+        print(f"{size:>12}  {dict_bytes // 1024:>10}  {store_bytes // 1024:>10}"
+              f"  {dict_bytes / store_bytes:>5.1f}x  {len(store.phrases):>8}"
+              f"  {decode * 1e6:>10.2f}  {cached * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
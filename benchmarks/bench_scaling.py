@@ -0,0 +1,174 @@
+"""
+Latency and memory of every tool versus catalog size.
+
+Generates synthetic breed databases (see dog_breed_aesthetics_mcp.synthetic),
+swaps each into the server in turn and times the tool functions over
+randomly chosen breeds. Prints one row per (size, tool); pass --csv to
+also write the rows for charting.
+
+Every tool that reads the breed catalog is measured. The rest are listed
+in EXCLUDED_TOOLS with the reason, since their cost does not depend on
+catalog size:
+
+- register/update/delete/list_custom_breeds: work on one tenant's own
+  breeds in SQLite (memory_budget.py measures them)
+- register_synthesis_template, list_synthesis_templates: work on the
+  template registry only
+- configure_profiling, get_admission_metrics, get_cache_stats,
+  configure_caches: admin tools that report or change server settings
+
+A registered tool that is in neither list is reported on stderr.
+
+Usage:
+    python benchmarks/bench_scaling.py
+    python benchmarks/bench_scaling.py --sizes 1000 10000 --calls 200 --csv scaling.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE, set_database
+from dog_breed_aesthetics_mcp.attributes import get_term_index
+from dog_breed_aesthetics_mcp.catalog import get_catalog_index
+from dog_breed_aesthetics_mcp.features import get_feature_table
+from dog_breed_aesthetics_mcp.synthetic import BENCHMARK_SIZES, generate_breed_database
+
+# A batch of 1000 short prompts for score_enhanced_prompts and compile_breed_prompts
+SCORING_PROMPTS = [
+    f"a quiet harbour at dawn, sleek hulls with effortless grace, frame {i}" for i in range(1000)
+]
+
+EXCLUDED_TOOLS = {
+    "register_custom_breed": "tenant breeds in SQLite, independent of the catalog",
+    "update_custom_breed": "tenant breeds in SQLite, independent of the catalog",
+    "delete_custom_breed": "tenant breeds in SQLite, independent of the catalog",
+    "list_custom_breeds": "tenant breeds in SQLite, independent of the catalog",
+    "register_synthesis_template": "template registry only",
+    "list_synthesis_templates": "template registry only",
+    "configure_profiling": "admin",
+    "get_admission_metrics": "admin",
+    "get_cache_stats": "admin",
+    "configure_caches": "admin",
+}
+
+
+def _tool(name):
+    """Return the plain function behind a registered tool"""
+    tool = getattr(server, name)
+    return getattr(tool, "fn", tool)
+
+
+def _tool_calls(database, rng):
+    """(tool name, zero-argument call) pairs with inputs drawn from the database"""
+    names = [breed_data["name"] for breed_data in database.values()]
+
+    def pick():
+        return rng.choice(names)
+
+    # Mirrors that are up to date are the common case
+    version = _tool("get_breed_changes_since")()["version"]
+
+    return [
+        ("list_available_breeds", lambda: _tool("list_available_breeds")()),
+        ("list_breeds_page", lambda: _tool("list_breeds_page")(page_size=50)),
+        ("get_breed_characteristics", lambda: _tool("get_breed_characteristics")(pick())),
+        ("enhance_with_breed_aesthetic", lambda: _tool("enhance_with_breed_aesthetic")(pick(), "a quiet harbour at dawn")),
+        ("interpolate_breed_aesthetics", lambda: _tool("interpolate_breed_aesthetics")(pick(), pick(), "a quiet harbour", 24)),
+        ("compare_breeds", lambda: _tool("compare_breeds")([pick() for _ in range(10)])),
+        ("find_breeds_by_features", lambda: _tool("find_breeds_by_features")(scale_min="small", energy_min="high")),
+        ("select_diverse_breeds", lambda: _tool("select_diverse_breeds")(5, scale_min="small")),
+        ("sample_breeds", lambda: _tool("sample_breeds")(
+            20, seed=rng.randrange(1 << 32), group_weights={"Toy": 3}, base_prompt="a quiet harbour")),
+        ("list_breed_variants", lambda: _tool("list_breed_variants")()),
+        ("get_breed_changes_since", lambda: _tool("get_breed_changes_since")(version)),
+        ("score_enhanced_prompts", lambda: _tool("score_enhanced_prompts")(pick(), SCORING_PROMPTS)),
+        ("compile_breed_prompt", lambda: _tool("compile_breed_prompt")(pick(), "a quiet harbour at dawn")),
+        ("compile_breed_prompts", lambda: _tool("compile_breed_prompts")(pick(), SCORING_PROMPTS)),
+    ]
+
+
+def _unmeasured_tools():
+    """Registered tools neither measured nor listed in EXCLUDED_TOOLS"""
+    registered = {tool.name for tool in asyncio.run(server.mcp.list_tools())}
+    measured = {tool_name for tool_name, _ in _tool_calls(BREED_DATABASE, random.Random(0))}
+    return sorted(registered - measured - set(EXCLUDED_TOOLS))
+
+
+def _measure_build(size, seed):
+    """Return (database, database bytes, index build seconds, index bytes)"""
+    tracemalloc.start()
+    database = generate_breed_database(size, seed=seed) if size else BREED_DATABASE
+    database_bytes = tracemalloc.get_traced_memory()[0]
+
+    set_database(database)
+    start = time.perf_counter()
+    get_term_index()
+    get_feature_table()
+    get_catalog_index()
+    build_seconds = time.perf_counter() - start
+    index_bytes = tracemalloc.get_traced_memory()[0] - database_bytes
+    tracemalloc.stop()
+    return database, database_bytes, build_seconds, index_bytes
+
+
+def run(sizes, calls, seed):
+    rows = []
+    for size in sizes:
+        database, database_bytes, build_seconds, index_bytes = _measure_build(size, seed)
+        rng = random.Random(seed)
+        for tool_name, call in _tool_calls(database, rng):
+            call()  # warm any lazily built state
+            timings = []
+            for _ in range(calls):
+                start = time.perf_counter()
+                call()
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            rows.append({
+                "catalog_size": len(database),
+                "tool": tool_name,
+                "mean_us": round(statistics.fmean(timings) * 1e6, 1),
+                "p95_us": round(timings[int(len(timings) * 0.95) - 1] * 1e6, 1),
+                "database_kb": database_bytes // 1024,
+                "index_kb": index_bytes // 1024,
+                "index_build_ms": round(build_seconds * 1000, 1),
+            })
+    set_database(BREED_DATABASE)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, *BENCHMARK_SIZES],
+                        help="catalog sizes to test; 0 means the built-in database")
+    parser.add_argument("--calls", type=int, default=100, help="timed calls per tool")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="also write results to this CSV file")
+    args = parser.parse_args(argv)
+
+    unmeasured = _unmeasured_tools()
+    if unmeasured:
+        print("not measured or excluded: " + ", ".join(unmeasured), file=sys.stderr)
+    rows = run(args.sizes, args.calls, args.seed)
+
+    columns = list(rows[0])
+    print("  ".join(f"{column:>28}" if column == "tool" else f"{column:>14}" for column in columns))
+    for row in rows:
+        print("  ".join(f"{row[c]:>28}" if c == "tool" else f"{row[c]:>14}" for c in columns))
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Startup time with and without a precompiled index snapshot.
+
+For each catalog size, measures the time from "database available" to
+"first requests answered" on both startup paths:
+
+- rebuild: set_database() then build the term, feature and catalog indexes
+- snapshot: install_snapshot() on a snapshot compiled ahead of time
+
+The first requests are one catalog page, one comparison and one feature
+query, so lazily decoded snapshot data is included in the timing.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --sizes 0 10000 --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from dog_breed_aesthetics_mcp.attributes import get_term_index
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE, get_database, set_database
+from dog_breed_aesthetics_mcp.catalog import get_catalog_index
+from dog_breed_aesthetics_mcp.comparison import compare_breed_keys
+from dog_breed_aesthetics_mcp.features import get_feature_table
+from dog_breed_aesthetics_mcp.snapshot import build_snapshot, install_snapshot
+from dog_breed_aesthetics_mcp.synthetic import BENCHMARK_SIZES, generate_breed_database
+
+
+def _first_requests():
+    breed_keys, _, _ = get_catalog_index().page(page_size=50)
+    compare_breed_keys(breed_keys[:2])
+    get_feature_table().query({"energy": (3.0, None)}, sort_by="scale")
+    get_database()[breed_keys[0]]
+
+
+def _time(start_path, repeat):
+    timings = []
+    for _ in range(repeat):
+        set_database(BREED_DATABASE)  # drop indexes from the previous round
+        start = time.perf_counter()
+        start_path()
+        get_term_index()
+        _first_requests()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, *BENCHMARK_SIZES],
+                        help="catalog sizes to test; 0 means the built-in database")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'catalog_size':>12}  {'rebuild_ms':>12}  {'snapshot_ms':>12}  {'speedup':>8}  {'snapshot_kb':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            database = generate_breed_database(size) if size else BREED_DATABASE
+            path = os.path.join(directory, f"breeds-{size}.snap")
+            build_snapshot(database, path)
+
+            rebuild = _time(lambda: set_database(database), args.repeat)
+            snapshot = _time(lambda: install_snapshot(path), args.repeat)
+            print(
+                f"{len(database):>12}  {rebuild * 1000:>12.1f}  {snapshot * 1000:>12.1f}"
+                f"  {rebuild / snapshot:>7.1f}x  {os.path.getsize(path) // 1024:>12}"
+            )
+    set_database(BREED_DATABASE)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""
+Admission control for tool calls.
+
+AdmissionMiddleware sits in front of every tool and applies, in order:
+
+1. A per-client token bucket: each client may make `rate` calls per
+   second with bursts of up to `burst`. Calls over the limit are rejected
+   immediately with the time until a token is available.
+2. A global concurrency cap: at most `max_concurrent` calls run at once.
+   Further calls wait in a FIFO queue of at most `max_queue` entries for
+   up to `queue_timeout` seconds; when the queue is full, or the wait
+   times out, the call is rejected with an estimated retry-after.
+
+Rejections raise AdmissionRejected, a ToolError, so clients receive an
+error result whose message ends in "retry after N.NN s"; the structured
+hint is in its retry_after attribute. Counters for admitted, queued and
+rejected calls are available from metrics().
+
+Clients are identified by their transport peer: the HTTP peer address,
+or "local" for stdio and in-memory transports, whose calls all come from
+the one process that started the server. Behind a reverse proxy listed in
+`trusted_proxies`, the address it reports in X-Forwarded-For is used
+instead. A client-supplied id (client_id in the request's _meta or the
+X-Client-Id header) only tells apart clients sharing one peer: it picks
+one of MAX_CLIENTS_PER_PEER buckets under that peer, so inventing new ids
+cannot escape the peer's limits or use up another peer's.
+"""
+
+import asyncio
+import time
+import zlib
+from collections import OrderedDict, deque
+
+from fastmcp.exceptions import ToolError
+from fastmcp.server.dependencies import get_http_headers, get_http_request
+from fastmcp.server.middleware import Middleware
+
+MAX_TRACKED_CLIENTS = 10000
+MAX_CLIENTS_PER_PEER = 16
+LOCAL_PEER = "local"
+DEFAULT_QUEUE_TIMEOUT = 5.0
+
+# Smoothing for the moving average of call durations behind retry-after estimates
+_SERVICE_TIME_SMOOTHING = 0.1
+
+
+class AdmissionRejected(ToolError):
+    """A call was refused by admission control"""
+
+    def __init__(self, reason, retry_after):
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"{reason}; retry after {retry_after:.2f} s")
+
+
+class TokenBucket:
+    """Refills at `rate` tokens per second up to `burst`"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def take(self, now):
+        """Take one token; returns 0 on success, else seconds until one is available"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+def forwarded_client(peer_host, forwarded_for, trusted_proxies):
+    """
+    The client address behind a chain of trusted proxies: the rightmost
+    X-Forwarded-For entry not in trusted_proxies, or peer_host itself when
+    the peer is not a trusted proxy.
+    """
+    if peer_host not in trusted_proxies or not forwarded_for:
+        return peer_host
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if hop not in trusted_proxies:
+            return hop
+    return hops[0] if hops else peer_host
+
+
+def _transport_peer(headers, trusted_proxies):
+    try:
+        peer = get_http_request().client
+    except RuntimeError:
+        return LOCAL_PEER
+    if peer is None:
+        return LOCAL_PEER
+    return forwarded_client(peer.host, headers.get("x-forwarded-for"), trusted_proxies)
+
+
+def client_key(context, trusted_proxies=frozenset()):
+    """Identify the caller of a tool call for per-client limits: its peer, plus a sub-key for its own id"""
+    ctx = context.fastmcp_context
+    headers = get_http_headers()
+    peer = _transport_peer(headers, trusted_proxies)
+    client_id = ctx.client_id if ctx is not None else None
+    client_id = client_id or headers.get("x-client-id")
+    if not client_id:
+        return peer
+    return f"{peer}#{zlib.crc32(client_id.encode()) % MAX_CLIENTS_PER_PEER}"
+
+
+class AdmissionController:
+    """Per-client token buckets plus a global concurrency cap with a bounded queue"""
+
+    def __init__(
+        self,
+        rate=None,
+        burst=None,
+        max_concurrent=None,
+        max_queue=0,
+        queue_timeout=DEFAULT_QUEUE_TIMEOUT,
+        clock=time.monotonic,
+    ):
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue cannot be negative")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate or 1))
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._active = 0
+        self._waiters = deque()
+        self._service_time = 0.0
+        self.counters = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected_rate_limited": 0,
+            "rejected_queue_full": 0,
+            "rejected_queue_timeout": 0,
+        }
+        self.max_queue_wait = 0.0
+
+    def check_rate(self, client):
+        """Raise AdmissionRejected if the client is over its rate limit"""
+        if self.rate is None:
+            return
+        now = self.clock()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = TokenBucket(self.rate, self.burst, now)
+            if len(self._buckets) > MAX_TRACKED_CLIENTS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+        wait = bucket.take(now)
+        if wait:
+            self.counters["rejected_rate_limited"] += 1
+            raise AdmissionRejected(f"Rate limit exceeded for client '{client}'", wait)
+
+    def _saturated_retry_after(self):
+        """Rough time until a queue slot frees up"""
+        backlog = len(self._waiters) + 1
+        return max(0.01, self._service_time * backlog / self.max_concurrent)
+
+    async def acquire(self):
+        """Take a concurrency slot, waiting in the queue if needed"""
+        if self.max_concurrent is None:
+            return
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.counters["rejected_queue_full"] += 1
+            raise AdmissionRejected("Server is at capacity", self._saturated_retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counters["queued"] += 1
+        start = self.clock()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self.counters["rejected_queue_timeout"] += 1
+            raise AdmissionRejected("Timed out waiting for capacity", self._saturated_retry_after())
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        self.max_queue_wait = max(self.max_queue_wait, self.clock() - start)
+
+    def _abandon(self, waiter):
+        """Leave the queue; pass on the slot if it was handed over as the wait ended"""
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+        elif waiter.done() and not waiter.cancelled():
+            self.release()
+
+    def release(self):
+        """Hand the slot to the next waiter, or free it"""
+        if self.max_concurrent is None:
+            return
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def record_service_time(self, seconds):
+        self._service_time += (seconds - self._service_time) * _SERVICE_TIME_SMOOTHING
+
+    def metrics(self):
+        return {
+            **self.counters,
+            "active": self._active,
+            "waiting": len(self._waiters),
+            "tracked_clients": len(self._buckets),
+            "max_queue_wait_ms": round(self.max_queue_wait * 1000, 3),
+            "avg_service_ms": round(self._service_time * 1000, 3),
+            "limits": {
+                "rate": self.rate,
+                "burst": self.burst if self.rate is not None else None,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "queue_timeout": self.queue_timeout,
+            },
+        }
+
+
+class AdmissionMiddleware(Middleware):
+    """
+    Applies an AdmissionController to every tool call except `exempt_tools`;
+    `trusted_proxies` are peer addresses whose X-Forwarded-For is believed
+    """
+
+    def __init__(self, controller, exempt_tools=(), trusted_proxies=()):
+        self.controller = controller
+        self.exempt_tools = frozenset(exempt_tools)
+        self.trusted_proxies = frozenset(trusted_proxies)
+
+    async def on_call_tool(self, context, call_next):
+        if context.message.name in self.exempt_tools:
+            return await call_next(context)
+        controller = self.controller
+        controller.check_rate(client_key(context, self.trusted_proxies))
+        await controller.acquire()
+        controller.counters["admitted"] += 1
+        start = time.perf_counter()
+        try:
+            return await call_next(context)
+        finally:
+            controller.record_service_time(time.perf_counter() - start)
+            controller.release()
@@ -0,0 +1,127 @@
+"""
+Term-level representation of breed attributes.
+
+Breed attribute values are short comma-separated phrase lists
+("dense, water-repellent, wavy"). Splitting them once into term tuples
+gives the other modules a common representation to blend, compare and
+index without reprocessing the raw strings on every request.
+"""
+
+from dog_breed_aesthetics_mcp.breed_data import DerivedIndex
+
+# Nested attribute categories and their fields, in display order
+CATEGORY_FIELDS = {
+    "proportions": ("body_ratio", "build", "head", "legs"),
+    "coat": ("texture", "length", "qualities"),
+    "movement": ("gait", "energy", "qualities"),
+    "temperament_aesthetic": ("mood", "presence", "character"),
+}
+
+
+def split_terms(value):
+    """Split a comma-separated attribute value into a tuple of terms"""
+    return tuple(term.strip() for term in value.split(",") if term.strip())
+
+
+def breed_terms(breed_data):
+    """
+    Return the term representation of a breed.
+
+    Keys are (category, field) pairs for the nested attribute categories,
+    plus ("color_palette", None), ("scale", None) and
+    ("visual_essence", None) for the flat fields.
+    """
+    terms = {}
+    for category, fields in CATEGORY_FIELDS.items():
+        for field in fields:
+            terms[(category, field)] = split_terms(breed_data[category][field])
+    terms[("color_palette", None)] = tuple(breed_data["color_palette"])
+    terms[("scale", None)] = (breed_data["scale"],)
+    terms[("visual_essence", None)] = split_terms(breed_data["visual_essence"])
+    return terms
+
+
+# Categories used when comparing or indexing whole breeds; each maps to the
+# breed_terms() keys it covers
+INDEX_CATEGORIES = {
+    "proportions": [("proportions", field) for field in CATEGORY_FIELDS["proportions"]],
+    "coat": [("coat", field) for field in CATEGORY_FIELDS["coat"]],
+    "movement": [("movement", field) for field in CATEGORY_FIELDS["movement"]],
+    "temperament_aesthetic": [
+        ("temperament_aesthetic", field) for field in CATEGORY_FIELDS["temperament_aesthetic"]
+    ],
+    "color_palette": [("color_palette", None)],
+    "scale": [("scale", None)],
+}
+
+
+class TermIndex:
+    """
+    Per-category term vocabularies with one integer bitmask per breed.
+
+    Each distinct (field, term) pair in a category gets a bit, so set
+    operations across any number of breeds reduce to integer AND/OR.
+    """
+
+    def __init__(self, database):
+        self.vocabulary = {category: [] for category in INDEX_CATEGORIES}
+        self._bits = {category: {} for category in INDEX_CATEGORIES}
+        self.masks = {
+            breed_key: self._encode(breed_data) for breed_key, breed_data in database.items()
+        }
+
+    @classmethod
+    def from_parts(cls, vocabulary, masks):
+        """Create an index from prebuilt vocabularies and a breed -> masks mapping"""
+        index = cls.__new__(cls)
+        index.vocabulary = vocabulary
+        index._bits = {
+            category: {entry: bit for bit, entry in enumerate(entries)}
+            for category, entries in vocabulary.items()
+        }
+        index.masks = masks
+        return index
+
+    def _encode(self, breed_data):
+        """Return {category: mask} for a breed, adding unseen terms to the vocabulary"""
+        terms = breed_terms(breed_data)
+        breed_masks = {}
+        for category, keys in INDEX_CATEGORIES.items():
+            bits = self._bits[category]
+            mask = 0
+            for key in keys:
+                field = key[1]
+                for term in terms[key]:
+                    entry = (field, term)
+                    bit = bits.get(entry)
+                    if bit is None:
+                        bit = bits[entry] = len(self.vocabulary[category])
+                        self.vocabulary[category].append(entry)
+                    mask |= 1 << bit
+            breed_masks[category] = mask
+        return breed_masks
+
+    def masks_for(self, breed_key, breed_data):
+        """Return a breed's masks, encoding breeds outside the index (e.g. variants) on demand"""
+        masks = self.masks.get(breed_key)
+        if masks is None:
+            masks = self._encode(breed_data)
+        return masks
+
+    def decode(self, category, mask):
+        """Return the (field, term) entries set in a category bitmask"""
+        vocabulary = self.vocabulary[category]
+        entries = []
+        while mask:
+            low = mask & -mask
+            entries.append(vocabulary[low.bit_length() - 1])
+            mask ^= low
+        return entries
+
+
+_term_index = DerivedIndex(TermIndex)
+
+
+def get_term_index():
+    """Return the term index for the active breed database, building it on first use"""
+    return _term_index.get()
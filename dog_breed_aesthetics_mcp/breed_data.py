@@ -2,6 +2,13 @@
 Database of dog breed visual characteristics and aesthetic qualities.
 """
 
+import sys
+
+from dog_breed_aesthetics_mcp.cache import estimate_bytes, get_cache_manager, managed_cache
+
+# AKC groups in display order
+GROUP_ORDER = ["Sporting", "Hound", "Working", "Terrier", "Toy", "Non-Sporting", "Herding"]
+
 BREED_DATABASE = {
     # SPORTING GROUP
     "golden_retriever": {
@@ -620,13 +627,285 @@ BREED_DATABASE = {
     }
 }
 
+# Variants inherit every field from their parent (a breed or another variant)
+# and store only the fields they change. Nested categories override per field.
+VARIANT_DATABASE = {
+    "toy_poodle": {
+        "parent": "poodle",
+        "name": "Toy Poodle",
+        "overrides": {
+            "group": "Toy",
+            "proportions": {
+                "build": "fine-boned, dainty, refined",
+                "legs": "slender, straight, elegant"
+            },
+            "movement": {"energy": "high, lively, animated"},
+            "scale": "toy",
+            "visual_essence": "miniature sculptural precision, delicate geometry, jewel-like refinement"
+        }
+    },
+    
+    "miniature_poodle": {
+        "parent": "poodle",
+        "name": "Miniature Poodle",
+        "overrides": {
+            "proportions": {"build": "compact, athletic, refined"},
+            "scale": "small",
+            "visual_essence": "compact sculptural precision, lively geometry, refined elegance"
+        }
+    },
+    
+    "apricot_toy_poodle": {
+        "parent": "toy_poodle",
+        "name": "Apricot Toy Poodle",
+        "overrides": {
+            "color_palette": ["apricot", "soft peach", "warm cream"],
+            "visual_essence": "miniature sculptural precision, warm apricot glow, delicate geometry"
+        }
+    },
+    
+    "cardigan_corgi": {
+        "parent": "corgi",
+        "name": "Cardigan Welsh Corgi",
+        "overrides": {
+            "proportions": {
+                "body_ratio": "long and low, heavier-boned than the Pembroke",
+                "head": "fox-like, broader skull, large rounded ears"
+            },
+            "coat": {"qualities": "weather-resistant, thick, full brush tail"},
+            "color_palette": ["blue merle", "brindle", "red", "sable", "black with tan or brindle points"],
+            "visual_essence": "low-slung solidity, sweeping tail line, merle texture, grounded charm"
+        }
+    },
+    
+    "blue_merle_border_collie": {
+        "parent": "border_collie",
+        "name": "Blue Merle Border Collie",
+        "overrides": {
+            "color_palette": ["blue merle", "silver gray", "black patches", "white markings"],
+            "visual_essence": "intense focus, dynamic motion, marbled silver texture, intelligent alertness"
+        }
+    },
+    
+    "white_boxer": {
+        "parent": "boxer",
+        "name": "White Boxer",
+        "overrides": {
+            "color_palette": ["white", "pale cream", "pink-toned skin"],
+            "visual_essence": "athletic exuberance, clean luminous surfaces, square strength, playful power"
+        }
+    },
+    
+    "brindle_greyhound": {
+        "parent": "greyhound",
+        "name": "Brindle Greyhound",
+        "overrides": {
+            "color_palette": ["brindle", "tiger-striped fawn", "dark striping"],
+            "visual_essence": "aerodynamic minimalism, striated texture, elegant speed, liquid grace"
+        }
+    },
+    
+    "liver_dalmatian": {
+        "parent": "dalmatian",
+        "name": "Liver-Spotted Dalmatian",
+        "overrides": {
+            "color_palette": ["white with liver spots", "warm brown", "amber eyes"],
+        }
+    }
+}
+
+# The database the server answers from. Defaults to BREED_DATABASE and can be
+# swapped (e.g. for a synthetic catalog in benchmarks) with set_database().
+_active_database = BREED_DATABASE
+_database_version = 0
+# Also changes when a variant is registered or a breed is edited in place
+_catalog_version = 0
+
+
+def get_database():
+    """Return the active breed database"""
+    return _active_database
+
+
+def get_database_version():
+    """Return a counter that changes whenever the active database is replaced"""
+    return _database_version
+
+
+def get_catalog_version():
+    """Return a counter that changes whenever any breed or variant may have changed"""
+    return _catalog_version
+
+
+def set_database(database):
+    """
+    Replace the active breed database; derived indexes rebuild on next use.
+
+    Databases that decode breeds on access (PhraseStore, snapshots) keep
+    the decoded breeds in a `decoded` cache; the active database's cache
+    counts against the global cache budget.
+    """
+    global _active_database, _database_version, _catalog_version
+    manager = get_cache_manager()
+    previous = getattr(_active_database, "decoded", None)
+    if previous is not None:
+        manager.unregister(previous)
+    _active_database = database
+    _database_version += 1
+    _catalog_version += 1
+    decoded = getattr(database, "decoded", None)
+    if decoded is not None:
+        manager.register(decoded)
+
+
+class DerivedIndex:
+    """
+    Lazily built structure derived from the active database.
+
+    `build` is called with the active database on first use and again
+    whenever set_database() has been called since the last build.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self._value = None
+        self._version = None
+
+    def get(self):
+        """Return the index, building or rebuilding it if needed"""
+        version = _database_version
+        if self._version != version:
+            self._value = self.build(_active_database)
+            self._version = version
+        return self._value
+
+    def prime(self, value):
+        """Install a prebuilt index (e.g. from a snapshot) for the active database"""
+        self._value = value
+        self._version = _database_version
+
+
+def _variant_view_bytes(entry):
+    """A view's own dict plus the override values it adds; the rest is shared with its parent"""
+    ancestors, view = entry
+    return sys.getsizeof(view) + sum(estimate_bytes(record["overrides"]) for record in ancestors[1:])
+
+
+# Resolved variant views, keyed by variant key. Each entry keeps the chain
+# of ancestor records it was built from and is reused only while every
+# ancestor is still the same object in the active database / registry.
+_resolved_variants = managed_cache("variant_views", sizeof=_variant_view_bytes)
+
+
+def register_variant(variant_key, parent_key, name, overrides):
+    """Add or replace a variant; cached views of it and its descendants are dropped"""
+    VARIANT_DATABASE[variant_key] = {"parent": parent_key, "name": name, "overrides": overrides}
+    invalidate_variants()
+
+
+def invalidate_variants(breed_key=None):
+    """
+    Drop cached variant views.
+
+    Views rebuild automatically when a parent entry is replaced; call this
+    after editing a breed or variant dict in place (this also tells the
+    change log to look for changes). With a breed_key only views
+    inheriting from that breed are dropped.
+    """
+    global _catalog_version
+    _catalog_version += 1
+    if breed_key is None:
+        _resolved_variants.clear()
+        return
+    changed = _active_database.get(breed_key) or VARIANT_DATABASE.get(breed_key)
+    for variant_key, (ancestors, _) in _resolved_variants.items():
+        if any(record is changed for record in ancestors):
+            _resolved_variants.pop(variant_key)
+
+
+def _variant_chain(variant_key):
+    """Return (base breed data, [variant records from root to leaf]) or None"""
+    chain = []
+    seen = set()
+    key = variant_key
+    while key in VARIANT_DATABASE and key not in _active_database:
+        if key in seen:
+            return None  # cycle
+        seen.add(key)
+        record = VARIANT_DATABASE[key]
+        chain.append(record)
+        key = record["parent"]
+    base = _active_database.get(key)
+    if base is None:
+        return None
+    chain.reverse()
+    return base, chain
+
+
+def _apply_overrides(parent, record):
+    """
+    Copy-on-write merge: a new top-level dict that shares every unchanged
+    value (including whole nested categories) with the parent.
+    """
+    view = dict(parent)
+    view["name"] = record["name"]
+    for field, value in record["overrides"].items():
+        if isinstance(value, dict) and isinstance(parent.get(field), dict):
+            view[field] = {**parent[field], **value}
+        else:
+            view[field] = value
+    return view
+
+
+def resolve_variant(variant_key):
+    """Return the resolved breed data for a variant, or None if it cannot be resolved"""
+    resolved = _variant_chain(variant_key)
+    if resolved is None:
+        return None
+    base, chain = resolved
+    ancestors = (base, *chain)
+
+    cached = _resolved_variants.get(variant_key, valid=lambda entry: len(entry[0]) == len(ancestors) and all(
+        a is b for a, b in zip(entry[0], ancestors)
+    ))
+    if cached is not None:
+        return cached[1]
+
+    view = base
+    for record in chain:
+        view = _apply_overrides(view, record)
+    _resolved_variants.put(variant_key, (ancestors, view))
+    return view
+
+
+def get_variant_keys(parent_key=None):
+    """Return variant keys, optionally only those descending from parent_key"""
+    if parent_key is None:
+        return list(VARIANT_DATABASE)
+    keys = []
+    for variant_key in VARIANT_DATABASE:
+        key = variant_key
+        seen = set()
+        while key in VARIANT_DATABASE and key not in seen:
+            seen.add(key)
+            key = VARIANT_DATABASE[key]["parent"]
+            if key == parent_key:
+                keys.append(variant_key)
+                break
+    return keys
+
+
 def get_breed_names():
     """Return list of all available breed names for display"""
-    return sorted([breed_data["name"] for breed_data in BREED_DATABASE.values()])
+    return sorted([breed_data["name"] for breed_data in _active_database.values()])
 
 def get_breed_data(breed_key):
-    """Get breed data by key (snake_case name)"""
-    return BREED_DATABASE.get(breed_key)
+    """Get breed data by key (snake_case name); variants resolve through their parent"""
+    breed_data = _active_database.get(breed_key)
+    if breed_data is None and breed_key in VARIANT_DATABASE:
+        breed_data = resolve_variant(breed_key)
+    return breed_data
+
 
 def normalize_breed_name(breed_name):
     """Convert user input breed name to database key"""
@@ -638,6 +917,9 @@ def normalize_breed_name(breed_name):
         "pembroke_welsh_corgi": "corgi",
         "welsh_corgi": "corgi",
         "standard_poodle": "poodle",
+        "cardigan_welsh_corgi": "cardigan_corgi",
+        "cardigan": "cardigan_corgi",
+        "liver_spotted_dalmatian": "liver_dalmatian",
     }
     
     return variations.get(normalized, normalized)
@@ -0,0 +1,246 @@
+"""
+Size-accounted caches under one memory budget.
+
+Every cache in the package is a Cache: an LRU of entries with an
+estimated size in bytes, optionally capped by entry count and by bytes.
+Caches registered with a CacheManager also share its global byte
+budget: when the registered caches together exceed it, the least
+recently used entry across all of them is evicted, whichever cache it
+is in, until they fit. A cache never evicts the entry it has just
+stored, so one oversized entry still gets served once.
+
+The process-wide manager (get_cache_manager()) holds the module-level
+caches (template renders, compiled prompts, resolved variants, sampler
+tables) and those of the active breed database and tenant store. Caches
+can be listed, cleared and resized at runtime through it.
+"""
+
+import itertools
+import sys
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# One lock for every cache and manager: global eviction touches several
+# caches at once, and cache operations are far too short to contend
+_lock = threading.RLock()
+# Starts past the small-int cache, so every tick is a fresh int and an
+# entry costs the same memory whether it was last used early or late
+_clock = itertools.count(1 << 16)
+
+
+def estimate_bytes(value):
+    """Rough deep size of nested dict/list/tuple/str data"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_bytes(k) + estimate_bytes(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_bytes(item) for item in value)
+    return size
+
+
+class Cache:
+    """LRU cache of sized entries, with optional entry-count and byte caps"""
+
+    def __init__(self, name, max_entries=None, max_bytes=None, sizeof=estimate_bytes):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.manager = None
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> [value, nbytes, last use]
+        self._entries = OrderedDict()
+
+    def get(self, key, valid=None):
+        """Return the cached value, or None; `valid` can reject a stale value (counted as a miss)"""
+        with _lock:
+            entry = self._entries.get(key)
+            if entry is None or (valid is not None and not valid(entry[0])):
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry[2] = next(_clock)
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, nbytes=None):
+        """Store a value (sized with `sizeof` unless nbytes is given) and evict to fit the caps"""
+        if nbytes is None:
+            nbytes = self.sizeof(value)
+        with _lock:
+            if self.max_entries == 0:
+                return
+            self._remove(key)
+            self._entries[key] = [value, nbytes, next(_clock)]
+            self.nbytes += nbytes
+            self._trim()
+            if self.manager is not None:
+                self.manager.enforce(protect=self)
+
+    def pop(self, key):
+        """Drop one entry; returns its value or None"""
+        with _lock:
+            entry = self._remove(key)
+            return entry[0] if entry is not None else None
+
+    def clear(self):
+        with _lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def resize(self, max_entries=None, max_bytes=None):
+        """Change the caps (None leaves a cap unchanged) and evict down to them"""
+        with _lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._trim(keep_newest=False)
+
+    def items(self):
+        """Snapshot of (key, value) pairs, least recently used first"""
+        with _lock:
+            return [(key, entry[0]) for key, entry in self._entries.items()]
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with _lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    # Eviction (callers hold _lock)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+        return entry
+
+    def _oldest_use(self, keep_newest):
+        """Last-use tick of the LRU entry, or None if nothing may be evicted"""
+        if len(self._entries) <= (1 if keep_newest else 0):
+            return None
+        return next(iter(self._entries.values()))[2]
+
+    def _evict_oldest(self):
+        _, entry = self._entries.popitem(last=False)
+        self.nbytes -= entry[1]
+        self.evictions += 1
+
+    def _over_caps(self):
+        return (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        )
+
+    def _trim(self, keep_newest=True):
+        while self._over_caps() and self._oldest_use(keep_newest) is not None:
+            self._evict_oldest()
+
+
+class CacheManager:
+    """Registry of caches that enforces a global byte budget across them"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._caches = {}
+
+    def register(self, cache):
+        """Add a cache to the budget; a cache already registered under its name is detached"""
+        with _lock:
+            previous = self._caches.get(cache.name)
+            if previous is not None and previous is not cache:
+                previous.manager = None
+            self._caches[cache.name] = cache
+            cache.manager = self
+            self.enforce()
+        return cache
+
+    def unregister(self, cache):
+        with _lock:
+            if self._caches.get(cache.name) is cache:
+                del self._caches[cache.name]
+                cache.manager = None
+
+    def get(self, name):
+        """Return a registered cache, or None"""
+        return self._caches.get(name)
+
+    def names(self):
+        return sorted(self._caches)
+
+    def total_bytes(self):
+        with _lock:
+            return sum(cache.nbytes for cache in self._caches.values())
+
+    def enforce(self, protect=None):
+        """Evict least recently used entries across caches until they fit the budget"""
+        with _lock:
+            total = self.total_bytes()
+            while total > self.max_bytes:
+                victim = None
+                oldest = None
+                for cache in self._caches.values():
+                    used = cache._oldest_use(keep_newest=cache is protect)
+                    if used is not None and (oldest is None or used < oldest):
+                        victim, oldest = cache, used
+                if victim is None:
+                    return
+                before = victim.nbytes
+                victim._evict_oldest()
+                total -= before - victim.nbytes
+
+    def resize(self, max_bytes):
+        """Change the global budget and evict down to it"""
+        with _lock:
+            self.max_bytes = max_bytes
+            self.enforce()
+
+    def clear(self):
+        """Empty every registered cache"""
+        with _lock:
+            for cache in self._caches.values():
+                cache.clear()
+
+    def stats(self):
+        with _lock:
+            return {
+                "max_bytes": self.max_bytes,
+                "total_bytes": self.total_bytes(),
+                "caches": {name: self._caches[name].stats() for name in self.names()},
+            }
+
+
+_manager = CacheManager()
+
+
+def get_cache_manager():
+    """Return the process-wide cache manager"""
+    return _manager
+
+
+def managed_cache(name, **kwargs):
+    """Create a Cache registered with the process-wide manager"""
+    return _manager.register(Cache(name, **kwargs))
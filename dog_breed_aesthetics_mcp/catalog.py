@@ -0,0 +1,89 @@
+"""
+Cursor-paginated breed catalog.
+
+Breeds are kept in one precomputed array sorted by (group, name, key),
+plus one array per group. A cursor encodes the sort key of the last
+breed returned, so each page is a binary search followed by a slice and
+costs time proportional to the page size rather than the catalog size.
+Cursors stay valid when breeds are added or removed between pages.
+"""
+
+import base64
+import json
+from bisect import bisect_right
+
+from dog_breed_aesthetics_mcp.breed_data import GROUP_ORDER, DerivedIndex
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def sort_key(breed_key, breed_data):
+    """Return the catalog ordering key for a breed"""
+    group = breed_data["group"]
+    rank = GROUP_ORDER.index(group) if group in GROUP_ORDER else len(GROUP_ORDER)
+    return (rank, group, breed_data["name"].lower(), breed_key)
+
+
+def encode_cursor(entry):
+    """Encode a sort key as an opaque URL-safe cursor string"""
+    return base64.urlsafe_b64encode(json.dumps(entry).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor(); raises ValueError if malformed"""
+    try:
+        rank, group, name, breed_key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (int(rank), str(group), str(name), str(breed_key))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError(f"Invalid cursor: '{cursor}'")
+
+
+class CatalogIndex:
+    """Sorted ordering index over a breed database"""
+
+    def __init__(self, database):
+        self.order = sorted(sort_key(key, data) for key, data in database.items())
+        self.by_group = {}
+        for entry in self.order:
+            self.by_group.setdefault(entry[1].lower(), []).append(entry)
+
+    @classmethod
+    def from_order(cls, order, by_group):
+        """
+        Create an index from prebuilt sorted sequences of sort keys.
+
+        Any sequence supporting len(), indexing and slicing works, so the
+        order can be served straight from a snapshot without materializing it.
+        """
+        index = cls.__new__(cls)
+        index.order = order
+        index.by_group = by_group
+        return index
+
+    def page(self, cursor=None, page_size=DEFAULT_PAGE_SIZE, group=None):
+        """
+        Return (breed_keys, next_cursor, total) for one page.
+
+        `group` restricts the listing to one group (case-insensitive).
+        next_cursor is None on the last page.
+        """
+        if group is None:
+            order = self.order
+        else:
+            order = self.by_group.get(group.strip().lower(), [])
+
+        start = 0 if cursor is None else bisect_right(order, decode_cursor(cursor))
+        window = order[start:start + page_size]
+        next_cursor = None
+        if window and start + page_size < len(order):
+            next_cursor = encode_cursor(window[-1])
+        return [entry[3] for entry in window], next_cursor, len(order)
+
+
+_catalog_index = DerivedIndex(CatalogIndex)
+
+
+def get_catalog_index():
+    """Return the catalog index for the active breed database, building it on first use"""
+    return _catalog_index.get()
@@ -0,0 +1,169 @@
+"""
+Change log of the breed catalog, for incremental sync.
+
+Every breed and variant gets a 64-bit content hash. Whenever the catalog
+may have changed (set_database(), register_variant(), or an in-place
+edit reported with invalidate_variants()), the log rehashes it, and if
+anything differs starts a new version listing the breeds added, modified
+or removed. Only the most recent changes are kept.
+
+Versions are handed out as tokens "<version>-<digest>", where the digest
+is the sum of all breed hashes at that version. The digest makes tokens
+safe to use with a different process: a token whose digest matches the
+current catalog needs no changes, whatever its version number. A token
+the log cannot diff from (older than the log reaches, from another
+process whose catalog differs, or from before a restart) gets a full
+snapshot instead.
+"""
+
+import hashlib
+import threading
+from collections import deque
+
+from dog_breed_aesthetics_mcp.breed_data import (
+    VARIANT_DATABASE,
+    get_breed_data,
+    get_catalog_version,
+    get_database
+)
+from dog_breed_aesthetics_mcp.encoding import dumps
+
+DEFAULT_MAX_CHANGES = 10000
+
+_MASK = (1 << 64) - 1
+
+
+def breed_hash(breed_key, breed_data):
+    """64-bit content hash of one breed"""
+    digest = hashlib.blake2b(dumps([breed_key, breed_data]).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def catalog_hashes():
+    """
+    Return {breed key: hash} for the active catalog, resolvable variants
+    included. A database that stores its hashes (a snapshot) provides them
+    through content_hashes() rather than being decoded and rehashed.
+    """
+    database = get_database()
+    content_hashes = getattr(database, "content_hashes", None)
+    if content_hashes is not None:
+        hashes = content_hashes()
+    else:
+        hashes = {key: breed_hash(key, breed_data) for key, breed_data in database.items()}
+    for variant_key in VARIANT_DATABASE:
+        breed_data = get_breed_data(variant_key)
+        if breed_data is not None:
+            hashes[variant_key] = breed_hash(variant_key, breed_data)
+    return hashes
+
+
+def parse_token(token):
+    """Split a version token into (version, digest); raises ValueError if malformed"""
+    version, separator, digest = token.partition("-")
+    if not separator or not version.isdigit() or len(digest) != 16:
+        raise ValueError(f"Malformed version token '{token}'")
+    try:
+        return int(version), int(digest, 16)
+    except ValueError:
+        # e.g. a non-hex digest, or a digit int() does not accept ("²")
+        raise ValueError(f"Malformed version token '{token}'") from None
+
+
+class ChangeLog:
+    """Catalog versions and the breeds changed in each"""
+
+    def __init__(self, max_changes=DEFAULT_MAX_CHANGES):
+        self.max_changes = max_changes
+        self.version = 0
+        self._lock = threading.Lock()
+        self._hashes = None
+        self._digest = 0
+        # version -> catalog digest, for every version the log can diff from
+        self._digests = {}
+        # (version, breed key, existed before that version), oldest first
+        self._changes = deque()
+        self._oldest = 0
+        self._catalog_version = None
+
+    def sync(self):
+        """Rehash the catalog if it may have changed, recording a new version if it did"""
+        with self._lock:
+            catalog_version = get_catalog_version()
+            if catalog_version == self._catalog_version:
+                return
+            hashes = catalog_hashes()
+            self._catalog_version = catalog_version
+            if self._hashes is None:
+                self._set_baseline(hashes)
+                return
+
+            changed = [key for key, value in hashes.items() if self._hashes.get(key) != value]
+            changed.extend(key for key in self._hashes if key not in hashes)
+            if not changed:
+                return
+            self.version += 1
+            for breed_key in changed:
+                self._changes.append((self.version, breed_key, breed_key in self._hashes))
+            self._hashes = hashes
+            self._digest = sum(hashes.values()) & _MASK
+            self._digests[self.version] = self._digest
+            self._trim()
+
+    def _set_baseline(self, hashes):
+        self._hashes = hashes
+        self._digest = sum(hashes.values()) & _MASK
+        self._digests = {self.version: self._digest}
+        self._oldest = self.version
+
+    def _trim(self):
+        while len(self._changes) > self.max_changes:
+            version, _, _ = self._changes.popleft()
+            # Clients at `version` had already seen the dropped change
+            self._oldest = max(self._oldest, version)
+        for version in [v for v in self._digests if v < self._oldest]:
+            del self._digests[version]
+
+    def snapshot(self):
+        """Return (current token, every breed key in the catalog, sorted)"""
+        self.sync()
+        with self._lock:
+            return f"{self.version}-{self._digest:016x}", sorted(self._hashes)
+
+    def changes_since(self, token):
+        """
+        Return (current token, changes) where changes maps breed key to
+        "added", "modified" or "removed", or is None if the log cannot diff
+        from `token` and the client needs a full snapshot.
+        """
+        version, digest = parse_token(token)
+        self.sync()
+        with self._lock:
+            current = f"{self.version}-{self._digest:016x}"
+            if digest == self._digest:
+                return current, {}
+            if self._digests.get(version) != digest:
+                return current, None
+
+            existed = {}
+            for change_version, breed_key, existed_before in self._changes:
+                if change_version > version and breed_key not in existed:
+                    existed[breed_key] = existed_before
+            changes = {}
+            for breed_key, existed_before in existed.items():
+                exists = breed_key in self._hashes
+                if exists and existed_before:
+                    changes[breed_key] = "modified"
+                elif exists:
+                    changes[breed_key] = "added"
+                elif existed_before:
+                    changes[breed_key] = "removed"
+            return current, changes
+
+
+_log = ChangeLog()
+
+
+def get_change_log():
+    """Return the process-wide catalog change log"""
+    return _log
@@ -0,0 +1,69 @@
+"""
+Multi-breed comparison over precomputed term bitmasks.
+
+Shared attributes are the AND of the breeds' category masks; a breed's
+distinguishing attributes are its mask minus the OR of every other
+breed's mask, found with prefix/suffix ORs so the whole comparison is
+linear in the number of breeds.
+"""
+
+from dog_breed_aesthetics_mcp.attributes import INDEX_CATEGORIES, get_term_index
+from dog_breed_aesthetics_mcp.breed_data import get_breed_data
+
+MAX_COMPARE_BREEDS = 50
+
+
+def _group_entries(category, entries):
+    """Render decoded (field, term) entries as {field: [terms]} or a flat list"""
+    if INDEX_CATEGORIES[category][0][1] is None:
+        return [term for _, term in entries]
+    grouped = {field: [] for _, field in INDEX_CATEGORIES[category]}
+    for field, term in entries:
+        grouped[field].append(term)
+    return {field: terms for field, terms in grouped.items() if terms}
+
+
+def compare_breed_keys(breed_keys, index=None):
+    """
+    Compare breeds by database key.
+
+    Keys missing from the index (such as variants) are encoded on demand.
+    Returns a dictionary with, per category, the attributes shared by all
+    breeds, the attributes unique to each breed, and the overlap ratio
+    (shared terms / all terms).
+    """
+    if index is None:
+        index = get_term_index()
+
+    breed_masks = [index.masks_for(breed_key, get_breed_data(breed_key)) for breed_key in breed_keys]
+    shared = {}
+    overlap = {}
+    distinguishing = {breed_key: {} for breed_key in breed_keys}
+
+    for category in INDEX_CATEGORIES:
+        masks = [masks[category] for masks in breed_masks]
+        count = len(masks)
+
+        prefix = [0] * (count + 1)
+        suffix = [0] * (count + 1)
+        for i in range(count):
+            prefix[i + 1] = prefix[i] | masks[i]
+            suffix[count - i - 1] = suffix[count - i] | masks[count - i - 1]
+
+        common = masks[0]
+        for mask in masks[1:]:
+            common &= mask
+
+        union_size = prefix[count].bit_count()
+        shared[category] = _group_entries(category, index.decode(category, common))
+        overlap[category] = round(common.bit_count() / union_size, 4) if union_size else 0.0
+
+        for i, breed_key in enumerate(breed_keys):
+            unique = masks[i] & ~(prefix[i] | suffix[i + 1])
+            distinguishing[breed_key][category] = _group_entries(category, index.decode(category, unique))
+
+    return {
+        "shared": shared,
+        "distinguishing": distinguishing,
+        "overlap": overlap,
+    }
@@ -0,0 +1,331 @@
+"""
+Model-specific output compilers.
+
+Diffusion models take weighted tag lists and a negative prompt rather
+than the prose synthesis_instruction. A breed's tags are its attribute
+terms (visual essence, coat, build, movement, temperament, palette)
+ranked by distinctiveness, the mean TF-IDF inverse document frequency of
+their words, so "aerodynamic" outranks "moderate". Its negative terms
+keep literal dogs out of the image and push away from the opposite of
+its scale, coat length and energy.
+
+Compilation happens in three layers:
+
+- ranked tags and negative terms per breed are precomputed for the
+  whole database, like the other derived indexes
+- each (format, breed, emphasis level) is compiled once into a finished
+  tag chunk and negative prompt, and cached
+- a request only joins its base prompt to the cached chunk
+
+Formats: "sd" (Stable Diffusion "(tag:1.2)" weights), "midjourney"
+(multi-prompt "::" weights and --no) and "plain" (unweighted tags).
+
+Emphasis sets how many tags are used and how strongly they are weighted.
+"""
+
+import re
+
+from dog_breed_aesthetics_mcp.attributes import split_terms
+from dog_breed_aesthetics_mcp.breed_data import DerivedIndex
+from dog_breed_aesthetics_mcp.cache import estimate_bytes, managed_cache
+from dog_breed_aesthetics_mcp.features import extract_features
+from dog_breed_aesthetics_mcp.scoring import LITERAL_DOG_WORDS, content_words, get_word_statistics
+
+DEFAULT_FORMAT = "sd"
+MAX_COMPILE_PROMPTS = 10000
+DEFAULT_COMPILE_CACHE = 1024
+
+# Emphasis level -> (tag count, weight of the least and most distinctive tag)
+EMPHASIS_TAGS = {
+    "subtle": (3, 1.0, 1.1),
+    "moderate": (5, 1.05, 1.25),
+    "strong": (8, 1.15, 1.4),
+}
+MAX_TAGS = max(count for count, _, _ in EMPHASIS_TAGS.values())
+# No field contributes more than this many tags, so the top tags cover
+# several aspects of the breed rather than one
+MAX_TAGS_PER_FIELD = 2
+
+# Fields tags are drawn from, most important first (ties go to earlier fields)
+TAG_FIELDS = (
+    ("visual_essence", None),
+    ("coat", "qualities"),
+    ("proportions", "build"),
+    ("movement", "qualities"),
+    ("temperament_aesthetic", "presence"),
+    ("coat", "texture"),
+    ("temperament_aesthetic", "mood"),
+    ("temperament_aesthetic", "character"),
+)
+
+# Single-word terms of these fields read as tags only with their noun
+FIELD_NOUNS = {
+    ("coat", "qualities"): "coat",
+    ("coat", "texture"): "coat",
+    ("proportions", "build"): "build",
+}
+
+# Only literal dogs: a broader term like "animal" would also push away
+# animal subjects the base prompt asks for (e.g. "a heron at dawn")
+BASE_NEGATIVES = ("dog", "puppy")
+
+# Feature -> (at or below, terms), (at or above, terms): pushes away from
+# the opposite end of the breed's own level
+FEATURE_NEGATIVES = {
+    "scale": ((1.0, ("bulky", "massive")), (3.0, ("tiny", "dainty"))),
+    "coat_length": ((1.0, ("shaggy", "long hair")), (3.0, ("cropped", "smooth coat"))),
+    "energy": ((1.5, ("frantic motion",)), (3.0, ("static", "sluggish"))),
+}
+
+# Characters the weighted-tag syntaxes give meaning to
+_SYNTAX = re.compile(r"[():\[\]{}|]+")
+_PALETTE_QUALIFIERS = ("often ", "usually ", "sometimes ")
+
+
+def _clean(term):
+    """Drop parenthetical notes and weight-syntax characters from a term"""
+    return " ".join(_SYNTAX.sub(" ", term.split("(")[0]).split())
+
+
+def _palette_tag(colors):
+    """One tag for the first two named colours, e.g. "fawn and black palette" """
+    named = []
+    for color in colors:
+        color = _clean(color.lower())
+        for qualifier in _PALETTE_QUALIFIERS:
+            if color.startswith(qualifier):
+                color = color[len(qualifier):]
+        if color and not color.startswith("any") and color not in named:
+            named.append(color)
+    if not named:
+        return None
+    return " and ".join(named[:2]) + " palette"
+
+
+def _field_terms(breed_data, category, field):
+    value = breed_data[category] if field is None else breed_data[category][field]
+    return split_terms(value)
+
+
+def rank_tags(breed_data, statistics=None):
+    """
+    Return up to MAX_TAGS (tag, distinctiveness) pairs for a breed, most
+    distinctive first. Distinctiveness is the mean IDF of the tag's words;
+    terms naming a literal dog or the breed itself are left out.
+    """
+    if statistics is None:
+        statistics = get_word_statistics()
+    excluded = LITERAL_DOG_WORDS | frozenset(content_words(breed_data["name"]))
+
+    candidates = []
+    seen = set()
+    for priority, (category, field) in enumerate(TAG_FIELDS):
+        for term in _field_terms(breed_data, category, field):
+            tag = _clean(term.lower())
+            words = content_words(tag)
+            if not words or tag in seen or excluded & set(words):
+                continue
+            seen.add(tag)
+            if " " not in tag and (category, field) in FIELD_NOUNS:
+                tag = f"{tag} {FIELD_NOUNS[(category, field)]}"
+            score = sum(statistics.idf(word) for word in words) / len(words)
+            candidates.append((-score, priority, len(candidates), tag, (category, field)))
+
+    palette = _palette_tag(breed_data["color_palette"])
+    if palette:
+        words = content_words(palette)
+        score = sum(statistics.idf(word) for word in words) / len(words)
+        candidates.append((-score, len(TAG_FIELDS), len(candidates), palette, ("color_palette", None)))
+
+    candidates.sort()
+    ranked = []
+    per_field = {}
+    for negative_score, _, _, tag, source in candidates:
+        if per_field.get(source, 0) >= MAX_TAGS_PER_FIELD:
+            continue
+        per_field[source] = per_field.get(source, 0) + 1
+        ranked.append((tag, -negative_score))
+        if len(ranked) == MAX_TAGS:
+            break
+    return tuple(ranked)
+
+
+def negative_terms(breed_data, tags=()):
+    """Negative prompt terms for a breed, leaving out any that describe it"""
+    terms = list(BASE_NEGATIVES)
+    for feature, value in extract_features(breed_data).items():
+        (low, low_terms), (high, high_terms) = FEATURE_NEGATIVES[feature]
+        if value <= low:
+            terms.extend(low_terms)
+        elif value >= high:
+            terms.extend(high_terms)
+    own_words = {word for tag, _ in tags for word in content_words(tag)}
+    return tuple(term for term in terms if not own_words & set(content_words(term)))
+
+
+def weighted_tags(ranked, emphasis_level):
+    """
+    Pick and weight a breed's tags for an emphasis level.
+
+    The most distinctive tag gets the level's top weight, the last tag
+    picked its bottom weight, and the rest step down evenly in between;
+    weights are rounded to 0.05.
+    """
+    count, low, high = EMPHASIS_TAGS[emphasis_level]
+    chosen = ranked[:count]
+    steps = max(len(chosen) - 1, 1)
+    return [
+        (tag, round((high - (high - low) * rank / steps) * 20) / 20)
+        for rank, (tag, _) in enumerate(chosen)
+    ]
+
+
+class BreedTagIndex:
+    """Ranked tags and negative terms for every breed in a database"""
+
+    def __init__(self, database, statistics=None):
+        if statistics is None:
+            statistics = get_word_statistics()
+        self.tags = {}
+        for breed_key, breed_data in database.items():
+            ranked = rank_tags(breed_data, statistics)
+            self.tags[breed_key] = (ranked, negative_terms(breed_data, ranked))
+
+    @classmethod
+    def from_tags(cls, tags):
+        """Create an index from a prebuilt breed -> (ranked tags, negative terms) mapping"""
+        index = cls.__new__(cls)
+        index.tags = tags
+        return index
+
+    def tags_for(self, breed_key, breed_data):
+        """Return (ranked tags, negative terms), compiling breeds outside the index (e.g. variants) on demand"""
+        entry = self.tags.get(breed_key) if breed_key is not None else None
+        if entry is None:
+            ranked = rank_tags(breed_data)
+            entry = (ranked, negative_terms(breed_data, ranked))
+        return entry
+
+
+_tag_index = DerivedIndex(BreedTagIndex)
+
+
+def get_tag_index():
+    """Return the tag index for the active breed database, building it on first use"""
+    return _tag_index.get()
+
+
+class OutputCompiler:
+    """Formats weighted tags and negative terms in one model family's syntax"""
+
+    name = None
+    description = ""
+
+    def weigh(self, ranked, emphasis_level):
+        return weighted_tags(ranked, emphasis_level)
+
+    def format_tags(self, weighted):
+        return ", ".join(tag for tag, _ in weighted)
+
+    def format_negative(self, negatives):
+        return ", ".join(negatives)
+
+    def prompt_suffix(self, negative_prompt):
+        """Text appended after the tags, for syntaxes that carry the negative prompt inline"""
+        return ""
+
+    def separator(self, emphasis_level):
+        """Text between the base prompt and the tags"""
+        return ", "
+
+    def compile(self, ranked, negatives, emphasis_level):
+        """
+        Return (separator, tag chunk, negative prompt, weighted tags) for
+        one breed and emphasis level.
+        """
+        weighted = self.weigh(ranked, emphasis_level)
+        negative_prompt = self.format_negative(negatives)
+        chunk = self.format_tags(weighted) + self.prompt_suffix(negative_prompt)
+        return self.separator(emphasis_level), chunk, negative_prompt, weighted
+
+
+def join_prompt(base_prompt, separator, chunk):
+    """Merge a base prompt with a compiled tag chunk"""
+    base_prompt = base_prompt.strip().rstrip(",:").rstrip()
+    return base_prompt + separator + chunk if base_prompt else chunk
+
+
+class StableDiffusionCompiler(OutputCompiler):
+    """(tag:1.25) attention weights, as read by A1111, ComfyUI and compatible UIs"""
+
+    name = "sd"
+    description = "Stable Diffusion weighted tags, e.g. (sleek coat:1.25), with a separate negative prompt"
+
+    def format_tags(self, weighted):
+        return ", ".join(tag if weight == 1.0 else f"({tag}:{weight:g})" for tag, weight in weighted)
+
+
+class MidjourneyCompiler(OutputCompiler):
+    """
+    Multi-prompt syntax: the base prompt and the tags are separate parts,
+    and emphasis sets how much the base prompt outweighs the tags (which
+    keep weight 1), since per-tag weights would drown out the subject.
+    The negative prompt goes inline as --no.
+    """
+
+    name = "midjourney"
+    description = "Midjourney multi-prompt, e.g. harbour::2 sleek coat, lean build, with --no for negative terms"
+    BASE_WEIGHTS = {"subtle": 3, "moderate": 2, "strong": 1}
+
+    def weigh(self, ranked, emphasis_level):
+        return [(tag, 1.0) for tag, _ in weighted_tags(ranked, emphasis_level)]
+
+    def separator(self, emphasis_level):
+        return f"::{self.BASE_WEIGHTS[emphasis_level]} "
+
+    def prompt_suffix(self, negative_prompt):
+        return f" --no {negative_prompt}" if negative_prompt else ""
+
+
+class PlainTagsCompiler(OutputCompiler):
+    """Unweighted tags, most distinctive first, for models without weight syntax"""
+
+    name = "plain"
+    description = "Comma-separated tags without weights (most distinctive first), for models like FLUX"
+
+    def weigh(self, ranked, emphasis_level):
+        return [(tag, 1.0) for tag, _ in weighted_tags(ranked, emphasis_level)]
+
+
+COMPILERS = {compiler.name: compiler for compiler in (StableDiffusionCompiler(), MidjourneyCompiler(), PlainTagsCompiler())}
+
+# (format, breed name, emphasis) -> (breed data, separator, chunk, negative
+# prompt, weighted tags); the breed record is compared by identity so a changed
+# breed is recompiled rather than served stale
+_compiled = managed_cache(
+    "compiled_prompts", max_entries=DEFAULT_COMPILE_CACHE, sizeof=lambda entry: estimate_bytes(entry[1:])
+)
+
+
+def get_compiler_names():
+    """Return the output format names"""
+    return list(COMPILERS)
+
+
+def compile_breed(output_format, breed_key, breed_data, emphasis_level):
+    """
+    Return (separator, tag chunk, negative prompt, weighted tags) for a
+    breed; join_prompt() merges them with a base prompt.
+
+    `breed_key` selects the precomputed tags; pass None for breeds that are
+    not in the active database under their key (e.g. tenant custom breeds).
+    Raises KeyError for an unknown output format.
+    """
+    compiler = COMPILERS[output_format]
+    cache_key = (output_format, breed_data["name"], emphasis_level)
+    entry = _compiled.get(cache_key, valid=lambda entry: entry[0] is breed_data)
+    if entry is None:
+        ranked, negatives = get_tag_index().tags_for(breed_key, breed_data)
+        entry = (breed_data, *compiler.compile(ranked, negatives, emphasis_level))
+        _compiled.put(cache_key, entry)
+    return entry[1:]
@@ -0,0 +1,229 @@
+"""
+Response compression for the HTTP transport.
+
+CompressionMiddleware is an ASGI middleware that compresses responses
+with the best encoding the client accepts (zstd, then gzip) according to
+its Accept-Encoding header, q-values included. Breed results repeat the
+same attribute phrases over and over, so catalog pages, comparisons and
+frame sequences shrink several-fold.
+
+Responses smaller than `minimum_size` are sent as is: on a payload of a
+few hundred bytes the saving is lost in the framing and CPU time. MCP tool
+results over streamable HTTP arrive as server-sent events; each chunk is
+compressed and flushed as it is sent, so events are not held back, and the
+size decision is made on the first chunk.
+
+zstd needs the `zstandard` package (or Python 3.14's compression.zstd);
+without it only gzip is offered. benchmarks/bench_compression.py measures
+ratio and speed per level on real tool results; the default levels come
+from it.
+"""
+
+import zlib
+
+try:
+    from compression import zstd as _zstd_stdlib
+except ImportError:
+    _zstd_stdlib = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_MINIMUM_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 5
+DEFAULT_ZSTD_LEVEL = 3
+
+# Compressible response types; anything else (images, already compressed
+# archives) passes through untouched
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+class GzipStream:
+    """Incremental gzip encoder that can flush at chunk boundaries"""
+
+    encoding = "gzip"
+
+    def __init__(self, level=DEFAULT_GZIP_LEVEL):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data, flush=False):
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class ZstdStream:
+    """Incremental zstd encoder that can flush at chunk boundaries"""
+
+    encoding = "zstd"
+
+    def __init__(self, level=DEFAULT_ZSTD_LEVEL):
+        if _zstd_stdlib is not None:
+            self._compressor = _zstd_stdlib.ZstdCompressor(level=level)
+            self._flush_block = _zstd_stdlib.ZstdCompressor.FLUSH_BLOCK
+            self._stdlib = True
+        else:
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+            self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            self._stdlib = False
+
+    def compress(self, data, flush=False):
+        if self._stdlib:
+            return self._compressor.compress(data, self._flush_block if flush else 0)
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(self._flush_block) if flush else out
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+def available_encodings():
+    """Encodings this process can produce, most preferred first"""
+    if _zstd_stdlib is not None or zstandard is not None:
+        return ["zstd", "gzip"]
+    return ["gzip"]
+
+
+def negotiate(accept_encoding, encodings):
+    """
+    Pick the encoding to use for an Accept-Encoding header value.
+
+    Returns the first of `encodings` (in server preference order) that the
+    client accepts with a non-zero q-value, or None for identity.
+    """
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    wildcard = accepted.get("*", 0.0)
+    for encoding in encodings:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def add_vary(headers, field=b"Accept-Encoding"):
+    """
+    Return response headers with `field` listed in Vary, merged into any
+    existing Vary header rather than sent as a second one.
+    """
+    tokens = [
+        token.strip()
+        for key, value in headers if key.lower() == b"vary"
+        for token in value.split(b",") if token.strip()
+    ]
+    if b"*" in tokens or field.lower() in (token.lower() for token in tokens):
+        return list(headers)
+    merged = b", ".join([*tokens, field])
+    return [(key, value) for key, value in headers if key.lower() != b"vary"] + [(b"vary", merged)]
+
+
+def compressible(headers):
+    """Whether a response with these headers is compressed when it is large enough"""
+    headers = {key.lower(): value for key, value in headers}
+    content_type = headers.get(b"content-type", b"").decode("latin-1")
+    return b"content-encoding" not in headers and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing HTTP responses per Accept-Encoding"""
+
+    def __init__(
+        self,
+        app,
+        minimum_size=DEFAULT_MINIMUM_SIZE,
+        encodings=None,
+        gzip_level=DEFAULT_GZIP_LEVEL,
+        zstd_level=DEFAULT_ZSTD_LEVEL
+    ):
+        supported = available_encodings()
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = [e for e in (encodings or supported) if e in supported]
+        self.levels = {"gzip": gzip_level, "zstd": zstd_level}
+
+    def _stream(self, encoding):
+        if encoding == "zstd":
+            return ZstdStream(self.levels["zstd"])
+        return GzipStream(self.levels["gzip"])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for key, value in scope["headers"]:
+            if key == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate(accept, self.encodings) if accept else None
+        if encoding is None:
+            # Not compressed for this request, but would be for another
+            # Accept-Encoding, so caches must still key on it
+            async def send_with_vary(message):
+                if message["type"] == "http.response.start" and compressible(message["headers"]):
+                    message = {**message, "headers": add_vary(message["headers"])}
+                await send(message)
+
+            await self.app(scope, receive, send_with_vary)
+            return
+
+        start_message = None
+        stream = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, stream, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                passthrough = not compressible(message["headers"])
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is not None:
+                # First body chunk: decide whether this response is worth compressing
+                if len(body) < self.minimum_size:
+                    passthrough = True
+                    start_message["headers"] = add_vary(start_message["headers"])
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+                stream = self._stream(encoding)
+                headers = [(k, v) for k, v in add_vary(start_message["headers"]) if k.lower() != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode()))
+                data = stream.compress(body, flush=more_body)
+                if not more_body:
+                    data += stream.finish()
+                    headers.append((b"content-length", str(len(data)).encode()))
+                start_message["headers"] = headers
+                await send(start_message)
+                start_message = None
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            data = stream.compress(body, flush=more_body)
+            if not more_body:
+                data += stream.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,141 @@
+"""
+Max-diversity breed selection.
+
+Each breed's attribute terms (the term index's category bitmasks, shifted
+into one integer) form a binary feature vector, and two breeds are as
+different as the Jaccard distance between their vectors: the fraction of
+their combined terms they do not share. Popcounts are precomputed, so a
+distance costs one AND and one bit count.
+
+Selection is greedy farthest-point: start from an extreme breed, then
+repeatedly add the candidate whose nearest already-selected breed is
+farthest away. Choosing k of n breeds costs O(n * k) distances, keeps
+each pick as far as possible from everything before it, and is within a
+factor of two of the best achievable minimum pairwise distance.
+"""
+
+from dog_breed_aesthetics_mcp.attributes import INDEX_CATEGORIES, get_term_index
+from dog_breed_aesthetics_mcp.breed_data import DerivedIndex
+
+MAX_DIVERSE_BREEDS = 50
+
+
+def jaccard_distance(mask_a, count_a, mask_b, count_b):
+    """Jaccard distance between two term masks with known popcounts"""
+    common = (mask_a & mask_b).bit_count()
+    union = count_a + count_b - common
+    return (union - common) / union if union else 0.0
+
+
+def category_offsets(term_index):
+    """Bit offset of each category's terms in a combined mask"""
+    offsets = {}
+    offset = 0
+    for category in INDEX_CATEGORIES:
+        offsets[category] = offset
+        offset += len(term_index.vocabulary[category])
+    return offsets
+
+
+def combine_masks(masks, offsets):
+    """Shift a breed's {category: mask} into one integer"""
+    combined = 0
+    for category, category_offset in offsets.items():
+        combined |= masks[category] << category_offset
+    return combined
+
+
+class DiversityIndex:
+    """One combined term mask and popcount per breed, in database order"""
+
+    def __init__(self, database):
+        term_index = get_term_index()
+        offsets = category_offsets(term_index)
+        keys = list(database)
+        self._set_rows(
+            keys,
+            [database[key]["group"] for key in keys],
+            [combine_masks(term_index.masks_for(key, database[key]), offsets) for key in keys],
+        )
+
+    @classmethod
+    def from_parts(cls, keys, groups, masks):
+        """Create an index from breed keys, their groups and their combined term masks"""
+        index = cls.__new__(cls)
+        index._set_rows(keys, groups, masks)
+        return index
+
+    def _set_rows(self, keys, groups, masks):
+        self.keys = keys
+        self.groups = [group.lower() for group in groups]
+        self.rows = {key: row for row, key in enumerate(keys)}
+        self.masks = masks
+        self.counts = [mask.bit_count() for mask in masks]
+
+    def distance(self, row_a, row_b):
+        """Jaccard distance between two rows"""
+        return jaccard_distance(self.masks[row_a], self.counts[row_a], self.masks[row_b], self.counts[row_b])
+
+    def candidates(self, group=None, keys=None):
+        """
+        Return rows matching the filters, in database order.
+
+        `group` is matched case-insensitively; `keys`, if given, limits the
+        rows to those breed keys (e.g. the result of a feature query).
+        """
+        rows = range(len(self.keys))
+        if keys is not None:
+            rows = sorted(self.rows[key] for key in keys if key in self.rows)
+        if group is not None:
+            group = group.strip().lower()
+            rows = [row for row in rows if self.groups[row] == group]
+        return list(rows)
+
+    def select(self, rows, count):
+        """
+        Greedily pick up to `count` mutually distant rows from `rows`.
+
+        Returns (row, distance) pairs in pick order, where distance is how
+        far the row was from the nearest earlier pick (None for the first).
+        Ties go to the earlier row, so the result is deterministic.
+        """
+        if not rows or count < 1:
+            return []
+        masks = [self.masks[row] for row in rows]
+        counts = [self.counts[row] for row in rows]
+
+        # Start from the candidate farthest from the first one, which
+        # lands on an extreme of the set rather than wherever it begins
+        mins = self._distances_to(masks, counts, 0)
+        pick = mins.index(max(mins))
+        picks = [(rows[pick], None)]
+        mins = self._distances_to(masks, counts, pick)
+
+        while len(picks) < min(count, len(rows)):
+            farthest = max(mins)
+            pick = mins.index(farthest)
+            picks.append((rows[pick], farthest))
+            mask, pick_count = masks[pick], counts[pick]
+            mins = [
+                distance if distance <= (new := jaccard_distance(mask, pick_count, other, other_count)) else new
+                for distance, other, other_count in zip(mins, masks, counts)
+            ]
+            # The pick is now at zero, like any exact duplicate of it; keep
+            # it below every candidate so it is never picked again
+            mins[pick] = -1.0
+        return picks
+
+    @staticmethod
+    def _distances_to(masks, counts, position):
+        mask, count = masks[position], counts[position]
+        distances = [jaccard_distance(mask, count, other, other_count) for other, other_count in zip(masks, counts)]
+        distances[position] = -1.0
+        return distances
+
+
+_diversity_index = DerivedIndex(DiversityIndex)
+
+
+def get_diversity_index():
+    """Return the diversity index for the active breed database, building it on first use"""
+    return _diversity_index.get()
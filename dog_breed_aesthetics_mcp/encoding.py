@@ -0,0 +1,71 @@
+"""
+Fast JSON encoding of tool results.
+
+FastMCP's default result conversion runs a dictionary through pydantic
+several times: once to build the text content, once to produce the
+structured content against the tool's return type, then again to re-encode
+the text from it and once more when the ToolResult is validated. Tool
+results here are already plain JSON-compatible dicts, so FastJsonTool
+encodes each one once, with orjson when it is installed and the standard
+library otherwise, and hands the same dict over as structured content.
+
+Other return values (strings, content blocks) take FastMCP's normal path.
+
+Register tools with json_tool(server) in place of server.tool():
+
+    @json_tool(mcp)
+    def compare_breeds(breed_names: list[str]) -> ComparisonResult | ErrorResult:
+        ...
+"""
+
+import inspect
+import json
+
+from fastmcp.tools import FunctionTool, ToolResult
+from mcp.types import TextContent
+
+from dog_breed_aesthetics_mcp.models import output_schema
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ENCODER = "orjson" if orjson is not None else "json"
+
+_SEPARATORS = (",", ":")
+
+
+def dumps(value):
+    """Encode a result as compact UTF-8 JSON text"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str).decode()
+    return json.dumps(value, separators=_SEPARATORS, ensure_ascii=False, default=str)
+
+
+class FastJsonTool(FunctionTool):
+    """A FunctionTool whose dict results are encoded once, without pydantic"""
+
+    def convert_result(self, raw_value):
+        if type(raw_value) is not dict:
+            return super().convert_result(raw_value)
+        return ToolResult.model_construct(
+            content=[TextContent(type="text", text=dumps(raw_value))],
+            structured_content=raw_value,
+            meta=None,
+            is_error=False
+        )
+
+
+def json_tool(server):
+    """
+    Decorator registering a function as a FastJsonTool on server.
+
+    The advertised output schema comes from the return annotation (see
+    models.output_schema); the function itself is returned unchanged.
+    """
+    def decorator(fn):
+        schema = output_schema(inspect.signature(fn).return_annotation)
+        server.add_tool(FastJsonTool.from_function(fn, output_schema=schema))
+        return fn
+    return decorator
@@ -0,0 +1,169 @@
+"""
+Static export of the breed catalog.
+
+Catalog reads (list_available_breeds, get_breed_characteristics) need no
+live server, so they can be served from static hosting or a CDN instead.
+The export writes the active catalog, variants included, as:
+
+- index.json: every breed's key, name and group (and parent, for
+  variants) with the paths of its files; the one file clients fetch
+  first
+- breeds/<key>.<hash>.json: the breed's data
+- breeds/<key>.<hash>.txt: the breed as formatted text, the "text"
+  field of get_breed_characteristics
+- breeds.<hash>.txt: the listing as formatted text, the "text" field of
+  list_available_breeds
+
+Every file except index.json is named after a hash of its content, so it
+never changes once published and can be cached forever; only index.json
+needs a short cache lifetime. Files get precompressed .gz (and .zst,
+when zstd is available) siblings for servers that send them as-is to
+clients that accept them, skipped where compression would not make the
+file smaller. The output is deterministic: exporting an unchanged
+catalog rewrites nothing but index.json, and files from earlier exports
+are left in place for clients still holding an older index.
+
+Usage:
+    python -m dog_breed_aesthetics_mcp.export site/catalog
+    DOG_BREED_SYNTHETIC_SIZE=10000 python -m dog_breed_aesthetics_mcp.export site/catalog
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.breed_data import VARIANT_DATABASE, get_breed_data, get_variant_keys
+from dog_breed_aesthetics_mcp.catalog import get_catalog_index
+from dog_breed_aesthetics_mcp.compression import GzipStream, ZstdStream, available_encodings
+from dog_breed_aesthetics_mcp.encoding import dumps
+
+INDEX_FILE = "index.json"
+INDEX_FORMAT = 1
+HASH_LENGTH = 12
+
+# Files are compressed once, offline, so use the slowest, smallest levels
+EXPORT_GZIP_LEVEL = 9
+EXPORT_ZSTD_LEVEL = 19
+
+_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def precompress(data, encodings):
+    """Return {file suffix: compressed bytes} for each encoding that makes data smaller"""
+    siblings = {}
+    for encoding in encodings:
+        stream = GzipStream(EXPORT_GZIP_LEVEL) if encoding == "gzip" else ZstdStream(EXPORT_ZSTD_LEVEL)
+        compressed = stream.compress(data) + stream.finish()
+        if len(compressed) < len(data):
+            siblings[_SUFFIXES[encoding]] = compressed
+    return siblings
+
+
+def _write_atomic(path, data):
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+class _Bundle:
+    """Writes files under an output directory, with precompressed siblings"""
+
+    def __init__(self, out_dir, encodings):
+        self.out_dir = out_dir
+        self.encodings = encodings
+        self.written = 0
+        self.unchanged = 0
+
+    def write(self, relative_path, data, hashed=True):
+        """Write data (and its siblings); a hashed file that already exists is left alone"""
+        if hashed:
+            stem, suffix = os.path.splitext(relative_path)
+            relative_path = f"{stem}.{content_hash(data)}{suffix}"
+        path = os.path.join(self.out_dir, relative_path)
+        if hashed and os.path.exists(path):
+            self.unchanged += 1
+            return relative_path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        for sibling_suffix, compressed in precompress(data, self.encodings).items():
+            _write_atomic(path + sibling_suffix, compressed)
+        # The file itself last, so an existing file implies its siblings exist
+        _write_atomic(path, data)
+        self.written += 1
+        return relative_path
+
+
+def _catalog_keys():
+    """Built-in breeds in catalog order, then variants"""
+    keys = [entry[3] for entry in get_catalog_index().order]
+    keys.extend(key for key in get_variant_keys() if get_breed_data(key) is not None)
+    return keys
+
+
+def export_catalog(out_dir, encodings=None):
+    """
+    Export the active catalog to out_dir; returns the index.
+
+    `encodings` limits the precompressed siblings (default: every encoding
+    available in this process).
+    """
+    bundle = _Bundle(out_dir, available_encodings() if encodings is None else list(encodings))
+    breeds = []
+    for breed_key in _catalog_keys():
+        breed_data = get_breed_data(breed_key)
+        entry = {"key": breed_key, "name": breed_data["name"], "group": breed_data["group"]}
+        if breed_key in VARIANT_DATABASE:
+            entry["parent"] = VARIANT_DATABASE[breed_key]["parent"]
+        entry["json"] = bundle.write(
+            f"breeds/{breed_key}.json", dumps({"key": breed_key, **breed_data}).encode()
+        )
+        entry["text"] = bundle.write(
+            f"breeds/{breed_key}.txt", server.get_breed_characteristics(breed_key)["text"].encode()
+        )
+        breeds.append(entry)
+
+    listing = bundle.write("breeds.txt", server.list_available_breeds()["text"].encode())
+    index = {
+        "format": INDEX_FORMAT,
+        "catalog": content_hash(dumps(breeds).encode()),
+        "breed_count": len(breeds),
+        "listing": listing,
+        "breeds": breeds,
+    }
+    # Written last, so clients never see an index pointing at missing files
+    bundle.write(INDEX_FILE, dumps(index).encode(), hashed=False)
+    index["files_written"] = bundle.written
+    index["files_unchanged"] = bundle.unchanged
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("out_dir", help="directory to write the bundle to")
+    parser.add_argument(
+        "--encodings", default=",".join(available_encodings()),
+        help="comma-separated precompressed encodings to write, or '' for none (default: %(default)s)"
+    )
+    args = parser.parse_args(argv)
+
+    encodings = [e.strip() for e in args.encodings.split(",") if e.strip()]
+    unsupported = sorted(set(encodings) - set(available_encodings()))
+    if unsupported:
+        parser.error("unsupported encodings: " + ", ".join(unsupported))
+
+    index = export_catalog(args.out_dir, encodings)
+    print(
+        f"Exported {index['breed_count']} breeds to {args.out_dir} "
+        f"({index['files_written']} files written, {index['files_unchanged']} unchanged)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Numeric features parsed from free-text breed attributes.
+
+`scale`, `coat.length` and `movement.energy` are written as prose
+("small-medium (but low)", "medium to long", "moderate to high, fluid").
+They are parsed once into ordinal values and stored column-wise so
+breeds can be sorted and range-filtered without reparsing text.
+"""
+
+import math
+from array import array
+
+from dog_breed_aesthetics_mcp.breed_data import DerivedIndex
+
+# Ordinal levels per feature; "X to Y" ranges parse to the midpoint
+SCALE_LEVELS = {
+    "toy": 0.0,
+    "small": 1.0,
+    "small-medium": 1.5,
+    "medium": 2.0,
+    "medium-large": 2.5,
+    "large": 3.0,
+    "giant": 4.0,
+}
+
+COAT_LENGTH_LEVELS = {
+    "very short": 0.0,
+    "short": 1.0,
+    "medium": 2.0,
+    "moderately long": 2.5,
+    "long": 3.0,
+    "very long": 4.0,
+}
+
+ENERGY_LEVELS = {
+    "low": 1.0,
+    "moderate": 2.0,
+    "high": 3.0,
+    "very high": 4.0,
+}
+
+# Descriptive words that lead some values in place of a level name
+# ("explosive speed capability"), and the level each one means
+ENERGY_ALIASES = {
+    "explosive": "very high",
+    "tireless": "very high",
+    "intense": "very high",
+    "energetic": "high",
+    "lively": "high",
+    "calm": "low",
+    "placid": "low",
+}
+
+FEATURE_LEVELS = {
+    "scale": SCALE_LEVELS,
+    "coat_length": COAT_LENGTH_LEVELS,
+    "energy": ENERGY_LEVELS,
+}
+
+FEATURE_ALIASES = {
+    "energy": ENERGY_ALIASES,
+}
+
+MISSING = math.nan
+
+
+def _part_level(part, levels, aliases):
+    value = levels.get(part)
+    if value is None and aliases:
+        level = aliases.get(part.split(" ")[0])
+        if level is not None:
+            value = levels[level]
+    return value
+
+
+def parse_level(text, levels, aliases=None):
+    """
+    Parse the leading phrase of an attribute value into an ordinal level.
+
+    Only the first comma-separated segment is considered, parenthetical
+    notes are dropped, and "X to Y" returns the midpoint of X and Y. A
+    phrase that is not a level name may start with a word in `aliases`.
+    Returns NaN when the phrase does not name a known level.
+    """
+    segment = text.split(",")[0].split("(")[0].strip().lower()
+    parts = [part.strip() for part in segment.split(" to ")]
+    values = [_part_level(part, levels, aliases) for part in parts]
+    if not values or any(value is None for value in values):
+        return MISSING
+    return sum(values) / len(values)
+
+
+def extract_features(breed_data):
+    """Return the numeric features of a single breed"""
+    return {
+        "scale": parse_level(breed_data["scale"], SCALE_LEVELS),
+        "coat_length": parse_level(breed_data["coat"]["length"], COAT_LENGTH_LEVELS),
+        "energy": parse_level(breed_data["movement"]["energy"], ENERGY_LEVELS, ENERGY_ALIASES),
+    }
+
+
+def resolve_bound(feature, bound):
+    """Convert a range bound given as a level name or a number to a float"""
+    if bound is None:
+        return None
+    if isinstance(bound, (int, float)):
+        return float(bound)
+    levels = FEATURE_LEVELS[feature]
+    value = levels.get(str(bound).strip().lower())
+    if value is None:
+        raise ValueError(
+            f"Unknown {feature} level '{bound}'. Expected one of: " + ", ".join(levels)
+        )
+    return value
+
+
+class FeatureTable:
+    """Column-wise numeric features for every breed in a database"""
+
+    def __init__(self, database):
+        self.keys = list(database)
+        self.names = [database[key]["name"] for key in self.keys]
+        self.columns = {feature: array("d") for feature in FEATURE_LEVELS}
+        for key in self.keys:
+            for feature, value in extract_features(database[key]).items():
+                self.columns[feature].append(value)
+
+    @classmethod
+    def from_columns(cls, keys, names, columns):
+        """Create a table from prebuilt key/name lists and feature columns"""
+        table = cls.__new__(cls)
+        table.keys = keys
+        table.names = names
+        table.columns = columns
+        return table
+
+    def value(self, feature, row):
+        """Return a feature value for a row, or None when it is missing"""
+        value = self.columns[feature][row]
+        return None if math.isnan(value) else value
+
+    def query(self, ranges=None, sort_by="name", descending=False):
+        """
+        Return row indices matching inclusive (low, high) feature ranges.
+
+        `ranges` maps feature name to a (low, high) pair where either bound
+        may be None. Rows with a missing value for a constrained feature
+        never match. Results are sorted by a feature column or by name;
+        missing values sort last.
+        """
+        selected = [True] * len(self.keys)
+        for feature, (low, high) in (ranges or {}).items():
+            column = self.columns[feature]
+            low = -math.inf if low is None else low
+            high = math.inf if high is None else high
+            # NaN compares false, so missing values drop out here
+            selected = [keep and low <= value <= high for keep, value in zip(selected, column)]
+
+        rows = [row for row, keep in enumerate(selected) if keep]
+
+        if sort_by == "name":
+            rows.sort(key=self.names.__getitem__, reverse=descending)
+        else:
+            column = self.columns[sort_by]
+            present = [row for row in rows if not math.isnan(column[row])]
+            missing = [row for row in rows if math.isnan(column[row])]
+            present.sort(key=column.__getitem__, reverse=descending)
+            rows = present + missing
+        return rows
+
+
+_feature_table = DerivedIndex(FeatureTable)
+
+
+def get_feature_table():
+    """Return the feature table for the active breed database, building it on first use"""
+    return _feature_table.get()
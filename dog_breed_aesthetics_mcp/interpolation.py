@@ -0,0 +1,149 @@
+"""
+Interpolated breed sequences for animation frame prompts.
+
+Morphs from one breed aesthetic to another over N frames. The per-frame
+blend weights and term counts for every attribute are computed in one
+pass over the term representation of both breeds; frames are then
+rendered lazily so large sequences can be consumed a window at a time.
+A plan only covers the window it is built for, so its cost follows the
+frames requested rather than the length of the sequence.
+"""
+
+from dog_breed_aesthetics_mcp.attributes import CATEGORY_FIELDS, breed_terms
+
+MAX_INTERPOLATION_FRAMES = 10000
+
+FRAME_INSTRUCTION = """
+Create frame {frame_number} of {frame_count} in an image sequence that morphs from {start_name} to {end_name} aesthetics.
+
+Base prompt: "{base_prompt}"
+
+Emphasis level: {emphasis_level}
+Blend: {start_percent}% {start_name}, {end_percent}% {end_name}
+
+Key aesthetic qualities for this frame:
+{visual_essence}
+
+Requirements:
+1. Preserve the core intent and subject of the base prompt in every frame
+2. Weave in the blended aesthetics naturally, not literally (don't add actual dogs)
+3. Keep composition consistent with neighbouring frames so the sequence animates smoothly
+4. Match the emphasis level - subtle should be light touch, strong should be pronounced
+5. Keep the enhanced prompt concise and coherent (2-4 sentences typically)
+
+Return only the enhanced prompt text for this frame.
+"""
+
+
+def frame_weights(frame_count, start_frame=0, stop_frame=None):
+    """
+    Return the end-breed weight for frames start_frame..stop_frame
+    (exclusive); over the whole sequence they run from 0.0 to 1.0 inclusive.
+    """
+    if not 1 <= frame_count <= MAX_INTERPOLATION_FRAMES:
+        raise ValueError(f"frame_count must be between 1 and {MAX_INTERPOLATION_FRAMES}")
+    if stop_frame is None or stop_frame > frame_count:
+        stop_frame = frame_count
+    if not 0 <= start_frame <= stop_frame:
+        raise ValueError("start_frame must be between 0 and the stop frame")
+    if frame_count == 1:
+        return [0.0] * (stop_frame - start_frame)
+    step = 1.0 / (frame_count - 1)
+    return [i * step for i in range(start_frame, stop_frame)]
+
+
+def _share(weight, term_count):
+    """Number of terms a breed contributes at the given weight (round half up)"""
+    return int(weight * term_count + 0.5)
+
+
+class BreedInterpolation:
+    """
+    Precomputed blend plan between two breeds over a fixed number of
+    frames, for the window start_frame..stop_frame (exclusive)
+    """
+
+    def __init__(self, start_data, end_data, frame_count, start_frame=0, stop_frame=None):
+        self.start_data = start_data
+        self.end_data = end_data
+        self.frame_count = frame_count
+        self.weights = frame_weights(frame_count, start_frame, stop_frame)
+        self.start_frame = start_frame
+        self.stop_frame = start_frame + len(self.weights)
+
+        start_terms = breed_terms(start_data)
+        end_terms = breed_terms(end_data)
+
+        # Term counts for every (attribute, frame in the window) pair, computed up front so
+        # rendering a frame is only slicing and joining
+        self._terms = {}
+        self._counts = {}
+        for key, start in start_terms.items():
+            end = end_terms[key]
+            self._terms[key] = (start, end)
+            self._counts[key] = (
+                [_share(1.0 - w, len(start)) for w in self.weights],
+                [_share(w, len(end)) for w in self.weights],
+            )
+
+    def _blend(self, key, index):
+        start, end = self._terms[key]
+        start_counts, end_counts = self._counts[key]
+        blended = list(start[:start_counts[index]])
+        for term in end[:end_counts[index]]:
+            if term not in blended:
+                blended.append(term)
+        return blended
+
+    def render_frame(self, frame, base_prompt, emphasis_level="moderate"):
+        """Render the characteristics and synthesis instruction for one frame of the window"""
+        if not self.start_frame <= frame < self.stop_frame:
+            raise IndexError(f"frame {frame} is outside {self.start_frame}..{self.stop_frame - 1}")
+        index = frame - self.start_frame
+        weight = self.weights[index]
+        characteristics = {}
+        for category, fields in CATEGORY_FIELDS.items():
+            characteristics[category] = {
+                field: ", ".join(self._blend((category, field), index))
+                for field in fields
+            }
+        characteristics["color_palette"] = self._blend(("color_palette", None), index)
+        characteristics["scale"] = ", ".join(self._blend(("scale", None), index))
+        visual_essence = ", ".join(self._blend(("visual_essence", None), index))
+
+        end_percent = round(weight * 100)
+        return {
+            "frame": frame,
+            "blend": {
+                "start_weight": round(1.0 - weight, 4),
+                "end_weight": round(weight, 4),
+            },
+            "visual_essence": visual_essence,
+            "characteristics": characteristics,
+            "synthesis_instruction": FRAME_INSTRUCTION.format(
+                frame_number=frame + 1,
+                frame_count=self.frame_count,
+                start_name=self.start_data["name"],
+                end_name=self.end_data["name"],
+                base_prompt=base_prompt,
+                emphasis_level=emphasis_level,
+                start_percent=100 - end_percent,
+                end_percent=end_percent,
+                visual_essence=visual_essence,
+            ),
+        }
+
+
+def iter_interpolated_frames(
+    start_data,
+    end_data,
+    base_prompt,
+    frame_count,
+    emphasis_level="moderate",
+    start_frame=0,
+    stop_frame=None,
+):
+    """Yield frames start_frame..stop_frame (exclusive) of an interpolated sequence"""
+    plan = BreedInterpolation(start_data, end_data, frame_count, start_frame, stop_frame)
+    for frame in range(plan.start_frame, plan.stop_frame):
+        yield plan.render_frame(frame, base_prompt, emphasis_level)
@@ -0,0 +1,288 @@
+"""
+Per-tool allocation budgets.
+
+Runs every tool in server.py over representative inputs under tracemalloc
+and records, per tool:
+
+- peak_kb: the most memory one call had allocated at once, above what
+  was held before it (its working set, result included)
+- blocks_per_call: memory blocks still live when a call returns, result
+  included (median over a few sampled calls)
+- retained_bytes_per_call: growth of traced memory over a long run of
+  calls with varying inputs, per call, after warm-up has filled bounded
+  caches. It compares the lowest reading in the first and last quarter
+  of the run (at least SWEEP_CALLS calls each, half the run at most), so
+  memory that is released in periodic sweeps (sqlite3 prunes its cursor
+  list every 200 cursors) does not count; steady
+  growth is a cache that grows with its inputs, or a leak.
+- rss_growth_kb: resident set growth over the long run (Linux only;
+  reported, budgeted only if a budget sets it)
+
+Each measurement is checked against a per-tool budget, and the run fails
+when any budget is exceeded or a tool has none. Budgets default to
+DEFAULT_BUDGETS and can be overridden from a JSON file of the same shape.
+Custom breed tools run against a scratch tenant store. Every input must
+succeed: a sampled call that returns an error result stops the run, so
+budgets always describe the success path.
+
+Usage:
+    python -m dog_breed_aesthetics_mcp.memory_budget
+    python -m dog_breed_aesthetics_mcp.memory_budget --calls 5000 --budgets budgets.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import tracemalloc
+
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.breed_data import get_database
+from dog_breed_aesthetics_mcp.templates import DEFAULT_RENDER_CACHE
+from dog_breed_aesthetics_mcp.tenants import TenantStore, set_tenant_store
+
+DEFAULT_CALLS = 1000
+DEFAULT_WARMUP = 1000
+BLOCK_SAMPLES = 5
+# Calls between sqlite3's cursor list sweeps; each floor window spans one
+SWEEP_CALLS = 200
+
+DEFAULT_BUDGETS = {
+    "list_available_breeds": {"peak_kb": 16, "blocks_per_call": 64, "retained_bytes_per_call": 8},
+    "get_breed_characteristics": {"peak_kb": 16, "blocks_per_call": 16, "retained_bytes_per_call": 8},
+    "enhance_with_breed_aesthetic": {"peak_kb": 16, "blocks_per_call": 32, "retained_bytes_per_call": 8},
+    "interpolate_breed_aesthetics": {"peak_kb": 256, "blocks_per_call": 2048, "retained_bytes_per_call": 8},
+    "compare_breeds": {"peak_kb": 64, "blocks_per_call": 512, "retained_bytes_per_call": 8},
+    "find_breeds_by_features": {"peak_kb": 16, "blocks_per_call": 128, "retained_bytes_per_call": 8},
+    "select_diverse_breeds": {"peak_kb": 16, "blocks_per_call": 128, "retained_bytes_per_call": 8},
+    "sample_breeds": {"peak_kb": 64, "blocks_per_call": 256, "retained_bytes_per_call": 8},
+    "list_breeds_page": {"peak_kb": 16, "blocks_per_call": 128, "retained_bytes_per_call": 8},
+    "list_breed_variants": {"peak_kb": 16, "blocks_per_call": 128, "retained_bytes_per_call": 8},
+    "get_breed_changes_since": {"peak_kb": 4, "blocks_per_call": 16, "retained_bytes_per_call": 8},
+    "register_custom_breed": {"peak_kb": 32, "blocks_per_call": 32, "retained_bytes_per_call": 8},
+    "update_custom_breed": {"peak_kb": 128, "blocks_per_call": 256, "retained_bytes_per_call": 8},
+    "delete_custom_breed": {"peak_kb": 16, "blocks_per_call": 16, "retained_bytes_per_call": 8},
+    "list_custom_breeds": {"peak_kb": 16, "blocks_per_call": 32, "retained_bytes_per_call": 8},
+    "register_synthesis_template": {"peak_kb": 16, "blocks_per_call": 16, "retained_bytes_per_call": 8},
+    "list_synthesis_templates": {"peak_kb": 16, "blocks_per_call": 64, "retained_bytes_per_call": 8},
+    "score_enhanced_prompts": {"peak_kb": 128, "blocks_per_call": 1536, "retained_bytes_per_call": 8},
+    "compile_breed_prompt": {"peak_kb": 16, "blocks_per_call": 32, "retained_bytes_per_call": 8},
+    "compile_breed_prompts": {"peak_kb": 64, "blocks_per_call": 256, "retained_bytes_per_call": 8},
+    "configure_profiling": {"peak_kb": 4, "blocks_per_call": 16, "retained_bytes_per_call": 8},
+    "get_admission_metrics": {"peak_kb": 4, "blocks_per_call": 16, "retained_bytes_per_call": 8},
+    "get_cache_stats": {"peak_kb": 4, "blocks_per_call": 32, "retained_bytes_per_call": 8},
+    "configure_caches": {"peak_kb": 4, "blocks_per_call": 32, "retained_bytes_per_call": 8},
+}
+
+_EMPHASIS_LEVELS = ("subtle", "moderate", "strong")
+_OUTPUT_FORMATS = ("sd", "midjourney", "plain")
+
+
+def _custom_breed(i):
+    return {
+        "group": "Hound",
+        "proportions": {"body_ratio": "long, lean", "build": "fine-boned", "head": "narrow", "legs": "long"},
+        "coat": {"texture": "smooth", "length": "short", "qualities": f"glossy, studio-lit {i % 7}"},
+        "movement": {"gait": "double suspension", "energy": "explosive", "qualities": "effortless"},
+        "temperament_aesthetic": {"mood": "serene", "presence": "elegant", "character": "gentle"},
+        "color_palette": ["silver", "charcoal"],
+        "scale": "medium",
+        "visual_essence": "sleek studio silhouette",
+    }
+
+
+def tool_calls(seed=0):
+    """(tool name, call) pairs; each call takes the call number and picks its inputs from it"""
+    # Breed keys in catalog order; every key resolves, unlike some display names
+    names = list(get_database())
+    names = names[seed % len(names):] + names[:seed % len(names)]
+    prompts = [f"a quiet harbour at dawn, sleek hulls with effortless grace, frame {i}" for i in range(100)]
+
+    # Inputs cycle through the catalog so warm-up reaches every cache entry
+    def pick(i, offset=0):
+        return names[(i + offset) % len(names)]
+
+    # Mirrors that are up to date are the common case
+    version = server.get_breed_changes_since()["version"]
+
+    def update(i):
+        server.register_custom_breed("budget", "Studio Whippet", _custom_breed(i))
+        return server.update_custom_breed("budget", "Studio Whippet", {"coat": {"length": "short"}})
+
+    def delete(i):
+        server.register_custom_breed("budget", "Studio Whippet", _custom_breed(i))
+        return server.delete_custom_breed("budget", "Studio Whippet")
+
+    return [
+        ("list_available_breeds", lambda i: server.list_available_breeds()),
+        ("get_breed_characteristics", lambda i: server.get_breed_characteristics(pick(i))),
+        ("enhance_with_breed_aesthetic", lambda i: server.enhance_with_breed_aesthetic(
+            pick(i), f"a quiet harbour {i}", _EMPHASIS_LEVELS[i % 3], template=("prose", "tags")[i // 3 % 2])),
+        ("interpolate_breed_aesthetics", lambda i: server.interpolate_breed_aesthetics(
+            pick(i), pick(i, 7), f"a quiet harbour {i}", 24)),
+        ("compare_breeds", lambda i: server.compare_breeds([pick(i, k) for k in range(10)])),
+        ("find_breeds_by_features", lambda i: server.find_breeds_by_features(scale_min="small", energy_min="high")),
+        ("select_diverse_breeds", lambda i: server.select_diverse_breeds(5 + i % 5, scale_min=("toy", "small")[i % 2])),
+        ("sample_breeds", lambda i: server.sample_breeds(
+            20, seed=i, replace=bool(i % 2), group_weights={"Toy": 3}, base_prompt=f"a quiet harbour {i}")),
+        ("list_breeds_page", lambda i: server.list_breeds_page(page_size=50)),
+        ("list_breed_variants", lambda i: server.list_breed_variants()),
+        ("get_breed_changes_since", lambda i: server.get_breed_changes_since(version)),
+        ("register_custom_breed", lambda i: server.register_custom_breed(
+            "budget", f"Studio Whippet {i % 10}", _custom_breed(i))),
+        ("update_custom_breed", update),
+        ("delete_custom_breed", delete),
+        ("list_custom_breeds", lambda i: server.list_custom_breeds("budget")),
+        ("register_synthesis_template", lambda i: server.register_synthesis_template(
+            "budget", "{base_prompt}, in the manner of {breed_name} " + str(i % 10))),
+        ("list_synthesis_templates", lambda i: server.list_synthesis_templates()),
+        ("score_enhanced_prompts", lambda i: server.score_enhanced_prompts(pick(i), prompts)),
+        ("compile_breed_prompt", lambda i: server.compile_breed_prompt(
+            pick(i), f"a quiet harbour {i}", _EMPHASIS_LEVELS[i % 3], _OUTPUT_FORMATS[i // 3 % 3])),
+        ("compile_breed_prompts", lambda i: server.compile_breed_prompts(
+            pick(i), prompts, _EMPHASIS_LEVELS[i % 3], _OUTPUT_FORMATS[i // 3 % 3])),
+        ("configure_profiling", lambda i: server.configure_profiling(False)),
+        ("get_admission_metrics", lambda i: server.get_admission_metrics()),
+        ("get_cache_stats", lambda i: server.get_cache_stats()),
+        ("configure_caches", lambda i: server.configure_caches("template_renders", max_entries=DEFAULT_RENDER_CACHE)),
+    ]
+
+
+# Leave out the harness's own allocations, including the snapshots
+_SNAPSHOT_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+
+
+def _traced_blocks():
+    snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+    return sum(stat.count for stat in snapshot.statistics("filename"))
+
+
+def _resident_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _measure(call, calls, warmup):
+    blocks = []
+    for i in range(BLOCK_SAMPLES):
+        gc.collect()
+        before = _traced_blocks()
+        result = call(warmup + i)
+        blocks.append(_traced_blocks() - before)
+        if isinstance(result, dict) and "error" in result:
+            raise ValueError(f"call {warmup + i} returned an error: {result['error']}")
+        del result
+
+    gc.collect()
+    start_rss = _resident_bytes()
+    window = max(1, min(max(calls // 4, SWEEP_CALLS), calls // 2))
+    checkpoint = max(1, window // 16)
+    peak = 0
+    first_floor = last_floor = None
+    for n in range(calls):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        call(warmup + n)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+        if n % checkpoint or window <= n < calls - window:
+            continue
+        # Read the floor with cyclic garbage collected; keep only running
+        # minimums, since storing every reading would itself be traced
+        gc.collect()
+        current = tracemalloc.get_traced_memory()[0]
+        if n < window:
+            first_floor = current if first_floor is None else min(first_floor, current)
+        else:
+            last_floor = current if last_floor is None else min(last_floor, current)
+    end_rss = _resident_bytes()
+    retained = (last_floor if last_floor is not None else first_floor) - first_floor
+
+    return {
+        "peak_kb": round(peak / 1024, 1),
+        "blocks_per_call": statistics.median(blocks),
+        "retained_bytes_per_call": round(max(retained, 0) / max(1, calls - window), 2),
+        "rss_growth_kb": (end_rss - start_rss) // 1024 if start_rss is not None else None,
+    }
+
+
+def measure_tool(call, calls=DEFAULT_CALLS, warmup=DEFAULT_WARMUP):
+    """Measure one tool's allocations; tracemalloc must already be tracing"""
+    for i in range(warmup):
+        call(i)
+    # Everything that exists after warm-up is left out of the many
+    # collections below, which keeps them fast
+    gc.collect()
+    gc.freeze()
+    try:
+        return _measure(call, calls, warmup)
+    finally:
+        gc.unfreeze()
+
+
+def check_budgets(results, budgets):
+    """Return a message per exceeded or missing budget"""
+    violations = []
+    for tool_name, measured in results.items():
+        budget = budgets.get(tool_name)
+        if budget is None:
+            violations.append(f"{tool_name}: no budget configured")
+            continue
+        for metric, limit in budget.items():
+            value = measured.get(metric)
+            if value is not None and value > limit:
+                violations.append(f"{tool_name}: {metric} {value} exceeds budget {limit}")
+    return violations
+
+
+def run(calls=DEFAULT_CALLS, warmup=DEFAULT_WARMUP, tools=None, seed=0):
+    """Measure every tool (or just `tools`); returns {tool name: measurements}"""
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        previous = set_tenant_store(TenantStore(os.path.join(scratch, "tenants.sqlite3")))
+        tracemalloc.start()
+        try:
+            for tool_name, call in tool_calls(seed):
+                if tools is None or tool_name in tools:
+                    try:
+                        results[tool_name] = measure_tool(call, calls, warmup)
+                    except ValueError as e:
+                        raise ValueError(f"{tool_name}: {e}") from None
+        finally:
+            tracemalloc.stop()
+            set_tenant_store(previous).close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS, help="measured calls per tool")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="unmeasured calls that fill caches")
+    parser.add_argument("--budgets", help="JSON file of per-tool budgets (default: built-in budgets)")
+    parser.add_argument("--tool", action="append", dest="tools", help="only measure this tool (repeatable)")
+    args = parser.parse_args(argv)
+
+    budgets = DEFAULT_BUDGETS
+    if args.budgets:
+        with open(args.budgets, encoding="utf-8") as f:
+            budgets = json.load(f)
+
+    results = run(args.calls, args.warmup, args.tools)
+    columns = ("peak_kb", "blocks_per_call", "retained_bytes_per_call", "rss_growth_kb")
+    print(f"{'tool':>28}  " + "  ".join(f"{column:>23}" for column in columns))
+    for tool_name, measured in results.items():
+        print(f"{tool_name:>28}  " + "  ".join(f"{str(measured[column]):>23}" for column in columns))
+
+    violations = check_budgets(results, budgets)
+    for violation in violations:
+        print(f"FAIL {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
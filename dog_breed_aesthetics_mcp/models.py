@@ -0,0 +1,312 @@
+"""
+Typed result models for the server's tools.
+
+Each tool that returns a dictionary declares one of these TypedDicts (or
+a union with ErrorResult) as its return type. They are plain dicts at
+runtime, so building and returning results costs nothing extra, and
+output_schema() turns the annotation into the JSON schema the tool
+advertises for MCP structured content.
+"""
+
+from typing import Any, get_args, get_origin
+
+from pydantic import TypeAdapter
+# pydantic only accepts typing_extensions.TypedDict before Python 3.12
+from typing_extensions import NotRequired, TypedDict
+
+
+class ErrorResult(TypedDict):
+    error: str
+    suggestion: NotRequired[str]
+    available_breeds: NotRequired[list[str]]
+    available_templates: NotRequired[list[str]]
+    available_placeholders: NotRequired[list[str]]
+
+
+class BreedCharacteristics(TypedDict):
+    proportions: dict[str, str]
+    coat: dict[str, str]
+    movement: dict[str, str]
+    temperament_aesthetic: dict[str, str]
+    color_palette: list[str]
+    scale: str
+
+
+class BreedDetails(BreedCharacteristics):
+    name: str
+    group: str
+    visual_essence: str
+    text: str
+
+
+class BreedGroupListing(TypedDict):
+    group: str
+    breeds: list[str]
+
+
+class BreedListing(TypedDict):
+    breed_count: int
+    groups: list[BreedGroupListing]
+    text: str
+
+
+class EnhancementResult(TypedDict):
+    breed_name: str
+    breed_group: str
+    base_prompt: str
+    emphasis_level: str
+    visual_essence: str
+    characteristics: BreedCharacteristics
+    synthesis_instruction: str
+
+
+class CompiledTag(TypedDict):
+    tag: str
+    weight: float
+
+
+class CompiledPrompt(TypedDict):
+    breed_name: str
+    output_format: str
+    emphasis_level: str
+    prompt: str
+    negative_prompt: str
+    tags: list[CompiledTag]
+
+
+class CompiledPromptBatch(TypedDict):
+    breed_name: str
+    output_format: str
+    emphasis_level: str
+    prompts: list[str]
+    negative_prompt: str
+    tags: list[CompiledTag]
+
+
+class FrameBlend(TypedDict):
+    start_weight: float
+    end_weight: float
+
+
+class InterpolatedFrame(TypedDict):
+    frame: int
+    blend: FrameBlend
+    visual_essence: str
+    characteristics: BreedCharacteristics
+    synthesis_instruction: str
+
+
+class InterpolationResult(TypedDict):
+    start_breed: str
+    end_breed: str
+    base_prompt: str
+    emphasis_level: str
+    frame_count: int
+    frames: list[InterpolatedFrame]
+    next_frame: int | None
+
+
+# Per category: field -> terms, except color_palette and scale, which are term lists
+CategoryTerms = dict[str, dict[str, list[str]] | list[str]]
+
+
+class ComparisonResult(TypedDict):
+    breeds: list[str]
+    shared: CategoryTerms
+    distinguishing: dict[str, CategoryTerms]
+    overlap: dict[str, float]
+
+
+class FeatureMatch(TypedDict):
+    key: str
+    name: str
+    group: str
+    scale: float | None
+    coat_length: float | None
+    energy: float | None
+
+
+class FeatureSearchResult(TypedDict):
+    count: int
+    breeds: list[FeatureMatch]
+
+
+class DiverseBreed(TypedDict):
+    key: str
+    name: str
+    group: str
+    distance: float | None
+
+
+class DiverseSelection(TypedDict):
+    count: int
+    candidates: int
+    min_distance: float | None
+    breeds: list[DiverseBreed]
+
+
+class SampledBreed(TypedDict):
+    key: str
+    name: str
+
+
+class BreedSample(TypedDict):
+    seed: int
+    replace: bool
+    breeds: list[SampledBreed]
+    probabilities: dict[str, float]
+    payloads: NotRequired[dict[str, EnhancementResult]]
+
+
+class BreedSummary(TypedDict):
+    key: str
+    name: str
+    group: str
+
+
+class BreedPage(TypedDict):
+    breeds: list[BreedSummary]
+    next_cursor: str | None
+    total: int
+
+
+class VariantSummary(TypedDict):
+    key: str
+    name: str
+    parent: str
+    overrides: list[str]
+
+
+class VariantList(TypedDict):
+    variants: list[VariantSummary]
+
+
+class CustomBreedStatus(TypedDict):
+    tenant_id: str
+    breed_key: str
+    name: NotRequired[str]
+    status: str
+
+
+class CustomBreedList(TypedDict):
+    tenant_id: str
+    breeds: list[BreedSummary]
+
+
+class TemplateRegistration(TypedDict):
+    name: str
+    placeholders: list[str]
+    status: str
+
+
+class TemplateInfo(TypedDict):
+    name: str
+    description: str
+    builtin: bool
+    placeholders: list[str]
+
+
+class TemplateList(TypedDict):
+    default: str
+    templates: list[TemplateInfo]
+    available_placeholders: list[str]
+
+
+class PromptScore(TypedDict):
+    score: float
+    flag: str
+    matched_terms: list[str]
+    mentions_dog: bool
+
+
+class ScoreSummary(TypedDict):
+    under: int
+    ok: int
+    over: int
+    mentions_dog: int
+    mean_score: float
+
+
+class ScoreResult(TypedDict):
+    breed_name: str
+    emphasis_level: str
+    expected_range: list[float]
+    scores: list[PromptScore]
+    summary: ScoreSummary
+
+
+class ToolProfileStats(TypedDict):
+    calls: int
+    sampled_calls: int
+    sampled_wall_ms: float
+    samples: int
+
+
+class ProfilingState(TypedDict):
+    enabled: bool
+    output_dir: NotRequired[str]
+    sample_rate: NotRequired[float]
+    tools: NotRequired[dict[str, ToolProfileStats]]
+
+
+class AdmissionLimits(TypedDict):
+    rate: float | None
+    burst: int | None
+    max_concurrent: int | None
+    max_queue: int
+    queue_timeout: float
+
+
+class AdmissionMetrics(TypedDict):
+    enabled: bool
+    admitted: NotRequired[int]
+    queued: NotRequired[int]
+    rejected_rate_limited: NotRequired[int]
+    rejected_queue_full: NotRequired[int]
+    rejected_queue_timeout: NotRequired[int]
+    active: NotRequired[int]
+    waiting: NotRequired[int]
+    tracked_clients: NotRequired[int]
+    max_queue_wait_ms: NotRequired[float]
+    avg_service_ms: NotRequired[float]
+    limits: NotRequired[AdmissionLimits]
+
+
+class BreedChanges(TypedDict):
+    version: str
+    full: bool
+    breeds: NotRequired[list[dict[str, Any]]]
+    added: NotRequired[list[dict[str, Any]]]
+    modified: NotRequired[list[dict[str, Any]]]
+    removed: NotRequired[list[str]]
+
+
+class CacheInfo(TypedDict):
+    entries: int
+    bytes: int
+    max_entries: int | None
+    max_bytes: int | None
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+
+
+class CacheStats(TypedDict):
+    max_bytes: int
+    total_bytes: int
+    caches: dict[str, CacheInfo]
+
+
+def output_schema(annotation: Any) -> dict:
+    """
+    JSON schema for a tool's structured content from its return annotation.
+
+    A union such as EnhancementResult | ErrorResult becomes an object
+    schema with one anyOf branch per model, so results are sent unwrapped
+    instead of under a "result" key.
+    """
+    schema = TypeAdapter(annotation).json_schema(mode="serialization")
+    if get_origin(annotation) is not None and len(get_args(annotation)) > 1:
+        schema = {"type": "object", **schema}
+    return schema
@@ -0,0 +1,109 @@
+"""
+Compact breed storage over a shared phrase dictionary.
+
+Attribute values repeat the same phrases across breeds ("moderate
+length", "smooth", "effortless"). PhraseStore splits every value into
+phrases once, gives each distinct phrase an integer ID, and keeps the
+whole catalog as one flat array of IDs plus per-breed offsets. Breeds
+are decoded back into regular database entries only when accessed, with
+a small LRU of recently decoded breeds for hot lookups.
+
+A PhraseStore is a read-only Mapping with the same keys and values as
+the database it was built from, so it can be passed to set_database().
+"""
+
+from array import array
+from collections.abc import Mapping
+
+from dog_breed_aesthetics_mcp.attributes import CATEGORY_FIELDS, split_terms
+from dog_breed_aesthetics_mcp.cache import Cache
+
+DEFAULT_DECODE_CACHE = 256
+
+_SEPARATOR = ", "
+
+
+def _phrases(value):
+    """Split a value into phrases, or keep it whole if splitting would not round-trip"""
+    terms = split_terms(value)
+    if _SEPARATOR.join(terms) == value:
+        return terms
+    return (value,)
+
+
+class PhraseStore(Mapping):
+    """Read-only breed database stored as phrase-ID arrays"""
+
+    def __init__(self, database, cache_size=DEFAULT_DECODE_CACHE):
+        self.phrases = []
+        self._ids = array("I")
+        self._offsets = array("I", [0])
+        self._row_of = {}
+        self._names = []
+        self.decoded = Cache("decoded_breeds", max_entries=cache_size)
+
+        phrase_ids = {}
+
+        def encode(phrases):
+            self._ids.append(len(phrases))
+            for phrase in phrases:
+                phrase_id = phrase_ids.get(phrase)
+                if phrase_id is None:
+                    phrase_id = phrase_ids[phrase] = len(self.phrases)
+                    self.phrases.append(phrase)
+                self._ids.append(phrase_id)
+
+        # Per breed: group, one phrase list per category field, palette,
+        # scale, visual essence; each list is prefixed with its length
+        for breed_key, breed_data in database.items():
+            self._row_of[breed_key] = len(self._names)
+            self._names.append(breed_data["name"])
+            encode((breed_data["group"],))
+            for category, fields in CATEGORY_FIELDS.items():
+                for field in fields:
+                    encode(_phrases(breed_data[category][field]))
+            encode(breed_data["color_palette"])
+            encode(_phrases(breed_data["scale"]))
+            encode(_phrases(breed_data["visual_essence"]))
+            self._offsets.append(len(self._ids))
+
+    def _decode(self, row):
+        ids = self._ids
+        phrases = self.phrases
+        position = self._offsets[row]
+
+        def take():
+            nonlocal position
+            count = ids[position]
+            values = [phrases[phrase_id] for phrase_id in ids[position + 1:position + 1 + count]]
+            position += count + 1
+            return values
+
+        breed_data = {"name": self._names[row], "group": take()[0]}
+        for category, fields in CATEGORY_FIELDS.items():
+            breed_data[category] = {field: _SEPARATOR.join(take()) for field in fields}
+        breed_data["color_palette"] = take()
+        breed_data["scale"] = _SEPARATOR.join(take())
+        breed_data["visual_essence"] = _SEPARATOR.join(take())
+        return breed_data
+
+    def __getitem__(self, breed_key):
+        breed_data = self.decoded.get(breed_key)
+        if breed_data is not None:
+            return breed_data
+        breed_data = self._decode(self._row_of[breed_key])
+        self.decoded.put(breed_key, breed_data)
+        return breed_data
+
+    def __iter__(self):
+        return iter(self._row_of)
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def encoded_bytes(self):
+        """Bytes used by the ID and offset arrays (excluding the phrase strings)"""
+        return (
+            self._ids.itemsize * len(self._ids)
+            + self._offsets.itemsize * len(self._offsets)
+        )
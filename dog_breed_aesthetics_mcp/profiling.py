@@ -0,0 +1,224 @@
+"""
+Opt-in sampling profiler for tool calls.
+
+When enabled, a middleware picks a random fraction of tool calls to
+profile. While a sampled call is in flight, a background thread reads
+every thread's stack at a fixed interval and keeps the stacks that run
+through the tool's function (tools execute in worker threads, which a
+cProfile started in the middleware would not see). Stacks are
+aggregated per tool and written to the output directory as:
+
+- <tool>.folded: collapsed stacks for that tool ("frame;frame;frame count"),
+  readable by flamegraph.pl, speedscope and inferno
+- all.folded: every tool's stacks under a root frame named after the tool
+- summary.json: calls, sampled calls, wall time and samples per tool
+
+Disabled profiling removes the middleware entirely, so it costs nothing.
+"""
+
+import atexit
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from fastmcp.server.middleware import Middleware
+
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_INTERVAL = 0.002
+FLUSH_INTERVAL = 5.0
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    # co_qualname is new in Python 3.11
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _folded_stack(frame):
+    """Return (set of code objects, root-to-leaf folded stack) for a frame"""
+    codes = set()
+    names = []
+    while frame is not None:
+        codes.add(frame.f_code)
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.reverse()
+    return codes, ";".join(names)
+
+
+def _write_atomic(path, text):
+    temporary = path + ".tmp"
+    with open(temporary, "w") as f:
+        f.write(text)
+    os.replace(temporary, path)
+
+
+class ToolProfiler:
+    """Samples stacks of in-flight tool calls and aggregates them per tool"""
+
+    def __init__(self, output_dir, sample_rate=DEFAULT_SAMPLE_RATE, interval=DEFAULT_INTERVAL, seed=None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._active = {}
+        self._next_token = 0
+        self._sampler = None
+        self._last_flush = time.monotonic()
+        self.stacks = {}
+        self.tool_stats = {}
+        os.makedirs(output_dir, exist_ok=True)
+
+    def should_sample(self):
+        return self.sample_rate > 0 and self._random.random() < self.sample_rate
+
+    def begin(self, tool_name, code):
+        """Start sampling stacks that run through `code`; returns a token for end()"""
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._active[token] = (tool_name, code)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_loop, name="tool-profiler", daemon=True)
+                self._sampler.start()
+        return token
+
+    def end(self, token):
+        with self._lock:
+            self._active.pop(token, None)
+
+    def record_call(self, tool_name, seconds, sampled):
+        """Count a finished call, and flush to disk if the last flush is old enough"""
+        with self._lock:
+            stats = self.tool_stats.setdefault(
+                tool_name, {"calls": 0, "sampled_calls": 0, "sampled_wall_ms": 0.0}
+            )
+            stats["calls"] += 1
+            if sampled:
+                stats["sampled_calls"] += 1
+                stats["sampled_wall_ms"] += seconds * 1000
+            due = sampled and time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+                targets = {}
+                for tool_name, code in self._active.values():
+                    targets.setdefault(code, tool_name)
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                codes, folded = _folded_stack(frame)
+                for code, tool_name in targets.items():
+                    if code in codes:
+                        with self._lock:
+                            self.stacks.setdefault(tool_name, Counter())[folded] += 1
+                        break
+
+    def stats(self):
+        with self._lock:
+            return {
+                tool_name: {**stats, "samples": sum(self.stacks.get(tool_name, Counter()).values())}
+                for tool_name, stats in self.tool_stats.items()
+            }
+
+    def flush(self):
+        """Write folded stacks and the summary to the output directory"""
+        with self._lock:
+            stacks = {tool_name: Counter(counts) for tool_name, counts in self.stacks.items()}
+            self._last_flush = time.monotonic()
+        combined = []
+        for tool_name, counts in sorted(stacks.items()):
+            lines = [f"{stack} {count}" for stack, count in counts.most_common()]
+            _write_atomic(os.path.join(self.output_dir, f"{tool_name}.folded"), "\n".join(lines) + "\n")
+            combined.extend(f"{tool_name};{line}" for line in lines)
+        _write_atomic(os.path.join(self.output_dir, "all.folded"), "\n".join(combined) + "\n")
+        _write_atomic(os.path.join(self.output_dir, "summary.json"), json.dumps(self.stats(), indent=2))
+
+
+class ProfilingMiddleware(Middleware):
+    """Profiles a sampled fraction of tool calls; `resolve_code` maps a tool name to its function's code"""
+
+    def __init__(self, profiler, resolve_code):
+        self.profiler = profiler
+        self.resolve_code = resolve_code
+
+    async def on_call_tool(self, context, call_next):
+        tool_name = context.message.name
+        code = self.resolve_code(tool_name) if self.profiler.should_sample() else None
+        token = self.profiler.begin(tool_name, code) if code is not None else None
+        start = time.perf_counter()
+        try:
+            return await call_next(context)
+        finally:
+            if token is not None:
+                self.profiler.end(token)
+            self.profiler.record_call(tool_name, time.perf_counter() - start, token is not None)
+
+
+_middleware = None
+_middleware_lock = threading.Lock()
+
+
+def get_profiler():
+    """Return the active profiler, or None when profiling is disabled"""
+    middleware = _middleware
+    return middleware.profiler if middleware is not None else None
+
+
+def enable_profiling(server, output_dir, resolve_code, sample_rate=DEFAULT_SAMPLE_RATE, interval=DEFAULT_INTERVAL):
+    """
+    Install the profiling middleware on a FastMCP server, replacing any
+    active profiler; the replaced profiler writes its final output first.
+    """
+    global _middleware
+    profiler = ToolProfiler(output_dir, sample_rate, interval)
+    with _middleware_lock:
+        previous = _middleware
+        if previous is not None:
+            _remove(server, previous)
+        _middleware = ProfilingMiddleware(profiler, resolve_code)
+        server.add_middleware(_middleware)
+    if previous is not None:
+        previous.profiler.flush()
+    return profiler
+
+
+def disable_profiling(server):
+    """Remove the profiling middleware and write its final output; returns the profiler or None"""
+    global _middleware
+    with _middleware_lock:
+        middleware, _middleware = _middleware, None
+        if middleware is None:
+            return None
+        _remove(server, middleware)
+    middleware.profiler.flush()
+    return middleware.profiler
+
+
+def _remove(server, middleware):
+    if middleware in server.middleware:
+        server.middleware.remove(middleware)
+
+
+@atexit.register
+def _flush_at_exit():
+    profiler = get_profiler()
+    if profiler is not None:
+        profiler.flush()
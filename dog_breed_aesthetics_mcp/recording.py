@@ -0,0 +1,126 @@
+"""
+Recording of tool calls for later replay.
+
+RecordingMiddleware appends one compact JSON line per tool call to a
+file: wall-clock start time, tool name, arguments, duration and whether
+the call raised. The file is only ever appended to, so it can be rotated
+or copied while the server runs; see dog_breed_aesthetics_mcp.replay to
+drive a server with it.
+
+Tool calls only encode and queue their record; a writer thread appends
+queued lines and flushes whenever the queue runs dry, so file I/O never
+blocks the event loop. Recorders still open at exit are closed, which
+writes out anything queued.
+"""
+
+import atexit
+import json
+import queue
+import threading
+import time
+
+from fastmcp.server.middleware import Middleware
+
+_SEPARATORS = (",", ":")
+
+# Recorders to close at exit, so queued records are not lost
+_open_recorders = set()
+
+
+class CallRecorder:
+    """Appends tool call records to a JSON-lines file from a writer thread"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lines = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.recorded = 0
+        self._writer = threading.Thread(target=self._write, name="call-recorder", daemon=True)
+        self._writer.start()
+        _open_recorders.add(self)
+
+    def record(self, tool_name, arguments, started, seconds, ok):
+        if self._closed:
+            return
+        line = json.dumps(
+            {
+                "ts": round(started, 6),
+                "tool": tool_name,
+                "args": arguments,
+                "ms": round(seconds * 1000, 3),
+                "ok": ok,
+            },
+            separators=_SEPARATORS,
+            default=str,
+        )
+        self._lines.put(line + "\n")
+
+    def _write(self):
+        while True:
+            line = self._lines.get()
+            if line is None:
+                break
+            self._file.write(line)
+            self.recorded += 1
+            if self._lines.empty():
+                self._file.flush()
+        self._file.close()
+
+    def close(self):
+        """Write out queued records and close the file; records made after this are dropped"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._lines.put(None)
+        self._writer.join()
+        _open_recorders.discard(self)
+
+
+class RecordingMiddleware(Middleware):
+    """Records every tool call the server handles"""
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+
+    async def on_call_tool(self, context, call_next):
+        started = time.time()
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = await call_next(context)
+            ok = True
+            return result
+        finally:
+            self.recorder.record(
+                context.message.name,
+                context.message.arguments or {},
+                started,
+                time.perf_counter() - start,
+                ok,
+            )
+
+
+@atexit.register
+def _close_at_exit():
+    for recorder in list(_open_recorders):
+        recorder.close()
+
+
+def iter_recording(path):
+    """Yield call records in file order without loading the whole file; skips unreadable lines"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def load_recording(path):
+    """Read call records from a recording, oldest first; skips a truncated last line"""
+    records = list(iter_recording(path))
+    records.sort(key=lambda record: record["ts"])
+    return records
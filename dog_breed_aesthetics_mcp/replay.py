@@ -0,0 +1,162 @@
+"""
+Replay recorded tool calls against a server and report latency.
+
+Reads a recording made by RecordingMiddleware (DOG_BREED_RECORD) and
+sends the same calls, in the same order and with the same relative
+timing, to an in-process server or an HTTP endpoint. --speed scales the
+original gaps between calls (2 = twice as fast) and --speed 0 sends calls
+as fast as the workers allow. --concurrency sets the number of client
+connections issuing calls in parallel.
+
+Latency is measured from when a call was due, so a server that falls
+behind the recorded pace shows it in the percentiles instead of silently
+slowing the replay down. At --speed 0 there is no schedule, and latency
+is measured from when a worker sends the call.
+
+Usage:
+    python -m dog_breed_aesthetics_mcp.replay calls.jsonl
+    python -m dog_breed_aesthetics_mcp.replay calls.jsonl --speed 0 --concurrency 16
+    python -m dog_breed_aesthetics_mcp.replay calls.jsonl --url http://localhost:8000/mcp
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from contextlib import AsyncExitStack
+
+from fastmcp import Client
+
+from dog_breed_aesthetics_mcp.recording import load_recording
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def _latency_summary(latencies):
+    latencies = sorted(latencies)
+    return {
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+async def replay(records, target, speed=1.0, concurrency=1):
+    """
+    Send recorded calls to target (a FastMCP server or an MCP URL).
+
+    Returns a report with request and error counts, elapsed time,
+    throughput and latency percentiles overall and per tool.
+    """
+    if speed < 0:
+        raise ValueError("speed must be 0 (as fast as possible) or positive")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    queue = asyncio.Queue()
+    results = []
+    first_ts = records[0]["ts"] if records else 0.0
+
+    async def worker(client):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            due, record = item
+            if due is None:
+                due = time.perf_counter()
+            try:
+                result = await client.call_tool_mcp(record["tool"], record.get("args") or {})
+                ok = not result.is_error
+            except Exception:
+                ok = False
+            results.append((record["tool"], time.perf_counter() - due, ok))
+
+    async with AsyncExitStack() as stack:
+        # Connect every client before the clock starts
+        clients = [await stack.enter_async_context(Client(target)) for _ in range(concurrency)]
+        workers = [asyncio.create_task(worker(client)) for client in clients]
+        start = time.perf_counter()
+        for record in records:
+            due = None
+            if speed:
+                due = start + (record["ts"] - first_ts) / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            queue.put_nowait((due, record))
+        for _ in workers:
+            queue.put_nowait(None)
+        await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - start
+
+    by_tool = {}
+    for tool_name, latency, ok in results:
+        entry = by_tool.setdefault(tool_name, {"latencies": [], "errors": 0})
+        entry["latencies"].append(latency)
+        entry["errors"] += not ok
+
+    return {
+        "requests": len(results),
+        "errors": sum(entry["errors"] for entry in by_tool.values()),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 1) if elapsed else 0.0,
+        **_latency_summary([latency for _, latency, _ in results]),
+        "tools": {
+            tool_name: {
+                "requests": len(entry["latencies"]),
+                "errors": entry["errors"],
+                **_latency_summary(entry["latencies"]),
+            }
+            for tool_name, entry in sorted(by_tool.items())
+        },
+    }
+
+
+def format_report(report):
+    """Render a replay report as a text table"""
+    columns = ("requests", "errors", "p50_ms", "p90_ms", "p99_ms", "max_ms")
+    lines = [
+        f"{report['requests']} requests in {report['elapsed_s']} s "
+        f"({report['throughput_rps']} req/s), {report['errors']} errors",
+        "",
+        f"{'tool':>28}  " + "  ".join(f"{column:>10}" for column in columns),
+    ]
+    rows = list(report["tools"].items()) + [("all", report)]
+    for tool_name, entry in rows:
+        lines.append(f"{tool_name:>28}  " + "  ".join(f"{entry[column]:>10}" for column in columns))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("recording", help="JSON-lines file written by DOG_BREED_RECORD")
+    parser.add_argument("--url", help="MCP endpoint to replay against (default: in-process server)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="replay speed multiplier; 0 sends calls as fast as possible")
+    parser.add_argument("--concurrency", type=int, default=1, help="parallel client connections")
+    parser.add_argument("--limit", type=int, help="only replay the first N calls")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    records = load_recording(args.recording)[:args.limit]
+    if args.url:
+        target = args.url
+    else:
+        from dog_breed_aesthetics_mcp.server import mcp as target
+
+    report = asyncio.run(replay(records, target, speed=args.speed, concurrency=args.concurrency))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Seeded weighted breed sampling.
+
+Breeds are weighted by criteria (per-group weights, per-scale weights and
+popularity) and drawn from an alias table (Vose's method): building the
+table is O(n), after which each draw is one random number, one array
+lookup and one comparison, whatever the catalog size. Tables are cached
+per set of criteria, so repeated draws skip the build.
+
+Draws come from random.Random(seed), so the same seed, criteria and
+catalog always produce the same breeds. Sampling without replacement
+redraws breeds already taken, which keeps every draw proportional to the
+weights of the breeds left; once the taken breeds hold half the table's
+weight the table is rebuilt over the rest, so redraws stay rare.
+
+Popularity is how often each breed was requested in a call recording
+(see dog_breed_aesthetics_mcp.recording), re-read at most once a minute.
+"""
+
+import math
+import os
+import random
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+
+from dog_breed_aesthetics_mcp.breed_data import get_database
+from dog_breed_aesthetics_mcp.cache import managed_cache
+from dog_breed_aesthetics_mcp.catalog import get_catalog_index
+from dog_breed_aesthetics_mcp.features import SCALE_LEVELS, get_feature_table
+from dog_breed_aesthetics_mcp.recording import iter_recording
+from dog_breed_aesthetics_mcp.warmup import count_requested_breeds
+
+MAX_SAMPLE_DRAWS = 10000
+DEFAULT_SAMPLER_CACHE = 64
+POPULARITY_REFRESH = 60.0
+
+
+class AliasTable:
+    """Alias table over positive weights; draw() returns an index in O(1)"""
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = math.fsum(weights)
+        if not count or total <= 0:
+            raise ValueError("No positive weights to sample from")
+        scaled = [weight * count / total for weight in weights]
+        self.probability = array("d", [1.0]) * count
+        self.alias = array("l", range(count))
+
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] = (scaled[high] + scaled[low]) - 1.0
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Whatever is left is 1.0 up to rounding and keeps probability 1
+
+    def __len__(self):
+        return len(self.probability)
+
+    def draw(self, rng):
+        """Return one index, drawn in proportion to its weight"""
+        position = rng.random() * len(self.probability)
+        index = int(position)
+        return index if position - index < self.probability[index] else self.alias[index]
+
+
+class WeightedSampler:
+    """Breed keys and names with positive weights, and an alias table over them"""
+
+    def __init__(self, keys, names, weights):
+        self.keys = [key for key, weight in zip(keys, weights) if weight > 0]
+        self.names = [name for name, weight in zip(names, weights) if weight > 0]
+        self.weights = array("d", [weight for weight in weights if weight > 0])
+        self.total = math.fsum(self.weights)
+        self.table = AliasTable(self.weights)
+
+    @property
+    def nbytes(self):
+        return (
+            sys.getsizeof(self.keys) + sys.getsizeof(self.names) + self.weights.itemsize * len(self.weights)
+            + self.table.probability.itemsize * len(self.table) + self.table.alias.itemsize * len(self.table)
+        )
+
+    def probability(self, row):
+        """Chance that a single draw picks `row`"""
+        return self.weights[row] / self.total
+
+    def sample(self, count, seed, replace=True):
+        """
+        Return `count` rows drawn with random.Random(seed).
+
+        Without replacement, each row is drawn at most once; raises
+        ValueError if fewer than `count` rows have positive weight.
+        """
+        rng = random.Random(seed)
+        table = self.table
+        if replace:
+            return [table.draw(rng) for _ in range(count)]
+        if count > len(self.keys):
+            raise ValueError(f"Cannot draw {count} distinct breeds; only {len(self.keys)} have a positive weight")
+
+        rows = None
+        table_total = self.total
+        taken_weight = 0.0
+        taken = set()
+        picks = []
+        while len(picks) < count:
+            index = table.draw(rng)
+            row = index if rows is None else rows[index]
+            if row in taken:
+                continue
+            taken.add(row)
+            picks.append(row)
+            taken_weight += self.weights[row]
+            if taken_weight * 2 >= table_total and len(picks) < count:
+                rows = [row for row in range(len(self.keys)) if row not in taken]
+                weights = [self.weights[row] for row in rows]
+                table = AliasTable(weights)
+                table_total = math.fsum(weights)
+                taken_weight = 0.0
+        return picks
+
+
+_SCALE_BY_VALUE = sorted(SCALE_LEVELS.items(), key=lambda item: item[1])
+
+
+def _nearest_scale(value):
+    """Name of the scale level nearest a parsed scale value (the smaller one on ties)"""
+    return min(_SCALE_BY_VALUE, key=lambda item: abs(item[1] - value))[0]
+
+
+def _validate_weights(kind, weights, allowed):
+    """Return weights keyed by lowercased name; `allowed` maps lowercased names to display names"""
+    resolved = {}
+    for name, weight in (weights or {}).items():
+        key = str(name).strip().lower()
+        if key not in allowed:
+            raise ValueError(f"Unknown {kind} '{name}'. Expected one of: " + ", ".join(allowed.values()))
+        if not isinstance(weight, (int, float)) or not weight >= 0 or math.isinf(weight):
+            raise ValueError(f"Weight for {kind} '{name}' must be a finite number >= 0")
+        resolved[key] = float(weight)
+    return resolved
+
+
+def breed_weights(group_weights=None, scale_weights=None, popularity=0.0, request_counts=None):
+    """
+    Return (breed keys, names, weights) for the active database, in catalog order.
+
+    A breed's weight is its group's weight times its scale's weight (each
+    1.0 unless given; scales are matched to the nearest level) times
+    (1 + times requested) ** popularity. Raises ValueError for unknown
+    groups or scale levels and for negative weights.
+    """
+    order = get_catalog_index().order
+    groups = {entry[1].lower(): entry[1] for entry in order}
+    group_weights = _validate_weights("group", group_weights, groups)
+    scale_weights = _validate_weights("scale level", scale_weights, {level: level for level in SCALE_LEVELS})
+    if not isinstance(popularity, (int, float)) or not 0 <= popularity <= 4:
+        raise ValueError("popularity must be between 0 and 4")
+
+    table = get_feature_table()
+    scales = table.columns["scale"]
+    table_rows = {key: row for row, key in enumerate(table.keys)}
+    keys = []
+    names = []
+    weights = []
+    for _, group, _, breed_key in order:
+        row = table_rows[breed_key]
+        weight = group_weights.get(group.lower(), 1.0)
+        if scale_weights and weight:
+            scale = scales[row]
+            if not math.isnan(scale):
+                weight *= scale_weights.get(_nearest_scale(scale), 1.0)
+        if popularity and request_counts and weight:
+            weight *= (1 + request_counts.get(breed_key, 0)) ** popularity
+        keys.append(breed_key)
+        names.append(table.names[row])
+        weights.append(weight)
+    return keys, names, weights
+
+
+# (criteria) -> (database, stats stamp, sampler); a swapped database or a
+# changed recording rebuilds the sampler rather than serving it stale
+_samplers = managed_cache("sampler_tables", max_entries=DEFAULT_SAMPLER_CACHE, sizeof=lambda entry: entry[2].nbytes)
+
+_counts_lock = threading.Lock()
+# (file stamp, time read, counts) for the last recording read
+_request_counts = (None, 0.0, Counter())
+
+
+def _stats_stamp(stats_path):
+    try:
+        stat = os.stat(stats_path)
+    except (OSError, TypeError):
+        return None
+    return (stats_path, stat.st_mtime_ns, stat.st_size)
+
+
+def request_counts(stats_path):
+    """
+    Return (stamp, breed request counts) from the recording at stats_path.
+
+    The recording is re-read when it has changed, but at most once per
+    POPULARITY_REFRESH seconds, since a server that is recording changes
+    it on every call. The stamp changes only when the counts do.
+    """
+    global _request_counts
+    with _counts_lock:
+        stamp, read_at, counts = _request_counts
+        if stamp is not None and stamp[0] == stats_path and time.monotonic() - read_at < POPULARITY_REFRESH:
+            return stamp, counts
+        current = _stats_stamp(stats_path)
+        if current is None:
+            return None, Counter()
+        if current != stamp:
+            _request_counts = (current, time.monotonic(), count_requested_breeds(iter_recording(stats_path)))
+        else:
+            _request_counts = (stamp, time.monotonic(), counts)
+        return _request_counts[0], _request_counts[2]
+
+
+def get_sampler(group_weights=None, scale_weights=None, popularity=0.0, stats_path=None):
+    """Return a cached sampler for the criteria, building its alias table if needed"""
+    stamp, counts = request_counts(stats_path) if popularity else (None, None)
+    cache_key = (
+        tuple(sorted((str(k).strip().lower(), v) for k, v in (group_weights or {}).items())),
+        tuple(sorted((str(k).strip().lower(), v) for k, v in (scale_weights or {}).items())),
+        popularity,
+    )
+    database = get_database()
+    entry = _samplers.get(cache_key, valid=lambda entry: entry[0] is database and entry[1] == stamp)
+    if entry is not None:
+        return entry[2]
+
+    sampler = WeightedSampler(*breed_weights(group_weights, scale_weights, popularity, counts))
+    _samplers.put(cache_key, (database, stamp, sampler))
+    return sampler
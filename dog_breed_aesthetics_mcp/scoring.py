@@ -0,0 +1,127 @@
+"""
+Scoring enhanced prompts against a breed's aesthetic vocabulary.
+
+A breed's attribute terms are broken into content words and weighted by
+TF-IDF across the active database, so words every breed shares
+("moderate", "medium") count for little and distinctive ones
+("aerodynamic", "brindle") count for a lot. A prompt's score is the share
+of the breed's total weight whose words appear in it, which makes scores
+comparable between breeds and cheap to compute: each prompt is one regex
+pass plus dictionary lookups.
+
+Scores are checked against an expected range for the requested emphasis
+level to flag under- and over-emphasized prompts.
+"""
+
+import math
+import re
+
+from dog_breed_aesthetics_mcp.attributes import breed_terms
+from dog_breed_aesthetics_mcp.breed_data import DerivedIndex
+
+MAX_SCORE_PROMPTS = 10000
+
+# Expected score range per emphasis level, as (minimum, maximum)
+EMPHASIS_RANGES = {
+    "subtle": (0.01, 0.12),
+    "moderate": (0.05, 0.25),
+    "strong": (0.15, 1.0),
+}
+
+# Words that put a literal dog into the image, which the synthesis
+# instructions ask to avoid
+LITERAL_DOG_WORDS = frozenset({"dog", "dogs", "puppy", "puppies", "canine", "hound", "hounds"})
+
+STOP_WORDS = frozenset({
+    "and", "any", "but", "for", "from", "into", "like", "more", "most",
+    "not", "often", "the", "than", "that", "this", "very", "when", "with",
+})
+
+_WORD = re.compile(r"[a-z]+")
+
+
+def content_words(text):
+    """Lower-cased words of three or more letters, excluding stop words"""
+    return [word for word in _WORD.findall(text.lower()) if len(word) > 2 and word not in STOP_WORDS]
+
+
+def breed_word_counts(breed_data):
+    """Return {word: count} over all of a breed's attribute terms"""
+    counts = {}
+    for terms in breed_terms(breed_data).values():
+        for term in terms:
+            for word in content_words(term):
+                counts[word] = counts.get(word, 0) + 1
+    return counts
+
+
+class WordStatistics:
+    """Document frequency of attribute words across a breed database"""
+
+    def __init__(self, database):
+        self.breed_count = 0
+        self.document_frequency = {}
+        for breed_data in database.values():
+            self.breed_count += 1
+            for word in breed_word_counts(breed_data):
+                self.document_frequency[word] = self.document_frequency.get(word, 0) + 1
+
+    @classmethod
+    def from_counts(cls, breed_count, document_frequency):
+        """Create statistics from a prebuilt breed count and word -> document frequency dict"""
+        statistics = cls.__new__(cls)
+        statistics.breed_count = breed_count
+        statistics.document_frequency = document_frequency
+        return statistics
+
+    def idf(self, word):
+        """Smoothed inverse document frequency; unseen words get the maximum"""
+        return math.log((1 + self.breed_count) / (1 + self.document_frequency.get(word, 0))) + 1
+
+    def breed_vector(self, breed_data):
+        """Return {word: tf-idf weight} for a breed"""
+        return {word: count * self.idf(word) for word, count in breed_word_counts(breed_data).items()}
+
+
+_word_statistics = DerivedIndex(WordStatistics)
+
+
+def get_word_statistics():
+    """Return word statistics for the active breed database, building them on first use"""
+    return _word_statistics.get()
+
+
+def score_prompts(breed_data, prompts, emphasis_level="moderate", statistics=None):
+    """
+    Score prompts against one breed.
+
+    Returns one result per prompt with its score (0-1), the matched breed
+    words (highest weight first), whether it names a literal dog, and a
+    flag: "under", "over" or "ok" for the emphasis level's range.
+    """
+    if statistics is None:
+        statistics = get_word_statistics()
+    vector = statistics.breed_vector(breed_data)
+    total = sum(vector.values())
+    low, high = EMPHASIS_RANGES[emphasis_level]
+    name_words = frozenset(content_words(breed_data["name"]))
+
+    results = []
+    for prompt in prompts:
+        words = set(content_words(prompt))
+        matched = [word for word in words if word in vector]
+        score = sum(vector[word] for word in matched) / total if total else 0.0
+        if score < low:
+            flag = "under"
+        elif score > high:
+            flag = "over"
+        else:
+            flag = "ok"
+        matched.sort(key=lambda word: (-vector[word], word))
+        results.append({
+            "score": round(score, 4),
+            "flag": flag,
+            "matched_terms": matched,
+            "mentions_dog": bool(words & LITERAL_DOG_WORDS) or bool(name_words and name_words <= words),
+        })
+    return results
@@ -5,75 +5,301 @@ Translates dog breed characteristics into visual aesthetic parameters
 for AI image generation prompts.
 """
 
+import inspect
+import logging
+import os
+import random
 from fastmcp import FastMCP
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse
 from typing import Literal
 
 # Use absolute imports for FastMCP Cloud compatibility
 from dog_breed_aesthetics_mcp.breed_data import (
-    BREED_DATABASE, 
+    GROUP_ORDER,
+    VARIANT_DATABASE,
+    get_database,
     get_breed_names, 
     get_breed_data, 
-    normalize_breed_name
+    get_variant_keys,
+    normalize_breed_name,
+    set_database
 )
+from dog_breed_aesthetics_mcp.interpolation import MAX_INTERPOLATION_FRAMES, iter_interpolated_frames
+from dog_breed_aesthetics_mcp.comparison import MAX_COMPARE_BREEDS, compare_breed_keys
+from dog_breed_aesthetics_mcp.features import get_feature_table, resolve_bound
+from dog_breed_aesthetics_mcp.diversity import MAX_DIVERSE_BREEDS, get_diversity_index
+from dog_breed_aesthetics_mcp.sampling import MAX_SAMPLE_DRAWS, get_sampler
+from dog_breed_aesthetics_mcp.catalog import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    get_catalog_index
+)
+from dog_breed_aesthetics_mcp.synthetic import generate_breed_database
+from dog_breed_aesthetics_mcp.phrase_store import PhraseStore
+from dog_breed_aesthetics_mcp.tenants import get_tenant_store
+from dog_breed_aesthetics_mcp.templates import (
+    DEFAULT_TEMPLATE,
+    PLACEHOLDERS,
+    get_template,
+    get_template_names,
+    register_template,
+    render_instruction
+)
+from dog_breed_aesthetics_mcp.scoring import EMPHASIS_RANGES, MAX_SCORE_PROMPTS, score_prompts
+from dog_breed_aesthetics_mcp.compilers import (
+    COMPILERS,
+    DEFAULT_FORMAT,
+    MAX_COMPILE_PROMPTS,
+    compile_breed,
+    join_prompt
+)
+from dog_breed_aesthetics_mcp.profiling import (
+    DEFAULT_INTERVAL,
+    DEFAULT_SAMPLE_RATE,
+    disable_profiling,
+    enable_profiling
+)
+from dog_breed_aesthetics_mcp.admission import (
+    DEFAULT_QUEUE_TIMEOUT,
+    AdmissionController,
+    AdmissionMiddleware
+)
+from dog_breed_aesthetics_mcp.compression import (
+    DEFAULT_GZIP_LEVEL,
+    DEFAULT_MINIMUM_SIZE,
+    DEFAULT_ZSTD_LEVEL,
+    CompressionMiddleware
+)
+from dog_breed_aesthetics_mcp.encoding import json_tool
+from dog_breed_aesthetics_mcp.cache import get_cache_manager
+from dog_breed_aesthetics_mcp.changelog import get_change_log
+from dog_breed_aesthetics_mcp.models import (
+    AdmissionMetrics,
+    BreedChanges,
+    BreedDetails,
+    BreedListing,
+    BreedPage,
+    BreedSample,
+    CacheStats,
+    ComparisonResult,
+    CompiledPrompt,
+    CompiledPromptBatch,
+    CustomBreedList,
+    CustomBreedStatus,
+    DiverseSelection,
+    EnhancementResult,
+    ErrorResult,
+    FeatureSearchResult,
+    InterpolationResult,
+    ProfilingState,
+    ScoreResult,
+    TemplateList,
+    TemplateRegistration,
+    VariantList
+)
+from dog_breed_aesthetics_mcp.recording import CallRecorder, RecordingMiddleware
+from dog_breed_aesthetics_mcp.tracing import configure_tracing, span, traced
+from dog_breed_aesthetics_mcp.snapshot import SnapshotError, describe_source, install_snapshot
+from dog_breed_aesthetics_mcp.warmup import DEFAULT_WARM_BREEDS, Warmup
+
+logger = logging.getLogger(__name__)
 
 # Initialize FastMCP server
 mcp = FastMCP("dog-breed-aesthetics")
 
-@mcp.tool()
-def list_available_breeds() -> str:
+
+def _configure_caches():
+    """DOG_BREED_CACHE_BYTES sets the byte budget shared by all caches"""
+    max_bytes = os.environ.get("DOG_BREED_CACHE_BYTES")
+    if max_bytes:
+        get_cache_manager().resize(int(max_bytes))
+
+
+_configure_caches()
+
+
+def _configure_database():
     """
-    List all available dog breeds that can be used for aesthetic enhancement.
+    Choose the breed database and indexes to serve.
     
-    Returns a formatted list of 21 breeds organized by AKC group:
-    - Sporting: Golden Retriever, Pointer, Cocker Spaniel
-    - Hound: Greyhound, Basset Hound, Afghan Hound
-    - Working: Siberian Husky, Great Dane, Boxer
-    - Terrier: Jack Russell Terrier, Scottish Terrier, Bull Terrier
-    - Toy: Pomeranian, Italian Greyhound, Pug
-    - Non-Sporting: Poodle, Bulldog, Dalmatian
-    - Herding: Border Collie, German Shepherd, Corgi
+    DOG_BREED_SYNTHETIC_SIZE swaps in a synthetic catalog (benchmarking).
+    DOG_BREED_SNAPSHOT points at a precompiled index snapshot; if it is
+    missing, stale or from another build the indexes are rebuilt instead.
     """
-    breeds_by_group = {}
-    for breed_key, breed_data in BREED_DATABASE.items():
-        group = breed_data["group"]
-        if group not in breeds_by_group:
-            breeds_by_group[group] = []
-        breeds_by_group[group].append(breed_data["name"])
-    
-    output = ["Available Dog Breeds for Aesthetic Enhancement:\n"]
+    size = os.environ.get("DOG_BREED_SYNTHETIC_SIZE")
+    seed = int(os.environ.get("DOG_BREED_SYNTHETIC_SEED", "0"))
+    snapshot_path = os.environ.get("DOG_BREED_SNAPSHOT")
     
-    group_order = ["Sporting", "Hound", "Working", "Terrier", "Toy", "Non-Sporting", "Herding"]
-    
-    for group in group_order:
-        if group in breeds_by_group:
-            output.append(f"\n{group} Group:")
-            for breed in sorted(breeds_by_group[group]):
-                output.append(f"  • {breed}")
-    
-    output.append("\n\nUsage: Call enhance_with_breed_aesthetic() with a breed name and your base prompt.")
+    if snapshot_path:
+        try:
+            install_snapshot(snapshot_path, expected_source=describe_source(size, seed))
+            return
+        except (OSError, SnapshotError) as e:
+            logger.warning("Ignoring snapshot %s (%s); rebuilding indexes", snapshot_path, e)
     
-    return "\n".join(output)
+    if size:
+        # Large catalogs are held in phrase-dictionary form to avoid duplicated text
+        set_database(PhraseStore(generate_breed_database(int(size), seed=seed)))
+
+
+_configure_database()
 
 
-@mcp.tool()
-def get_breed_characteristics(breed_name: str) -> str:
+def _tool_code(tool_name):
+    """Code object of a tool's function, used to pick its frames out of sampled stacks"""
+    tool = globals().get(tool_name)
+    return getattr(inspect.unwrap(tool), "__code__", None) if tool is not None else None
+
+
+def _profile_dir(output_dir=None):
     """
-    Get detailed visual characteristics for a specific dog breed.
-    
-    Returns the breed's physical proportions, coat qualities, movement characteristics,
-    temperament aesthetics, color palette, and visual essence - all the data that will
-    be used to enhance prompts.
+    Resolve a profile output directory inside the configured base
+    (DOG_BREED_PROFILE_DIR, default "profiles"); raises ValueError for a
+    path that leaves it.
+    """
+    base = os.path.realpath(os.environ.get("DOG_BREED_PROFILE_DIR") or "profiles")
+    if not output_dir:
+        return base
+    path = os.path.realpath(os.path.join(base, output_dir))
+    if os.path.commonpath([base, path]) != base:
+        raise ValueError(f"output_dir must be inside the profile directory {base}")
+    return path
+
+
+def _enable_profiling(output_dir, sample_rate):
+    interval = float(os.environ.get("DOG_BREED_PROFILE_INTERVAL_MS", DEFAULT_INTERVAL * 1000)) / 1000
+    return enable_profiling(mcp, output_dir, _tool_code, sample_rate, interval)
+
+
+def _configure_profiling():
+    """
+    Start the sampling profiler if DOG_BREED_PROFILE_DIR is set.
     
-    Args:
-        breed_name: Name of the breed (e.g., "Golden Retriever", "Greyhound")
+    DOG_BREED_PROFILE_RATE is the fraction of calls sampled and
+    DOG_BREED_PROFILE_INTERVAL_MS the stack sampling interval.
     """
-    breed_key = normalize_breed_name(breed_name)
-    breed_data = get_breed_data(breed_key)
+    output_dir = os.environ.get("DOG_BREED_PROFILE_DIR")
+    if output_dir:
+        _enable_profiling(output_dir, float(os.environ.get("DOG_BREED_PROFILE_RATE", DEFAULT_SAMPLE_RATE)))
+
+
+_configure_profiling()
+# DOG_BREED_TRACE: "otel", "console" or a JSON-lines file path
+configure_tracing(os.environ.get("DOG_BREED_TRACE"), mcp)
+
+
+def _configure_recording():
+    """Append every tool call to DOG_BREED_RECORD (JSON lines) for later replay"""
+    path = os.environ.get("DOG_BREED_RECORD")
+    if path:
+        mcp.add_middleware(RecordingMiddleware(CallRecorder(path)))
+
+
+_configure_recording()
+
+
+def _configure_admission():
+    """
+    Install admission control if DOG_BREED_RATE_LIMIT or DOG_BREED_MAX_CONCURRENT is set.
     
-    if not breed_data:
-        available = get_breed_names()
-        return f"Breed '{breed_name}' not found. Available breeds:\n" + "\n".join(f"  • {b}" for b in available)
+    DOG_BREED_RATE_LIMIT is calls per second per client (DOG_BREED_RATE_BURST
+    the bucket size); DOG_BREED_MAX_CONCURRENT caps calls in flight, with up to
+    DOG_BREED_MAX_QUEUE more waiting for DOG_BREED_QUEUE_TIMEOUT seconds.
+    DOG_BREED_TRUSTED_PROXIES lists the proxy addresses (comma-separated)
+    whose X-Forwarded-For header identifies the client.
+    """
+    rate = os.environ.get("DOG_BREED_RATE_LIMIT")
+    burst = os.environ.get("DOG_BREED_RATE_BURST")
+    max_concurrent = os.environ.get("DOG_BREED_MAX_CONCURRENT")
+    if not rate and not max_concurrent:
+        return None
+    controller = AdmissionController(
+        rate=float(rate) if rate else None,
+        burst=int(burst) if burst else None,
+        max_concurrent=int(max_concurrent) if max_concurrent else None,
+        max_queue=int(os.environ.get("DOG_BREED_MAX_QUEUE", "0")),
+        queue_timeout=float(os.environ.get("DOG_BREED_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT))
+    )
+    trusted_proxies = os.environ.get("DOG_BREED_TRUSTED_PROXIES", "")
+    mcp.add_middleware(AdmissionMiddleware(
+        controller,
+        exempt_tools={"get_admission_metrics"},
+        trusted_proxies={address.strip() for address in trusted_proxies.split(",") if address.strip()}
+    ))
+    return controller
+
+
+_admission = _configure_admission()
+
+
+def _configure_warmup():
+    """
+    Set up the startup warmup run by main(), http_app() and get_server().
     
+    DOG_BREED_WARMUP=off skips it. DOG_BREED_WARMUP_BREEDS is how many of
+    the most-requested breeds to prerender, ranked from the call recording
+    at DOG_BREED_WARMUP_STATS (default: DOG_BREED_RECORD, if set).
+    """
+    return Warmup(
+        breed_count=int(os.environ.get("DOG_BREED_WARMUP_BREEDS", DEFAULT_WARM_BREEDS)),
+        stats_path=os.environ.get("DOG_BREED_WARMUP_STATS") or os.environ.get("DOG_BREED_RECORD"),
+        enabled=os.environ.get("DOG_BREED_WARMUP", "").strip().lower() != "off"
+    )
+
+
+_warmup = _configure_warmup()
+
+
+@mcp.custom_route("/healthz", methods=["GET"])
+async def healthz(request):
+    """Liveness: the process is up and serving HTTP"""
+    return JSONResponse({"status": "ok"})
+
+
+@mcp.custom_route("/readyz", methods=["GET"])
+async def readyz(request):
+    """Readiness: 200 once warmup has finished, 503 until then (or if it failed)"""
+    status = _warmup.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+def _lookup_breed(breed_name, tenant_id=None):
+    """Resolve a breed name, checking the tenant's custom breeds first"""
+    with span("lookup", {"breed.name": breed_name}) as lookup:
+        breed_key = normalize_breed_name(breed_name)
+        if tenant_id:
+            breed_data = get_tenant_store().lookup(tenant_id, breed_key)
+            lookup.set_attribute("tenant.id", tenant_id)
+        else:
+            breed_data = get_breed_data(breed_key)
+        lookup.set_attribute("breed.key", breed_key)
+        lookup.set_attribute("lookup.hit", breed_data is not None)
+        return breed_data
+
+
+def _available_breeds(tenant_id=None):
+    """Breed names to suggest when a lookup fails"""
+    available = get_breed_names()
+    if tenant_id:
+        custom = get_tenant_store().registry(tenant_id).database.values()
+        available = sorted(set(available) | {breed_data["name"] for breed_data in custom})
+    return available
+
+
+def _format_listing(groups):
+    """The listing as text, one bullet per breed under each group heading"""
+    output = ["Available Dog Breeds for Aesthetic Enhancement:\n"]
+    for entry in groups:
+        output.append(f"\n{entry['group']} Group:")
+        for breed in entry["breeds"]:
+            output.append(f"  • {breed}")
+    output.append("\n\nUsage: Call enhance_with_breed_aesthetic() with a breed name and your base prompt.")
+    return "\n".join(output)
+
+
+def _format_characteristics(breed_data):
+    """A breed's characteristics as text, one section per category"""
     output = [
         f"=== {breed_data['name']} ===",
         f"Group: {breed_data['group']}",
@@ -82,36 +308,116 @@ def get_breed_characteristics(breed_name: str) -> str:
         "Visual Essence:",
         f"  {breed_data['visual_essence']}",
         "",
-        "Proportions:",
     ]
+    for title, category in (
+        ("Proportions", "proportions"),
+        ("Coat", "coat"),
+        ("Movement", "movement"),
+        ("Temperament Aesthetic", "temperament_aesthetic"),
+    ):
+        if category != "proportions":
+            output.append("")
+        output.append(f"{title}:")
+        for key, value in breed_data[category].items():
+            output.append(f"  • {key.replace('_', ' ').title()}: {value}")
+    output.append("\nColor Palette:")
+    output.append("  " + ", ".join(breed_data['color_palette']))
+    return "\n".join(output)
+
+
+@json_tool(mcp)
+@traced
+def list_available_breeds() -> BreedListing:
+    """
+    List all available dog breeds that can be used for aesthetic enhancement.
     
-    for key, value in breed_data['proportions'].items():
-        output.append(f"  • {key.replace('_', ' ').title()}: {value}")
+    Lists every breed organized by AKC group (Sporting, Hound, Working,
+    Terrier, Toy, Non-Sporting, Herding).
     
-    output.append("\nCoat:")
-    for key, value in breed_data['coat'].items():
-        output.append(f"  • {key.replace('_', ' ').title()}: {value}")
+    For large catalogs prefer list_breeds_page(), which returns one page
+    at a time and can filter by group.
     
-    output.append("\nMovement:")
-    for key, value in breed_data['movement'].items():
-        output.append(f"  • {key.replace('_', ' ').title()}: {value}")
+    Returns:
+        Dictionary containing:
+        - breed_count: Number of breeds
+        - groups: Each group in AKC order with its breed names, sorted
+        - text: The same listing as formatted text
+    """
+    breeds_by_group = {}
+    with span("lookup", {"breed.count": len(get_database())}):
+        for breed_key, breed_data in get_database().items():
+            group = breed_data["group"]
+            if group not in breeds_by_group:
+                breeds_by_group[group] = []
+            breeds_by_group[group].append(breed_data["name"])
     
-    output.append("\nTemperament Aesthetic:")
-    for key, value in breed_data['temperament_aesthetic'].items():
-        output.append(f"  • {key.replace('_', ' ').title()}: {value}")
+    with span("render"):
+        groups = [
+            {"group": group, "breeds": sorted(breeds_by_group[group])}
+            for group in GROUP_ORDER
+            if group in breeds_by_group
+        ]
+        return {
+            "breed_count": sum(len(entry["breeds"]) for entry in groups),
+            "groups": groups,
+            "text": _format_listing(groups)
+        }
+
+
+@json_tool(mcp)
+@traced
+def get_breed_characteristics(breed_name: str, tenant_id: str | None = None) -> BreedDetails | ErrorResult:
+    """
+    Get detailed visual characteristics for a specific dog breed.
     
-    output.append("\nColor Palette:")
-    output.append("  " + ", ".join(breed_data['color_palette']))
+    Returns the breed's physical proportions, coat qualities, movement characteristics,
+    temperament aesthetics, color palette, and visual essence - all the data that will
+    be used to enhance prompts.
     
-    return "\n".join(output)
+    Args:
+        breed_name: Name of the breed (e.g., "Golden Retriever", "Greyhound")
+        tenant_id: Also look in this tenant's custom breeds (checked first)
+    
+    Returns:
+        Dictionary containing:
+        - name, group, scale, visual_essence: The breed's identity and essence
+        - proportions, coat, movement, temperament_aesthetic: Attribute fields
+        - color_palette: The breed's colours
+        - text: The same characteristics as formatted text
+    """
+    breed_data = _lookup_breed(breed_name, tenant_id)
+    
+    if not breed_data:
+        return {
+            "error": f"Breed '{breed_name}' not found",
+            "available_breeds": _available_breeds(tenant_id),
+            "suggestion": "Use list_available_breeds() to see all options"
+        }
+    
+    with span("render", {"breed.name": breed_data["name"]}):
+        return {
+            "name": breed_data["name"],
+            "group": breed_data["group"],
+            "scale": breed_data["scale"],
+            "visual_essence": breed_data["visual_essence"],
+            "proportions": breed_data["proportions"],
+            "coat": breed_data["coat"],
+            "movement": breed_data["movement"],
+            "temperament_aesthetic": breed_data["temperament_aesthetic"],
+            "color_palette": breed_data["color_palette"],
+            "text": _format_characteristics(breed_data)
+        }
 
 
-@mcp.tool()
+@json_tool(mcp)
+@traced
 def enhance_with_breed_aesthetic(
     breed_name: str,
     base_prompt: str,
-    emphasis_level: Literal["subtle", "moderate", "strong"] = "moderate"
-) -> dict:
+    emphasis_level: Literal["subtle", "moderate", "strong"] = "moderate",
+    tenant_id: str | None = None,
+    template: str = DEFAULT_TEMPLATE
+) -> EnhancementResult | ErrorResult:
     """
     Enhance an image generation prompt with dog breed aesthetic characteristics.
     
@@ -130,6 +436,9 @@ def enhance_with_breed_aesthetic(
             - "subtle": Light touch, gentle influence
             - "moderate": Balanced integration (default)
             - "strong": Pronounced breed aesthetic
+        tenant_id: Also look in this tenant's custom breeds (checked first)
+        template: Synthesis instruction template ("prose" by default, "tags" for
+            SD-style models, or any template added with register_synthesis_template)
     
     Returns:
         Dictionary containing:
@@ -141,17 +450,34 @@ def enhance_with_breed_aesthetic(
         - characteristics: Detailed breed characteristics organized by category
         - synthesis_instruction: Instructions for Claude to create final prompt
     """
-    breed_key = normalize_breed_name(breed_name)
-    breed_data = get_breed_data(breed_key)
+    breed_data = _lookup_breed(breed_name, tenant_id)
     
     if not breed_data:
-        available = get_breed_names()
+        available = _available_breeds(tenant_id)
         return {
             "error": f"Breed '{breed_name}' not found",
             "available_breeds": available,
             "suggestion": "Use list_available_breeds() to see all options"
         }
     
+    if get_template(template) is None:
+        return _template_not_found(template)
+    return _enhancement(breed_data, base_prompt, emphasis_level, template)
+
+
+def _template_not_found(template):
+    return {
+        "error": f"Template '{template}' not found",
+        "available_templates": get_template_names(),
+        "suggestion": "Use list_synthesis_templates() to see all options"
+    }
+
+
+def _enhancement(breed_data, base_prompt, emphasis_level, template):
+    """Enhancement payload for one breed; the template must be registered"""
+    with span("render", {"template.name": template, "emphasis_level": emphasis_level}):
+        synthesis_instruction = render_instruction(template, breed_data, emphasis_level, base_prompt)
+    
     # Package all the deterministic breed data for Claude to synthesize
     enhancement_data = {
         "breed_name": breed_data["name"],
@@ -167,46 +493,1007 @@ def enhance_with_breed_aesthetic(
             "color_palette": breed_data["color_palette"],
             "scale": breed_data["scale"]
         },
-        "synthesis_instruction": f"""
-Create an enhanced image generation prompt by weaving {breed_data['name']} aesthetic characteristics into the base prompt.
-
-Base prompt: "{base_prompt}"
-
-Emphasis level: {emphasis_level}
-- subtle: Gentle influence, mostly preserve original tone
-- moderate: Balanced integration of breed aesthetics
-- strong: Pronounced breed characteristics throughout
-
-Key aesthetic qualities to integrate:
-{breed_data['visual_essence']}
-
-Draw from these breed characteristics as appropriate:
-- Physical proportions and build
-- Coat texture and qualities  
-- Movement and energy
-- Temperament and mood
-- Color palette suggestions
-
-Requirements:
-1. Preserve the core intent and subject of the base prompt
-2. Weave in breed aesthetics naturally, not literally (don't add actual dogs)
-3. Match the emphasis level - subtle should be light touch, strong should be pronounced
-4. Focus on translating breed qualities into visual/compositional/tonal elements
-5. Keep the enhanced prompt concise and coherent (2-4 sentences typically)
-
-Return only the enhanced prompt text, ready to use for image generation.
-"""
+        "synthesis_instruction": synthesis_instruction
     }
     
     return enhancement_data
 
 
+@json_tool(mcp)
+@traced
+def interpolate_breed_aesthetics(
+    start_breed: str,
+    end_breed: str,
+    base_prompt: str,
+    frame_count: int,
+    emphasis_level: Literal["subtle", "moderate", "strong"] = "moderate",
+    start_frame: int = 0,
+    max_frames: int = 25
+) -> InterpolationResult | ErrorResult:
+    """
+    Generate frame prompts that morph from one breed aesthetic to another.
+    
+    Produces interpolated characteristic sets for an animation sequence in a
+    single computation over both breeds' attributes, rather than one
+    enhance_with_breed_aesthetic() call per frame. Long sequences are returned
+    a window at a time: pass the returned next_frame as start_frame to fetch
+    the following frames.
+    
+    Args:
+        start_breed: Breed the sequence starts from (e.g., "Greyhound")
+        end_breed: Breed the sequence ends on (e.g., "Bulldog")
+        base_prompt: The original image prompt shared by every frame
+        frame_count: Total number of frames in the sequence (1-10000)
+        emphasis_level: How strongly to apply breed characteristics
+        start_frame: First frame to return (0-based)
+        max_frames: Maximum number of frames to return in this call
+    
+    Returns:
+        Dictionary containing:
+        - start_breed / end_breed: The selected breeds
+        - frame_count: Total frames in the sequence
+        - frames: Blend weights, characteristics and synthesis_instruction per frame
+        - next_frame: Start frame of the next window, or None when complete
+    """
+    start_data = _lookup_breed(start_breed)
+    end_data = _lookup_breed(end_breed)
+    
+    missing = [name for name, data in ((start_breed, start_data), (end_breed, end_data)) if not data]
+    if missing:
+        return {
+            "error": "Breed not found: " + ", ".join(f"'{name}'" for name in missing),
+            "available_breeds": get_breed_names(),
+            "suggestion": "Use list_available_breeds() to see all options"
+        }
+    
+    if not 1 <= frame_count <= MAX_INTERPOLATION_FRAMES:
+        return {"error": f"frame_count must be between 1 and {MAX_INTERPOLATION_FRAMES}"}
+    if max_frames < 1:
+        return {"error": "max_frames must be at least 1"}
+    if not 0 <= start_frame < frame_count:
+        return {"error": f"start_frame must be between 0 and {frame_count - 1}"}
+    
+    stop_frame = min(start_frame + max_frames, frame_count)
+    with span("render", {"emphasis_level": emphasis_level, "frame.count": stop_frame - start_frame}):
+        frames = list(iter_interpolated_frames(
+            start_data, end_data, base_prompt, frame_count,
+            emphasis_level=emphasis_level,
+            start_frame=start_frame,
+            stop_frame=stop_frame
+        ))
+    
+    return {
+        "start_breed": start_data["name"],
+        "end_breed": end_data["name"],
+        "base_prompt": base_prompt,
+        "emphasis_level": emphasis_level,
+        "frame_count": frame_count,
+        "frames": frames,
+        "next_frame": stop_frame if stop_frame < frame_count else None
+    }
+
+
+@json_tool(mcp)
+@traced
+def compare_breeds(breed_names: list[str]) -> ComparisonResult | ErrorResult:
+    """
+    Compare the visual characteristics of several dog breeds in one call.
+    
+    Returns the attributes all breeds share and the attributes that set each
+    breed apart, for proportions, coat, movement, temperament, color palette
+    and scale. Use this instead of calling get_breed_characteristics() per
+    breed and diffing the text.
+    
+    Args:
+        breed_names: Two or more breed names (e.g., ["Greyhound", "Whippet"]),
+            up to 50 per call
+    
+    Returns:
+        Dictionary containing:
+        - breeds: The compared breed names
+        - shared: Attributes common to every breed, by category
+        - distinguishing: Attributes unique to each breed, by breed and category
+        - overlap: Fraction of each category's terms shared by all breeds
+    """
+    breed_keys = []
+    missing = []
+    with span("lookup", {"breed.count": len(breed_names)}) as lookup:
+        for breed_name in breed_names:
+            breed_key = normalize_breed_name(breed_name)
+            if not get_breed_data(breed_key):
+                missing.append(breed_name)
+            elif breed_key not in breed_keys:
+                breed_keys.append(breed_key)
+        lookup.set_attribute("lookup.misses", len(missing))
+    
+    if missing:
+        return {
+            "error": "Breed not found: " + ", ".join(f"'{name}'" for name in missing),
+            "available_breeds": get_breed_names(),
+            "suggestion": "Use list_available_breeds() to see all options"
+        }
+    
+    if not 2 <= len(breed_keys) <= MAX_COMPARE_BREEDS:
+        return {"error": f"Provide between 2 and {MAX_COMPARE_BREEDS} distinct breeds to compare"}
+    
+    with span("compare", {"breed.count": len(breed_keys)}):
+        comparison = compare_breed_keys(breed_keys)
+    names = {breed_key: get_breed_data(breed_key)["name"] for breed_key in breed_keys}
+    
+    return {
+        "breeds": [names[breed_key] for breed_key in breed_keys],
+        "shared": comparison["shared"],
+        "distinguishing": {
+            names[breed_key]: categories
+            for breed_key, categories in comparison["distinguishing"].items()
+        },
+        "overlap": comparison["overlap"]
+    }
+
+
+@json_tool(mcp)
+@traced
+def find_breeds_by_features(
+    scale_min: str | float | None = None,
+    scale_max: str | float | None = None,
+    coat_length_min: str | float | None = None,
+    coat_length_max: str | float | None = None,
+    energy_min: str | float | None = None,
+    energy_max: str | float | None = None,
+    sort_by: Literal["name", "scale", "coat_length", "energy"] = "name",
+    descending: bool = False
+) -> FeatureSearchResult | ErrorResult:
+    """
+    Filter and sort breeds by numeric scale, coat length and energy.
+    
+    Bounds are inclusive and may be given as level names or numbers:
+    - scale: toy (0), small (1), small-medium (1.5), medium (2), medium-large (2.5), large (3), giant (4)
+    - coat_length: very short (0), short (1), medium (2), moderately long (2.5), long (3), very long (4)
+    - energy: low (1), moderate (2), high (3), very high (4)
+    
+    Ranges written as "X to Y" in the breed data (e.g. "moderate to high")
+    sit at the midpoint. Breeds whose value cannot be parsed are excluded
+    from ranges on that feature and sort last.
+    
+    Args:
+        scale_min / scale_max: Size range (e.g., scale_min="small", scale_max="medium")
+        coat_length_min / coat_length_max: Coat length range
+        energy_min / energy_max: Energy range (e.g., energy_min="high")
+        sort_by: Feature to sort by, or "name"
+        descending: Sort from highest to lowest
+    
+    Returns:
+        Dictionary containing:
+        - count: Number of matching breeds
+        - breeds: Key, name, group and numeric features of each match
+    """
+    table = get_feature_table()
+    
+    try:
+        ranges = {
+            "scale": (resolve_bound("scale", scale_min), resolve_bound("scale", scale_max)),
+            "coat_length": (
+                resolve_bound("coat_length", coat_length_min),
+                resolve_bound("coat_length", coat_length_max)
+            ),
+            "energy": (resolve_bound("energy", energy_min), resolve_bound("energy", energy_max)),
+        }
+    except ValueError as e:
+        return {"error": str(e)}
+    
+    ranges = {feature: bounds for feature, bounds in ranges.items() if bounds != (None, None)}
+    with span("query", {"sort_by": sort_by}) as query:
+        rows = table.query(ranges, sort_by=sort_by, descending=descending)
+        query.set_attribute("result.count", len(rows))
+    
+    return {
+        "count": len(rows),
+        "breeds": [
+            {
+                "key": table.keys[row],
+                "name": table.names[row],
+                "group": get_breed_data(table.keys[row])["group"],
+                "scale": table.value("scale", row),
+                "coat_length": table.value("coat_length", row),
+                "energy": table.value("energy", row)
+            }
+            for row in rows
+        ]
+    }
+
+
+@json_tool(mcp)
+@traced
+def select_diverse_breeds(
+    count: int = 5,
+    group: str | None = None,
+    scale_min: str | float | None = None,
+    scale_max: str | float | None = None
+) -> DiverseSelection | ErrorResult:
+    """
+    Pick the breeds that look most different from each other.
+    
+    Use this to choose breeds for a varied set of images instead of picking
+    by hand from list_available_breeds(). Breeds are compared on all their
+    attribute terms (proportions, coat, movement, temperament, color palette
+    and scale); each pick is the breed farthest from every breed already
+    picked, so the first few picks are the most contrasting.
+    
+    Args:
+        count: Number of breeds to pick (1-50, default 5)
+        group: Only pick from this AKC group (e.g., "Hound")
+        scale_min / scale_max: Size range, as for find_breeds_by_features()
+            (e.g., scale_min="medium")
+    
+    Returns:
+        Dictionary containing:
+        - count: Number of breeds picked (fewer than requested if fewer match)
+        - candidates: Number of breeds matching the filters
+        - min_distance: Smallest distance between any two picks (0-1)
+        - breeds: Key, name, group and distance from the nearest earlier pick of each breed, in pick order
+    """
+    if not 1 <= count <= MAX_DIVERSE_BREEDS:
+        return {"error": f"count must be between 1 and {MAX_DIVERSE_BREEDS}"}
+    
+    try:
+        scale = (resolve_bound("scale", scale_min), resolve_bound("scale", scale_max))
+    except ValueError as e:
+        return {"error": str(e)}
+    
+    index = get_diversity_index()
+    keys = None
+    if scale != (None, None):
+        table = get_feature_table()
+        keys = [table.keys[row] for row in table.query({"scale": scale})]
+    rows = index.candidates(group, keys)
+    if not rows:
+        return {
+            "error": "No breeds match the filters",
+            "suggestion": "Use find_breeds_by_features() or list_breeds_page() to see which breeds each filter allows"
+        }
+    
+    with span("select", {"count": count}) as select:
+        picks = index.select(rows, count)
+        select.set_attribute("candidate.count", len(rows))
+    
+    min_distance = None
+    for i, (row, _) in enumerate(picks):
+        for other, _ in picks[:i]:
+            distance = index.distance(row, other)
+            if min_distance is None or distance < min_distance:
+                min_distance = distance
+    
+    breeds = []
+    for row, distance in picks:
+        breed_key = index.keys[row]
+        breed_data = get_breed_data(breed_key)
+        breeds.append({
+            "key": breed_key,
+            "name": breed_data["name"],
+            "group": breed_data["group"],
+            "distance": None if distance is None else round(distance, 4)
+        })
+    
+    return {
+        "count": len(breeds),
+        "candidates": len(rows),
+        "min_distance": None if min_distance is None else round(min_distance, 4),
+        "breeds": breeds
+    }
+
+
+@json_tool(mcp)
+@traced
+def sample_breeds(
+    count: int = 1,
+    seed: int | None = None,
+    replace: bool = True,
+    group_weights: dict[str, float] | None = None,
+    scale_weights: dict[str, float] | None = None,
+    popularity: float = 0.0,
+    base_prompt: str | None = None,
+    emphasis_level: Literal["subtle", "moderate", "strong"] = "moderate",
+    template: str = DEFAULT_TEMPLATE
+) -> BreedSample | ErrorResult:
+    """
+    Draw random breeds, weighted by group, scale and popularity.
+    
+    Use this instead of fetching the breed list and picking at random on
+    the client. Draws are reproducible: the same seed and weights always
+    return the same breeds, and the seed used is returned when none is given.
+    
+    Args:
+        count: Number of draws (1-10000)
+        seed: Random seed; omit for a fresh one
+        replace: Allow the same breed to be drawn more than once (default True)
+        group_weights: Relative weight per AKC group (e.g., {"Toy": 3, "Hound": 0});
+            groups not listed weigh 1
+        scale_weights: Relative weight per scale level (e.g., {"giant": 0.5});
+            levels are those of find_breeds_by_features(), unlisted levels weigh 1
+        popularity: How strongly to favour often-requested breeds (0-4): weights
+            are multiplied by (1 + request count) ** popularity, with request
+            counts from the server's call recording, if it keeps one
+        base_prompt: If given, also return an enhancement payload per drawn breed,
+            as enhance_with_breed_aesthetic() would for this prompt
+        emphasis_level: Emphasis for the payloads
+        template: Synthesis instruction template for the payloads
+    
+    Returns:
+        Dictionary containing:
+        - seed: The seed used
+        - replace: Whether breeds could repeat
+        - breeds: Drawn breeds (key and name), in draw order
+        - probabilities: Chance of a single draw picking each drawn breed, by breed key
+        - payloads: Enhancement payload per drawn breed, by breed key (only with base_prompt)
+    """
+    if not 1 <= count <= MAX_SAMPLE_DRAWS:
+        return {"error": f"count must be between 1 and {MAX_SAMPLE_DRAWS}"}
+    if base_prompt is not None and get_template(template) is None:
+        return _template_not_found(template)
+    if seed is None:
+        seed = random.randrange(1 << 32)
+    
+    try:
+        with span("weights"):
+            sampler = get_sampler(group_weights, scale_weights, popularity, _warmup.stats_path)
+        with span("sample", {"count": count, "replace": replace}):
+            rows = sampler.sample(count, seed, replace)
+    except ValueError as e:
+        return {"error": str(e)}
+    
+    # Display names need not be unique, so results are keyed by breed key
+    drawn = {row: {"key": sampler.keys[row], "name": sampler.names[row]} for row in dict.fromkeys(rows)}
+    result = {
+        "seed": seed,
+        "replace": replace,
+        "breeds": [drawn[row] for row in rows],
+        "probabilities": {breed["key"]: round(sampler.probability(row), 6) for row, breed in drawn.items()}
+    }
+    if base_prompt is not None:
+        result["payloads"] = {
+            breed["key"]: _enhancement(get_breed_data(breed["key"]), base_prompt, emphasis_level, template)
+            for breed in drawn.values()
+        }
+    return result
+    
+    
+@json_tool(mcp)
+@traced
+def list_breeds_page(
+    cursor: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    group: str | None = None
+) -> BreedPage | ErrorResult:
+    """
+    List available breeds one page at a time.
+    
+    Breeds are ordered by AKC group, then name. Pass the returned
+    next_cursor back as cursor to fetch the following page; ordering is
+    stable, so pages stay consistent even if the catalog changes between
+    calls.
+    
+    Args:
+        cursor: Cursor from a previous page, or None for the first page
+        page_size: Number of breeds per page (1-200, default 50)
+        group: Only list breeds from this AKC group (e.g., "Hound")
+    
+    Returns:
+        Dictionary containing:
+        - breeds: Key, name and group of each breed on this page
+        - next_cursor: Cursor for the next page, or None on the last page
+        - total: Number of breeds matching the group filter
+    """
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        return {"error": f"page_size must be between 1 and {MAX_PAGE_SIZE}"}
+    
+    try:
+        with span("query", {"page_size": page_size}):
+            breed_keys, next_cursor, total = get_catalog_index().page(cursor, page_size, group)
+    except ValueError as e:
+        return {"error": str(e), "suggestion": "Omit cursor to start from the first page"}
+    
+    breeds = []
+    for breed_key in breed_keys:
+        breed_data = get_breed_data(breed_key)
+        breeds.append({"key": breed_key, "name": breed_data["name"], "group": breed_data["group"]})
+    
+    return {
+        "breeds": breeds,
+        "next_cursor": next_cursor,
+        "total": total
+    }
+
+
+@json_tool(mcp)
+@traced
+def list_breed_variants(breed_name: str | None = None) -> VariantList | ErrorResult:
+    """
+    List breed variants such as size varieties and coat colours.
+    
+    Variants (e.g. Toy Poodle, Cardigan Welsh Corgi, Blue Merle Border Collie)
+    inherit every characteristic from their parent breed and change only a
+    few. Any tool that takes a breed name accepts a variant name too.
+    
+    Args:
+        breed_name: Only list variants descending from this breed or variant
+            (e.g., "Poodle"); omit to list all variants
+    
+    Returns:
+        Dictionary containing:
+        - variants: Name, parent and overridden fields of each variant
+    """
+    parent_key = None
+    if breed_name is not None:
+        parent_key = normalize_breed_name(breed_name)
+        if not get_breed_data(parent_key):
+            return {
+                "error": f"Breed '{breed_name}' not found",
+                "available_breeds": get_breed_names(),
+                "suggestion": "Use list_available_breeds() to see all options"
+            }
+    
+    variants = []
+    for variant_key in get_variant_keys(parent_key):
+        variant_data = get_breed_data(variant_key)
+        parent_data = get_breed_data(VARIANT_DATABASE[variant_key]["parent"])
+        if not variant_data or not parent_data:
+            continue
+        variants.append({
+            "key": variant_key,
+            "name": variant_data["name"],
+            "parent": parent_data["name"],
+            "overrides": sorted(VARIANT_DATABASE[variant_key]["overrides"])
+        })
+    
+    return {"variants": variants}
+
+
+@json_tool(mcp)
+@traced
+def get_breed_changes_since(version: str | None = None) -> BreedChanges | ErrorResult:
+    """
+    Get the breeds added, modified or removed since a catalog version.
+    
+    For keeping a mirror of the catalog in sync: pass the version returned
+    by the previous call to receive only what changed since. If the server
+    can no longer tell what changed since that version (or no version is
+    given), the whole catalog is returned with full set to true and the
+    mirror should replace its contents.
+    
+    Args:
+        version: Version from a previous call (omit for the whole catalog)
+    
+    Returns:
+        Dictionary containing:
+        - version: Current catalog version, to pass next time
+        - full: Whether this is the whole catalog rather than changes
+        - breeds: Every breed, when full (each breed has its "key")
+        - added / modified: Changed breeds, when not full
+        - removed: Keys of removed breeds, when not full
+    """
+    change_log = get_change_log()
+    with span("query", {"since": version or ""}) as query:
+        try:
+            current, changes = (None, None) if version is None else change_log.changes_since(version)
+        except ValueError as e:
+            return {
+                "error": str(e),
+                "suggestion": "Pass the version returned by a previous call, or omit it"
+            }
+        if changes is None:
+            current, breed_keys = change_log.snapshot()
+            query.set_attribute("changes.full", True)
+            return {
+                "version": current,
+                "full": True,
+                "breeds": [{"key": key, **get_breed_data(key)} for key in breed_keys]
+            }
+        
+        query.set_attribute("changes.full", False)
+        query.set_attribute("changes.count", len(changes))
+        result = {"version": current, "full": False, "added": [], "modified": [], "removed": []}
+        for breed_key, change in sorted(changes.items()):
+            if change == "removed":
+                result["removed"].append(breed_key)
+            else:
+                result[change].append({"key": breed_key, **get_breed_data(breed_key)})
+        return result
+
+
+@json_tool(mcp)
+@traced
+def register_custom_breed(tenant_id: str, breed_name: str, characteristics: dict) -> CustomBreedStatus | ErrorResult:
+    """
+    Register (or replace) a custom breed or style definition for a tenant.
+    
+    Custom breeds are stored persistently and are visible only to the tenant
+    that owns them: pass the same tenant_id to get_breed_characteristics()
+    or enhance_with_breed_aesthetic() to use them. A custom breed with the
+    same name as a built-in breed takes precedence for that tenant.
+    
+    Args:
+        tenant_id: Identifier of the owning tenant
+        breed_name: Name used to look the breed up (e.g., "Studio Whippet")
+        characteristics: Breed data with the same fields as the built-in breeds:
+            group, proportions (body_ratio, build, head, legs), coat (texture,
+            length, qualities), movement (gait, energy, qualities),
+            temperament_aesthetic (mood, presence, character), color_palette
+            (list), scale and visual_essence. "name" defaults to breed_name.
+    """
+    breed_data = dict(characteristics)
+    breed_data.setdefault("name", breed_name)
+    breed_key = normalize_breed_name(breed_name)
+    try:
+        get_tenant_store().register(tenant_id, breed_key, breed_data)
+    except ValueError as e:
+        return {"error": str(e)}
+    return {"tenant_id": tenant_id, "breed_key": breed_key, "name": breed_data["name"], "status": "registered"}
+
+
+@json_tool(mcp)
+@traced
+def update_custom_breed(tenant_id: str, breed_name: str, changes: dict) -> CustomBreedStatus | ErrorResult:
+    """
+    Update some fields of a tenant's custom breed.
+    
+    Nested categories (proportions, coat, movement, temperament_aesthetic)
+    are merged per field, so {"coat": {"length": "long"}} changes only the
+    coat length.
+    
+    Args:
+        tenant_id: Identifier of the owning tenant
+        breed_name: Name of the custom breed
+        changes: Fields to change
+    """
+    breed_key = normalize_breed_name(breed_name)
+    try:
+        breed_data = get_tenant_store().update(tenant_id, breed_key, changes)
+    except KeyError:
+        return {"error": f"Custom breed '{breed_name}' not found for tenant '{tenant_id}'"}
+    except ValueError as e:
+        return {"error": str(e)}
+    return {"tenant_id": tenant_id, "breed_key": breed_key, "name": breed_data["name"], "status": "updated"}
+
+
+@json_tool(mcp)
+@traced
+def delete_custom_breed(tenant_id: str, breed_name: str) -> CustomBreedStatus | ErrorResult:
+    """
+    Delete a tenant's custom breed.
+    
+    Args:
+        tenant_id: Identifier of the owning tenant
+        breed_name: Name of the custom breed
+    """
+    breed_key = normalize_breed_name(breed_name)
+    try:
+        deleted = get_tenant_store().delete(tenant_id, breed_key)
+    except ValueError as e:
+        return {"error": str(e)}
+    if not deleted:
+        return {"error": f"Custom breed '{breed_name}' not found for tenant '{tenant_id}'"}
+    return {"tenant_id": tenant_id, "breed_key": breed_key, "status": "deleted"}
+
+
+@json_tool(mcp)
+@traced
+def list_custom_breeds(tenant_id: str) -> CustomBreedList:
+    """
+    List a tenant's custom breeds.
+    
+    Args:
+        tenant_id: Identifier of the owning tenant
+    """
+    registry = get_tenant_store().registry(tenant_id)
+    breeds = [
+        {"key": breed_key, "name": breed_data["name"], "group": breed_data["group"]}
+        for breed_key, breed_data in sorted(registry.database.items())
+    ]
+    return {"tenant_id": tenant_id, "breeds": breeds}
+
+
+@json_tool(mcp)
+@traced
+def register_synthesis_template(name: str, template: str, description: str = "") -> TemplateRegistration | ErrorResult:
+    """
+    Register a named synthesis instruction template for enhance_with_breed_aesthetic.
+    
+    Templates use {placeholder} syntax and are validated and compiled once;
+    rendered instructions are cached per (template, breed, emphasis level).
+    Use {{ and }} for literal braces. Re-registering a name replaces it;
+    built-in templates cannot be replaced. At most 100 templates can be
+    registered.
+    
+    Args:
+        name: Template name (lowercase letters, digits, "_" or "-")
+        template: Template text; must include {base_prompt}
+        description: Short note on which model or style the template targets
+    
+    Returns:
+        Dictionary with the template name and the placeholders it uses,
+        or an error listing the available placeholders
+    """
+    try:
+        compiled = register_template(name, template, description)
+    except ValueError as e:
+        return {"error": str(e), "available_placeholders": list(PLACEHOLDERS)}
+    return {"name": compiled.name, "placeholders": compiled.placeholders(), "status": "registered"}
+
+
+@json_tool(mcp)
+@traced
+def list_synthesis_templates() -> TemplateList:
+    """
+    List registered synthesis instruction templates.
+    
+    Returns:
+        Dictionary with each template's name, description, placeholders and
+        whether it is built in, plus every placeholder templates may use
+    """
+    templates = []
+    for name in get_template_names():
+        compiled = get_template(name)
+        templates.append({
+            "name": name,
+            "description": compiled.description,
+            "builtin": compiled.builtin,
+            "placeholders": compiled.placeholders()
+        })
+    return {
+        "default": DEFAULT_TEMPLATE,
+        "templates": templates,
+        "available_placeholders": list(PLACEHOLDERS)
+    }
+
+
+@json_tool(mcp)
+@traced
+def score_enhanced_prompts(
+    breed_name: str,
+    prompts: list[str],
+    emphasis_level: Literal["subtle", "moderate", "strong"] = "moderate",
+    tenant_id: str | None = None
+) -> ScoreResult | ErrorResult:
+    """
+    Score how strongly finished prompts carry a breed's aesthetic.
+    
+    Each prompt is scored 0-1 by the TF-IDF weight of the breed's attribute
+    words it contains, so distinctive words count more than ones shared by
+    many breeds. Prompts outside the expected range for the emphasis level
+    are flagged, as are prompts that add a literal dog.
+    
+    Args:
+        breed_name: Breed the prompts were enhanced with
+        prompts: Enhanced prompts to score (up to 10000)
+        emphasis_level: Emphasis the prompts were meant to have
+        tenant_id: Also look in this tenant's custom breeds (checked first)
+    
+    Returns:
+        Dictionary containing:
+        - breed_name: The breed scored against
+        - emphasis_level: Requested emphasis
+        - expected_range: [min, max] score for that emphasis
+        - scores: Per prompt, in input order: score, flag ("under", "ok" or
+          "over"), matched_terms and mentions_dog
+        - summary: Counts per flag, prompts mentioning dogs, and mean score
+    """
+    breed_data = _lookup_breed(breed_name, tenant_id)
+    
+    if not breed_data:
+        available = _available_breeds(tenant_id)
+        return {
+            "error": f"Breed '{breed_name}' not found",
+            "available_breeds": available,
+            "suggestion": "Use list_available_breeds() to see all options"
+        }
+    
+    if len(prompts) > MAX_SCORE_PROMPTS:
+        return {"error": f"At most {MAX_SCORE_PROMPTS} prompts can be scored per call"}
+    
+    with span("score", {"emphasis_level": emphasis_level, "prompt.count": len(prompts)}):
+        scores = score_prompts(breed_data, prompts, emphasis_level)
+    summary = {"under": 0, "ok": 0, "over": 0, "mentions_dog": 0}
+    for result in scores:
+        summary[result["flag"]] += 1
+        summary["mentions_dog"] += result["mentions_dog"]
+    summary["mean_score"] = round(sum(r["score"] for r in scores) / len(scores), 4) if scores else 0.0
+    
+    return {
+        "breed_name": breed_data["name"],
+        "emphasis_level": emphasis_level,
+        "expected_range": list(EMPHASIS_RANGES[emphasis_level]),
+        "scores": scores,
+        "summary": summary
+    }
+
+
+def _compile_for_breed(breed_name, emphasis_level, output_format, tenant_id):
+    """Compiled (breed data, separator, chunk, negative prompt, weighted tags), or an error dict"""
+    breed_data = _lookup_breed(breed_name, tenant_id)
+    
+    if not breed_data:
+        return {
+            "error": f"Breed '{breed_name}' not found",
+            "available_breeds": _available_breeds(tenant_id),
+            "suggestion": "Use list_available_breeds() to see all options"
+        }
+    if output_format not in COMPILERS:
+        return {
+            "error": f"Output format '{output_format}' not found",
+            "available_formats": list(COMPILERS),
+            "suggestion": "Use 'sd' for Stable Diffusion-style models"
+        }
+    
+    # A tenant's custom breed must not pick up the built-in breed's precomputed tags
+    breed_key = normalize_breed_name(breed_name)
+    if tenant_id and breed_data is not get_breed_data(breed_key):
+        breed_key = None
+    with span("compile", {"output_format": output_format, "emphasis_level": emphasis_level}):
+        return (breed_data, *compile_breed(output_format, breed_key, breed_data, emphasis_level))
+
+
+@json_tool(mcp)
+@traced
+def compile_breed_prompt(
+    breed_name: str,
+    base_prompt: str,
+    emphasis_level: Literal["subtle", "moderate", "strong"] = "moderate",
+    output_format: Literal["sd", "midjourney", "plain"] = DEFAULT_FORMAT,
+    tenant_id: str | None = None
+) -> CompiledPrompt | ErrorResult:
+    """
+    Compile a breed's aesthetic straight into a diffusion-model prompt.
+    
+    Unlike enhance_with_breed_aesthetic(), this needs no LLM synthesis step:
+    the base prompt is returned with the breed's most distinctive aesthetic
+    tags appended in the model's weight syntax, plus a negative prompt that
+    keeps literal dogs out of the image.
+    
+    Args:
+        breed_name: Name of the breed to draw aesthetics from (e.g., "Greyhound")
+        base_prompt: The original image prompt
+        emphasis_level: "subtle" (3 light tags), "moderate" (5 tags) or
+            "strong" (8 heavily weighted tags)
+        output_format: Prompt syntax:
+            - "sd": Stable Diffusion weights, e.g. (sleek coat:1.25)
+            - "midjourney": base prompt weighted against the tags with ::, negatives as --no
+            - "plain": unweighted tags, most distinctive first (e.g. for FLUX)
+        tenant_id: Also look in this tenant's custom breeds (checked first)
+    
+    Returns:
+        Dictionary containing:
+        - breed_name: The selected breed
+        - output_format: Prompt syntax used
+        - emphasis_level: Selected emphasis
+        - prompt: The base prompt with weighted breed tags
+        - negative_prompt: Terms to pass as the negative prompt
+        - tags: The breed tags added, with their weights
+    """
+    compiled = _compile_for_breed(breed_name, emphasis_level, output_format, tenant_id)
+    if isinstance(compiled, dict):
+        return compiled
+    breed_data, separator, chunk, negative_prompt, weighted = compiled
+    
+    return {
+        "breed_name": breed_data["name"],
+        "output_format": output_format,
+        "emphasis_level": emphasis_level,
+        "prompt": join_prompt(base_prompt, separator, chunk),
+        "negative_prompt": negative_prompt,
+        "tags": [{"tag": tag, "weight": weight} for tag, weight in weighted]
+    }
+
+
+@json_tool(mcp)
+@traced
+def compile_breed_prompts(
+    breed_name: str,
+    base_prompts: list[str],
+    emphasis_level: Literal["subtle", "moderate", "strong"] = "moderate",
+    output_format: Literal["sd", "midjourney", "plain"] = DEFAULT_FORMAT,
+    tenant_id: str | None = None
+) -> CompiledPromptBatch | ErrorResult:
+    """
+    Compile many base prompts with one breed's aesthetic in a single call.
+    
+    Same output as compile_breed_prompt() for each prompt; the breed's tags
+    are compiled once and only joined to each base prompt.
+    
+    Args:
+        breed_name: Name of the breed to draw aesthetics from
+        base_prompts: The original image prompts (up to 10000)
+        emphasis_level: "subtle", "moderate" or "strong"
+        output_format: "sd", "midjourney" or "plain", as for compile_breed_prompt()
+        tenant_id: Also look in this tenant's custom breeds (checked first)
+    
+    Returns:
+        Dictionary containing:
+        - breed_name: The selected breed
+        - output_format: Prompt syntax used
+        - emphasis_level: Selected emphasis
+        - prompts: The compiled prompts, in input order
+        - negative_prompt: Terms to pass as the negative prompt (the same for every prompt)
+        - tags: The breed tags added, with their weights
+    """
+    if len(base_prompts) > MAX_COMPILE_PROMPTS:
+        return {"error": f"At most {MAX_COMPILE_PROMPTS} prompts can be compiled per call"}
+    
+    compiled = _compile_for_breed(breed_name, emphasis_level, output_format, tenant_id)
+    if isinstance(compiled, dict):
+        return compiled
+    breed_data, separator, chunk, negative_prompt, weighted = compiled
+    
+    return {
+        "breed_name": breed_data["name"],
+        "output_format": output_format,
+        "emphasis_level": emphasis_level,
+        "prompts": [join_prompt(base_prompt, separator, chunk) for base_prompt in base_prompts],
+        "negative_prompt": negative_prompt,
+        "tags": [{"tag": tag, "weight": weight} for tag, weight in weighted]
+    }
+
+
+@json_tool(mcp)
+@traced
+def configure_profiling(
+    enabled: bool,
+    output_dir: str | None = None,
+    sample_rate: float = DEFAULT_SAMPLE_RATE
+) -> ProfilingState | ErrorResult:
+    """
+    Turn the sampling profiler for tool calls on or off (admin).
+    
+    While enabled, a random fraction of tool calls have their stacks sampled
+    and aggregated per tool into flame-graph-compatible .folded files plus a
+    summary.json in the output directory. Disabling writes the final files
+    and removes all profiling overhead.
+    
+    Args:
+        enabled: Whether profiling should be on
+        output_dir: Subdirectory for profile files, inside the configured
+            profile directory (DOG_BREED_PROFILE_DIR, default "profiles");
+            omit to write to that directory itself
+        sample_rate: Fraction of tool calls to profile, 0-1
+    
+    Returns:
+        Dictionary with the profiling state and per-tool call and sample counts
+    """
+    if not enabled:
+        profiler = disable_profiling(mcp)
+        if profiler is None:
+            return {"enabled": False}
+        return {"enabled": False, "output_dir": profiler.output_dir, "tools": profiler.stats()}
+    
+    try:
+        profiler = _enable_profiling(_profile_dir(output_dir), sample_rate)
+    except (OSError, ValueError) as e:
+        return {"error": str(e), "suggestion": "Pass a relative subdirectory name, or omit output_dir"}
+    return {"enabled": True, "output_dir": profiler.output_dir, "sample_rate": profiler.sample_rate}
+
+
+@json_tool(mcp)
+@traced
+def get_admission_metrics() -> AdmissionMetrics:
+    """
+    Report admission control counters (admin).
+    
+    Returns:
+        Dictionary with admitted, queued and rejected call counts, calls
+        currently running and waiting, the longest queue wait and the
+        configured limits; {"enabled": false} when admission control is off
+    """
+    if _admission is None:
+        return {"enabled": False}
+    return {"enabled": True, **_admission.metrics()}
+
+
+@json_tool(mcp)
+@traced
+def get_cache_stats() -> CacheStats:
+    """
+    Report how much memory the server's caches hold (admin).
+    
+    Returns:
+        Dictionary with the global byte budget, the bytes held by all caches,
+        and per cache its entries, bytes, limits, hits, misses, hit rate and
+        evictions
+    """
+    return get_cache_manager().stats()
+
+
+@json_tool(mcp)
+@traced
+def configure_caches(
+    cache_name: str | None = None,
+    clear: bool = False,
+    max_entries: int | None = None,
+    max_bytes: int | None = None
+) -> CacheStats | ErrorResult:
+    """
+    Clear or resize caches at runtime (admin).
+    
+    Without cache_name, clear empties every cache and max_bytes sets the
+    global budget shared by all caches. With cache_name, the settings apply
+    to that cache's own limits only. Lowering a limit evicts least recently
+    used entries right away.
+    
+    Args:
+        cache_name: Cache to change, as listed by get_cache_stats (default: all)
+        clear: Drop the cached entries
+        max_entries: New entry limit for the named cache
+        max_bytes: New byte limit for the named cache, or the global budget
+    
+    Returns:
+        Cache statistics after the change, as from get_cache_stats
+    """
+    if (max_entries is not None and max_entries < 0) or (max_bytes is not None and max_bytes < 0):
+        return {"error": "max_entries and max_bytes cannot be negative"}
+    
+    manager = get_cache_manager()
+    if cache_name is None:
+        if max_entries is not None:
+            return {
+                "error": "max_entries applies to a single cache",
+                "suggestion": "Pass cache_name; use get_cache_stats() to see all caches"
+            }
+        if clear:
+            manager.clear()
+        if max_bytes is not None:
+            manager.resize(max_bytes)
+        return manager.stats()
+    
+    cache = manager.get(cache_name)
+    if cache is None:
+        return {
+            "error": f"Cache '{cache_name}' not found",
+            "suggestion": "Use get_cache_stats() to see all caches"
+        }
+    if clear:
+        cache.clear()
+    cache.resize(max_entries, max_bytes)
+    return manager.stats()
+
+
+def _http_middleware():
+    """
+    ASGI middleware for the HTTP transport.
+    
+    Responses are compressed unless DOG_BREED_COMPRESSION is "off"; it may
+    also list the encodings to offer (e.g. "gzip"). DOG_BREED_COMPRESSION_MIN_BYTES,
+    DOG_BREED_GZIP_LEVEL and DOG_BREED_ZSTD_LEVEL tune the compression.
+    """
+    setting = os.environ.get("DOG_BREED_COMPRESSION", "").strip().lower()
+    if setting == "off":
+        return []
+    return [Middleware(
+        CompressionMiddleware,
+        minimum_size=int(os.environ.get("DOG_BREED_COMPRESSION_MIN_BYTES", DEFAULT_MINIMUM_SIZE)),
+        encodings=[e.strip() for e in setting.split(",") if e.strip()] or None,
+        gzip_level=int(os.environ.get("DOG_BREED_GZIP_LEVEL", DEFAULT_GZIP_LEVEL)),
+        zstd_level=int(os.environ.get("DOG_BREED_ZSTD_LEVEL", DEFAULT_ZSTD_LEVEL))
+    )]
+
+
+def http_app():
+    """ASGI app for serving over HTTP with any ASGI server (e.g. uvicorn --factory)"""
+    _warmup.start()
+    return mcp.http_app(middleware=_http_middleware())
+
+
 def main():
-    """Entry point for local development"""
-    mcp.run()
+    """Entry point for local development; DOG_BREED_TRANSPORT=http serves over HTTP"""
+    transport = os.environ.get("DOG_BREED_TRANSPORT", "stdio")
+    if transport == "stdio":
+        _warmup.run()
+        mcp.run()
+    else:
+        # Warm up while the server starts; /readyz reports when it is done
+        _warmup.start()
+        mcp.run(transport=transport, middleware=_http_middleware())
 
 
 # For FastMCP Cloud deployment - return the server object
 def get_server():
     """Entry point for FastMCP Cloud"""
+    _warmup.start()
     return mcp
@@ -0,0 +1,484 @@
+"""
+Precompiled index snapshots for fast cold starts.
+
+A snapshot is one binary file holding the breed database and every
+derived index (term bitmasks, feature columns, catalog ordering, scoring
+word statistics, ranked breed tags) as flat arrays that reference a
+shared string table. Loading memory-maps the file and serves lookups
+straight from it: breeds are decoded on first access and nothing is
+parsed, split or sorted at startup. The diversity masks are not stored
+separately: they are combined from the term masks when the snapshot is
+installed. Each breed's change log hash is stored too, so the log's
+first sync does not decode the whole database.
+
+Layout:
+    MAGIC | format version (u32) | meta length (u32) | meta JSON | pad to 8
+    sections, each 8-byte aligned, located by offsets recorded in meta
+
+Snapshots are rejected (SnapshotVersionError) when the file format, the
+index definitions or the expected source database differ from the
+running code, so callers can fall back to building indexes normally.
+
+Build one with build_snapshot(), or from the command line with
+snapshot_cli (the server imports this module, so it is not run directly).
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+
+from dog_breed_aesthetics_mcp import attributes, catalog, compilers, diversity, features, scoring
+from dog_breed_aesthetics_mcp.attributes import CATEGORY_FIELDS, INDEX_CATEGORIES, TermIndex
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE, GROUP_ORDER, set_database
+from dog_breed_aesthetics_mcp.cache import Cache
+from dog_breed_aesthetics_mcp.catalog import CatalogIndex, sort_key
+from dog_breed_aesthetics_mcp.changelog import breed_hash
+from dog_breed_aesthetics_mcp.compilers import (
+    BASE_NEGATIVES,
+    EMPHASIS_TAGS,
+    FEATURE_NEGATIVES,
+    MAX_TAGS_PER_FIELD,
+    TAG_FIELDS,
+    BreedTagIndex
+)
+from dog_breed_aesthetics_mcp.diversity import DiversityIndex, category_offsets, combine_masks
+from dog_breed_aesthetics_mcp.features import FEATURE_ALIASES, FEATURE_LEVELS, FeatureTable
+from dog_breed_aesthetics_mcp.scoring import STOP_WORDS, WordStatistics
+
+MAGIC = b"DOGSNAP\0"
+FORMAT_VERSION = 1
+NO_FIELD = 0xFFFFFFFF
+
+# Fixed-width breed rows: key, name, group, one string per category field,
+# scale, visual essence
+_FIELD_SLOTS = [(category, field) for category, fields in CATEGORY_FIELDS.items() for field in fields]
+_ROW_WIDTH = 3 + len(_FIELD_SLOTS) + 2
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file cannot be read"""
+
+
+class SnapshotVersionError(SnapshotError):
+    """Raised when a snapshot was built by incompatible code or from another source"""
+
+
+def index_version():
+    """Fingerprint of everything the derived indexes depend on besides the data"""
+    definition = {
+        "categories": CATEGORY_FIELDS,
+        "index_categories": {k: [list(v) for v in vs] for k, vs in INDEX_CATEGORIES.items()},
+        "features": FEATURE_LEVELS,
+        "feature_aliases": FEATURE_ALIASES,
+        "groups": GROUP_ORDER,
+        "stop_words": sorted(STOP_WORDS),
+        "tag_fields": TAG_FIELDS,
+        "emphasis_tags": EMPHASIS_TAGS,
+        "max_tags_per_field": MAX_TAGS_PER_FIELD,
+        "base_negatives": BASE_NEGATIVES,
+        "feature_negatives": FEATURE_NEGATIVES,
+    }
+    return hashlib.sha1(json.dumps(definition, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def describe_source(synthetic_size=None, seed=0):
+    """Describe the database a snapshot is built from, to detect stale snapshots"""
+    if synthetic_size:
+        return {"kind": "synthetic", "size": int(synthetic_size), "seed": int(seed)}
+    encoded = json.dumps(BREED_DATABASE, sort_keys=True).encode("utf-8")
+    return {"kind": "builtin", "fingerprint": hashlib.sha1(encoded).hexdigest()}
+
+
+# Writing
+
+class _StringTableBuilder:
+    def __init__(self):
+        self.ids = {}
+
+    def add(self, value):
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.ids)
+        return string_id
+
+    def sections(self):
+        blob = bytearray()
+        offsets = array("I", [0])
+        for value in self.ids:
+            blob += value.encode("utf-8")
+            offsets.append(len(blob))
+        return bytes(blob), offsets
+
+
+def build_snapshot(database, path, source=None):
+    """Compile a database and its derived indexes into a snapshot file"""
+    strings = _StringTableBuilder()
+    breed_keys = list(database)
+    row_of = {breed_key: row for row, breed_key in enumerate(breed_keys)}
+    sections = {}
+
+    rows = array("I")
+    palette_offsets = array("I", [0])
+    palette_ids = array("I")
+    for breed_key in breed_keys:
+        breed_data = database[breed_key]
+        rows.extend((
+            strings.add(breed_key),
+            strings.add(breed_data["name"]),
+            strings.add(breed_data["group"]),
+        ))
+        rows.extend(strings.add(breed_data[category][field]) for category, field in _FIELD_SLOTS)
+        rows.extend((strings.add(breed_data["scale"]), strings.add(breed_data["visual_essence"])))
+        palette_ids.extend(strings.add(color) for color in breed_data["color_palette"])
+        palette_offsets.append(len(palette_ids))
+    sections["breeds"] = rows
+    sections["palette_offsets"] = palette_offsets
+    sections["palette_ids"] = palette_ids
+    sections["hashes"] = array("Q", (breed_hash(breed_key, database[breed_key]) for breed_key in breed_keys))
+
+    term_index = TermIndex(database)
+    mask_widths = {}
+    for category in INDEX_CATEGORIES:
+        vocabulary = array("I")
+        for field, term in term_index.vocabulary[category]:
+            vocabulary.extend((NO_FIELD if field is None else strings.add(field), strings.add(term)))
+        width = max((len(term_index.vocabulary[category]) + 7) // 8, 1)
+        masks = bytearray()
+        for breed_key in breed_keys:
+            masks += term_index.masks[breed_key][category].to_bytes(width, "little")
+        mask_widths[category] = width
+        sections[f"vocab:{category}"] = vocabulary
+        sections[f"masks:{category}"] = bytes(masks)
+
+    feature_table = FeatureTable(database)
+    for feature, column in feature_table.columns.items():
+        sections[f"feature:{feature}"] = column
+
+    catalog_index = CatalogIndex(database)
+    sections["catalog"] = array("I", (row_of[entry[3]] for entry in catalog_index.order))
+    for group, entries in catalog_index.by_group.items():
+        sections[f"catalog:{group}"] = array("I", (row_of[entry[3]] for entry in entries))
+
+    statistics = WordStatistics(database)
+    sections["word_ids"] = array("I", (strings.add(word) for word in statistics.document_frequency))
+    sections["word_counts"] = array("I", statistics.document_frequency.values())
+
+    # Tags are ranked against this database's word statistics, not the active one's
+    tag_index = BreedTagIndex(database, statistics)
+    tag_offsets = array("I", [0])
+    tag_ids = array("I")
+    tag_scores = array("d")
+    negative_offsets = array("I", [0])
+    negative_ids = array("I")
+    for breed_key in breed_keys:
+        ranked, negatives = tag_index.tags[breed_key]
+        for tag, score in ranked:
+            tag_ids.append(strings.add(tag))
+            tag_scores.append(score)
+        tag_offsets.append(len(tag_ids))
+        negative_ids.extend(strings.add(term) for term in negatives)
+        negative_offsets.append(len(negative_ids))
+    sections["tag_offsets"] = tag_offsets
+    sections["tag_ids"] = tag_ids
+    sections["tag_scores"] = tag_scores
+    sections["negative_offsets"] = negative_offsets
+    sections["negative_ids"] = negative_ids
+
+    blob, offsets = strings.sections()
+    sections["strings"] = blob
+    sections["string_offsets"] = offsets
+
+    layout = {}
+    payloads = []
+    position = 0
+    for name, data in sections.items():
+        typecode = data.typecode if isinstance(data, array) else "B"
+        payload = data.tobytes() if isinstance(data, array) else data
+        layout[name] = [position, len(payload), typecode]
+        padding = -len(payload) % 8
+        payloads.append(payload + b"\0" * padding)
+        position += len(payload) + padding
+
+    meta = json.dumps({
+        "index_version": index_version(),
+        "byteorder": sys.byteorder,
+        "source": source,
+        "breed_count": len(breed_keys),
+        "row_width": _ROW_WIDTH,
+        "mask_widths": mask_widths,
+        "groups": list(catalog_index.by_group),
+        "sections": layout,
+    }).encode("utf-8")
+    header = MAGIC + struct.pack("<II", FORMAT_VERSION, len(meta)) + meta
+    header += b"\0" * (-len(header) % 8)
+
+    with open(path, "wb") as f:
+        f.write(header)
+        for payload in payloads:
+            f.write(payload)
+
+
+# Reading
+
+class _StringTable:
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __getitem__(self, string_id):
+        return str(self.blob[self.offsets[string_id]:self.offsets[string_id + 1]], "utf-8")
+
+
+class SnapshotDatabase(Mapping):
+    """
+    Read-only breed database backed by a snapshot; breeds decode on first
+    access. Decoded breeds are cached copies, so editing one in place is
+    not supported and is not reflected in content_hashes().
+    """
+
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+        self.decoded = Cache("decoded_breeds")
+
+    def __getitem__(self, breed_key):
+        breed_data = self.decoded.get(breed_key)
+        if breed_data is None:
+            breed_data = self._snapshot.decode_breed(self._snapshot.row_of[breed_key])
+            self.decoded.put(breed_key, breed_data)
+        return breed_data
+
+    def __iter__(self):
+        return iter(self._snapshot.row_of)
+
+    def __len__(self):
+        return len(self._snapshot.row_of)
+
+    def content_hashes(self):
+        """Return {breed key: change log hash}, as stored when the snapshot was built"""
+        return dict(zip(self._snapshot.keys, self._snapshot.hashes()))
+
+
+class _MaskView(Mapping):
+    """breed key -> {category: bitmask}, decoded from the snapshot on access"""
+
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+
+    def __getitem__(self, breed_key):
+        return self._snapshot.decode_masks(self._snapshot.row_of[breed_key])
+
+    def __iter__(self):
+        return iter(self._snapshot.row_of)
+
+    def __len__(self):
+        return len(self._snapshot.row_of)
+
+
+class _TagView(Mapping):
+    """breed key -> (ranked tags, negative terms), decoded from the snapshot on access"""
+
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+
+    def __getitem__(self, breed_key):
+        return self._snapshot.decode_tags(self._snapshot.row_of[breed_key])
+
+    def __iter__(self):
+        return iter(self._snapshot.row_of)
+
+    def __len__(self):
+        return len(self._snapshot.row_of)
+
+
+class _SortKeyView(Sequence):
+    """Catalog sort keys for an array of breed rows, built on access"""
+
+    def __init__(self, snapshot, rows):
+        self._snapshot = snapshot
+        self._rows = rows
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        return self._snapshot.sort_key(self._rows[position])
+
+    def __len__(self):
+        return len(self._rows)
+
+
+class _NameView(Sequence):
+    """Breed display names by row, decoded from the string table on access"""
+
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        return self._snapshot.name(row)
+
+    def __len__(self):
+        return len(self._snapshot.keys)
+
+
+class Snapshot:
+    """A memory-mapped snapshot file"""
+
+    def __init__(self, path, expected_source=None):
+        try:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._load(path, memoryview(self._mmap), expected_source)
+        except (ValueError, KeyError, TypeError, struct.error) as e:
+            raise SnapshotError(f"{path} is corrupt or truncated: {e}") from e
+
+    def _load(self, path, view, expected_source):
+
+        header_size = len(MAGIC) + 8
+        if len(view) < header_size or bytes(view[:len(MAGIC)]) != MAGIC:
+            raise SnapshotError(f"{path} is not a breed snapshot")
+        format_version, meta_length = struct.unpack("<II", view[len(MAGIC):header_size])
+        if format_version != FORMAT_VERSION:
+            raise SnapshotVersionError(
+                f"snapshot format {format_version}, expected {FORMAT_VERSION}"
+            )
+        meta = json.loads(bytes(view[header_size:header_size + meta_length]))
+        if meta["index_version"] != index_version():
+            raise SnapshotVersionError("snapshot was built with different index definitions")
+        if meta["byteorder"] != sys.byteorder:
+            raise SnapshotVersionError(f"snapshot byte order is {meta['byteorder']}")
+        if expected_source is not None and meta["source"] != expected_source:
+            raise SnapshotVersionError("snapshot was built from a different breed database")
+
+        base = header_size + meta_length
+        base += -base % 8
+        self.meta = meta
+        self._sections = {}
+        for name, (offset, length, typecode) in meta["sections"].items():
+            section = view[base + offset:base + offset + length]
+            self._sections[name] = section if typecode == "B" else section.cast(typecode)
+
+        self.strings = _StringTable(self._sections["strings"], self._sections["string_offsets"])
+        self._rows = self._sections["breeds"]
+        self._width = meta["row_width"]
+        keys = self._rows[::self._width]
+        self.keys = [self.strings[key_id] for key_id in keys]
+        self.row_of = {breed_key: row for row, breed_key in enumerate(self.keys)}
+
+    def decode_breed(self, row):
+        """Materialize one breed as a regular database entry"""
+        start = row * self._width
+        ids = self._rows[start:start + self._width]
+        strings = self.strings
+        breed_data = {"name": strings[ids[1]], "group": strings[ids[2]]}
+        slot = 3
+        for category, fields in CATEGORY_FIELDS.items():
+            breed_data[category] = {}
+            for field in fields:
+                breed_data[category][field] = strings[ids[slot]]
+                slot += 1
+        offsets = self._sections["palette_offsets"]
+        palette = self._sections["palette_ids"][offsets[row]:offsets[row + 1]]
+        breed_data["color_palette"] = [strings[color_id] for color_id in palette]
+        breed_data["scale"] = strings[ids[slot]]
+        breed_data["visual_essence"] = strings[ids[slot + 1]]
+        return breed_data
+
+    def decode_masks(self, row):
+        masks = {}
+        for category, width in self.meta["mask_widths"].items():
+            data = self._sections[f"masks:{category}"]
+            masks[category] = int.from_bytes(data[row * width:(row + 1) * width], "little")
+        return masks
+
+    def decode_tags(self, row):
+        strings = self.strings
+        offsets = self._sections["tag_offsets"]
+        start, stop = offsets[row], offsets[row + 1]
+        ranked = tuple(zip(
+            (strings[tag_id] for tag_id in self._sections["tag_ids"][start:stop]),
+            self._sections["tag_scores"][start:stop],
+        ))
+        offsets = self._sections["negative_offsets"]
+        negatives = self._sections["negative_ids"][offsets[row]:offsets[row + 1]]
+        return ranked, tuple(strings[term_id] for term_id in negatives)
+
+    def hashes(self):
+        return self._sections["hashes"]
+
+    def name(self, row):
+        return self.strings[self._rows[row * self._width + 1]]
+
+    def sort_key(self, row):
+        start = row * self._width
+        return sort_key(
+            self.keys[row],
+            {"name": self.name(row), "group": self.strings[self._rows[start + 2]]},
+        )
+
+    def database(self):
+        return SnapshotDatabase(self)
+
+    def term_index(self):
+        vocabulary = {}
+        for category in INDEX_CATEGORIES:
+            ids = self._sections[f"vocab:{category}"]
+            vocabulary[category] = [
+                (None if ids[i] == NO_FIELD else self.strings[ids[i]], self.strings[ids[i + 1]])
+                for i in range(0, len(ids), 2)
+            ]
+        return TermIndex.from_parts(vocabulary, _MaskView(self))
+
+    def feature_table(self):
+        return FeatureTable.from_columns(
+            self.keys,
+            _NameView(self),
+            {feature: self._sections[f"feature:{feature}"] for feature in FEATURE_LEVELS},
+        )
+
+    def catalog_index(self):
+        return CatalogIndex.from_order(
+            _SortKeyView(self, self._sections["catalog"]),
+            {group: _SortKeyView(self, self._sections[f"catalog:{group}"]) for group in self.meta["groups"]},
+        )
+
+    def diversity_index(self, term_index):
+        """Diversity masks combined from the snapshot's term masks, laid out by term_index"""
+        offsets = category_offsets(term_index)
+        groups = [self.strings[group_id] for group_id in self._rows[2::self._width]]
+        masks = [combine_masks(self.decode_masks(row), offsets) for row in range(len(self.keys))]
+        return DiversityIndex.from_parts(self.keys, groups, masks)
+
+    def word_statistics(self):
+        words = (self.strings[word_id] for word_id in self._sections["word_ids"])
+        return WordStatistics.from_counts(
+            self.meta["breed_count"], dict(zip(words, self._sections["word_counts"]))
+        )
+
+    def tag_index(self):
+        return BreedTagIndex.from_tags(_TagView(self))
+
+
+def install_snapshot(path, expected_source=None):
+    """
+    Make a snapshot's database and indexes the active ones.
+
+    Raises SnapshotError (or SnapshotVersionError) without changing the
+    active database if the snapshot cannot be used.
+    """
+    snapshot = Snapshot(path, expected_source)
+    database = snapshot.database()
+    set_database(database)
+    term_index = snapshot.term_index()
+    attributes._term_index.prime(term_index)
+    catalog._catalog_index.prime(snapshot.catalog_index())
+    features._feature_table.prime(snapshot.feature_table())
+    scoring._word_statistics.prime(snapshot.word_statistics())
+    compilers._tag_index.prime(snapshot.tag_index())
+    diversity._diversity_index.prime(snapshot.diversity_index(term_index))
+    return snapshot
+
@@ -0,0 +1,40 @@
+"""
+Build a breed index snapshot.
+
+Compiles the built-in breed database (or a synthetic one) and its derived
+indexes into a snapshot file for DOG_BREED_SNAPSHOT; see the snapshot
+module for the format. This lives apart from the snapshot module, which
+the server imports, so running it with -m does not import itself twice.
+
+Usage:
+    python -m dog_breed_aesthetics_mcp.snapshot_cli breeds.snap
+    python -m dog_breed_aesthetics_mcp.snapshot_cli breeds.snap --synthetic-size 100000
+    dog-breed-snapshot breeds.snap
+"""
+
+import argparse
+import sys
+
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE
+from dog_breed_aesthetics_mcp.snapshot import build_snapshot, describe_source
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help="snapshot file to write")
+    parser.add_argument("--synthetic-size", type=int, help="snapshot a synthetic database of this size")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic database")
+    args = parser.parse_args(argv)
+
+    if args.synthetic_size:
+        from dog_breed_aesthetics_mcp.synthetic import generate_breed_database
+        database = generate_breed_database(args.synthetic_size, seed=args.seed)
+    else:
+        database = BREED_DATABASE
+    build_snapshot(database, args.path, describe_source(args.synthetic_size, args.seed))
+    print(f"Wrote snapshot of {len(database)} breeds to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
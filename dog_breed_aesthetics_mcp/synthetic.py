@@ -0,0 +1,107 @@
+"""
+Deterministic synthetic breed databases for scaling benchmarks.
+
+Generated breeds follow the schema of BREED_DATABASE and draw their
+values from the distributions observed in it: term counts per field,
+term frequencies, whole-value frequencies for the fields that are
+parsed numerically (scale, coat length, energy), and group membership.
+The same (size, seed) always yields the same database.
+
+Load one into the server with set_database(), or by setting
+DOG_BREED_SYNTHETIC_SIZE (and optionally DOG_BREED_SYNTHETIC_SEED)
+before the server module is imported.
+"""
+
+import random
+from collections import Counter
+from itertools import accumulate
+
+from dog_breed_aesthetics_mcp.attributes import CATEGORY_FIELDS, breed_terms
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE, GROUP_ORDER
+
+BENCHMARK_SIZES = (1_000, 10_000, 100_000)
+
+# Fields sampled as whole values so their numeric features parse like the originals
+WHOLE_VALUE_FIELDS = {("coat", "length"), ("movement", "energy"), ("scale", None)}
+
+
+class _FieldDistribution:
+    """Empirical term-count and term-frequency distribution for one field"""
+
+    def __init__(self, samples):
+        counts = Counter(len(terms) for terms in samples)
+        self.lengths = list(counts)
+        self.length_weights = list(accumulate(counts.values()))
+        frequencies = Counter(term for terms in samples for term in terms)
+        self.terms = list(frequencies)
+        self.term_weights = list(accumulate(frequencies.values()))
+        self.values = [", ".join(terms) for terms in samples]
+
+    def sample_terms(self, rng):
+        length = rng.choices(self.lengths, cum_weights=self.length_weights)[0]
+        length = min(length, len(self.terms))
+        # Draw a few spares per call so duplicates rarely need a second round
+        chosen = {}
+        while len(chosen) < length:
+            for term in rng.choices(self.terms, cum_weights=self.term_weights, k=length + 2):
+                chosen[term] = None
+        return list(chosen)[:length]
+
+    def sample_value(self, rng):
+        return rng.choice(self.values)
+
+
+def _distributions(source):
+    samples = {}
+    for breed_data in source.values():
+        for key, terms in breed_terms(breed_data).items():
+            samples.setdefault(key, []).append(terms)
+    return {key: _FieldDistribution(terms) for key, terms in samples.items()}
+
+
+def _name_parts(source):
+    firsts, lasts = [], []
+    for breed_data in source.values():
+        words = breed_data["name"].split(" (")[0].split()
+        if len(words) > 1:
+            firsts.extend(words[:-1])
+        lasts.append(words[-1])
+    return sorted(set(firsts)), sorted(set(lasts))
+
+
+def generate_breed_database(size, seed=0, source=None):
+    """
+    Generate a synthetic breed database with `size` entries.
+
+    Keys and names are unique and end in a zero-padded serial number so
+    they never collide with real breeds. `source` defaults to
+    BREED_DATABASE and supplies the field distributions.
+    """
+    if source is None:
+        source = BREED_DATABASE
+    rng = random.Random(seed)
+    distributions = _distributions(source)
+    firsts, lasts = _name_parts(source)
+    groups = [breed_data["group"] for breed_data in source.values()] or GROUP_ORDER
+    width = max(len(str(size - 1)), 1)
+
+    def sample_field(key):
+        distribution = distributions[key]
+        if key in WHOLE_VALUE_FIELDS:
+            return distribution.sample_value(rng)
+        return ", ".join(distribution.sample_terms(rng))
+
+    database = {}
+    for serial in range(size):
+        name = f"{rng.choice(firsts)} {rng.choice(lasts)} {serial:0{width}d}"
+        breed_key = name.lower().replace(" ", "_").replace("-", "_")
+        breed_data = {"name": name, "group": rng.choice(groups)}
+        for category, fields in CATEGORY_FIELDS.items():
+            breed_data[category] = {
+                field_name: sample_field((category, field_name)) for field_name in fields
+            }
+        breed_data["color_palette"] = distributions[("color_palette", None)].sample_terms(rng)
+        breed_data["scale"] = sample_field(("scale", None))
+        breed_data["visual_essence"] = sample_field(("visual_essence", None))
+        database[breed_key] = breed_data
+    return database
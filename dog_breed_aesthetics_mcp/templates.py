@@ -0,0 +1,241 @@
+"""
+Named synthesis instruction templates.
+
+A template is str.format-style text with placeholders for breed fields,
+the emphasis level and the base prompt, e.g. "{breed_name}",
+"{coat.texture}" or "{base_prompt}". Templates are validated and split
+into literal/placeholder segments once, when registered. Rendering is
+then two steps: everything except the base prompt is filled in once per
+(template, breed, emphasis) and cached as a tuple of text chunks, and
+each call only joins those chunks around its base prompt.
+
+"prose" (the default, for instruction-following models) and "tags" (for
+SD-style models that expect comma-separated tags) are built in; up to
+MAX_TEMPLATES more can be registered at runtime.
+"""
+
+import re
+import threading
+from string import Formatter
+
+from dog_breed_aesthetics_mcp.attributes import CATEGORY_FIELDS
+from dog_breed_aesthetics_mcp.cache import estimate_bytes, managed_cache
+from dog_breed_aesthetics_mcp.tracing import current_span
+
+DEFAULT_TEMPLATE = "prose"
+MAX_TEMPLATE_LENGTH = 10000
+# Registered (not built-in) templates; replacing an existing one is always allowed
+MAX_TEMPLATES = 100
+DEFAULT_RENDER_CACHE = 1024
+
+EMPHASIS_GUIDANCE = {
+    "subtle": "Gentle influence, mostly preserve original tone",
+    "moderate": "Balanced integration of breed aesthetics",
+    "strong": "Pronounced breed characteristics throughout",
+}
+
+BREED_PLACEHOLDERS = (
+    "breed_name", "breed_group", "visual_essence", "scale", "color_palette",
+    *(f"{category}.{field}" for category, fields in CATEGORY_FIELDS.items() for field in fields),
+)
+PLACEHOLDERS = (*BREED_PLACEHOLDERS, "emphasis_level", "emphasis_guidance", "base_prompt")
+
+_TEMPLATE_NAME = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+
+PROSE_TEMPLATE = """
+Create an enhanced image generation prompt by weaving {breed_name} aesthetic characteristics into the base prompt.
+
+Base prompt: "{base_prompt}"
+
+Emphasis level: {emphasis_level}
+- subtle: Gentle influence, mostly preserve original tone
+- moderate: Balanced integration of breed aesthetics
+- strong: Pronounced breed characteristics throughout
+
+Key aesthetic qualities to integrate:
+{visual_essence}
+
+Draw from these breed characteristics as appropriate:
+- Physical proportions and build
+- Coat texture and qualities  
+- Movement and energy
+- Temperament and mood
+- Color palette suggestions
+
+Requirements:
+1. Preserve the core intent and subject of the base prompt
+2. Weave in breed aesthetics naturally, not literally (don't add actual dogs)
+3. Match the emphasis level - subtle should be light touch, strong should be pronounced
+4. Focus on translating breed qualities into visual/compositional/tonal elements
+5. Keep the enhanced prompt concise and coherent (2-4 sentences typically)
+
+Return only the enhanced prompt text, ready to use for image generation.
+"""
+
+TAGS_TEMPLATE = """
+Rewrite the base prompt as a comma-separated tag list for a Stable Diffusion-style image model, adding {breed_name} aesthetic tags.
+
+Base prompt: "{base_prompt}"
+
+Emphasis level: {emphasis_level} ({emphasis_guidance})
+
+Aesthetic qualities to draw tags from:
+- Essence: {visual_essence}
+- Build: {proportions.build}
+- Coat: {coat.texture}, {coat.qualities}
+- Movement: {movement.gait}, {movement.qualities}
+- Mood: {temperament_aesthetic.mood}, {temperament_aesthetic.presence}
+- Palette: {color_palette}
+
+Requirements:
+1. Keep the subject tags of the base prompt first
+2. Add 3 aesthetic tags for subtle, 5 for moderate, 8 for strong emphasis
+3. Translate breed qualities into visual tags only (don't add actual dogs)
+
+Return only the tag list, with no sentences or explanation.
+"""
+
+
+def _parse(source):
+    """Split template text into (literal, placeholder or None) segments, validating it"""
+    if not isinstance(source, str) or not source.strip():
+        raise ValueError("Template must be a non-empty string")
+    if len(source) > MAX_TEMPLATE_LENGTH:
+        raise ValueError(f"Template must be at most {MAX_TEMPLATE_LENGTH} characters")
+    try:
+        parsed = list(Formatter().parse(source))
+    except ValueError as e:
+        raise ValueError(f"Invalid template syntax: {e}") from None
+
+    segments = []
+    for literal, placeholder, format_spec, conversion in parsed:
+        if placeholder is not None:
+            if placeholder not in PLACEHOLDERS:
+                raise ValueError(f"Unknown placeholder '{{{placeholder}}}'")
+            if format_spec or conversion:
+                raise ValueError(f"Placeholder '{{{placeholder}}}' cannot use format specs or conversions")
+        segments.append((literal, placeholder))
+    if not any(placeholder == "base_prompt" for _, placeholder in segments):
+        raise ValueError("Template must include the {base_prompt} placeholder")
+    return tuple(segments)
+
+
+def _breed_values(breed_data, emphasis_level):
+    """Placeholder values for one breed and emphasis level (everything but base_prompt)"""
+    values = {
+        "breed_name": breed_data["name"],
+        "breed_group": breed_data["group"],
+        "visual_essence": breed_data["visual_essence"],
+        "scale": breed_data["scale"],
+        "color_palette": ", ".join(breed_data["color_palette"]),
+        "emphasis_level": emphasis_level,
+        "emphasis_guidance": EMPHASIS_GUIDANCE.get(emphasis_level, ""),
+    }
+    for category, fields in CATEGORY_FIELDS.items():
+        for field in fields:
+            values[f"{category}.{field}"] = breed_data[category][field]
+    return values
+
+
+class SynthesisTemplate:
+    """A validated template, pre-split into literal and placeholder segments"""
+
+    def __init__(self, name, source, description="", builtin=False):
+        self.name = name
+        self.source = source
+        self.description = description
+        self.builtin = builtin
+        self._segments = _parse(source)
+
+    def placeholders(self):
+        """Distinct placeholders in order of first use"""
+        return list(dict.fromkeys(p for _, p in self._segments if p is not None))
+
+    def prerender(self, breed_data, emphasis_level):
+        """Fill every placeholder except base_prompt; returns the chunks between base prompts"""
+        values = _breed_values(breed_data, emphasis_level)
+        chunks = []
+        current = []
+        for literal, placeholder in self._segments:
+            current.append(literal)
+            if placeholder == "base_prompt":
+                chunks.append("".join(current))
+                current = []
+            elif placeholder is not None:
+                current.append(values[placeholder])
+        chunks.append("".join(current))
+        return tuple(chunks)
+
+    def render(self, breed_data, emphasis_level, base_prompt):
+        return base_prompt.join(self.prerender(breed_data, emphasis_level))
+
+
+_templates = {
+    "prose": SynthesisTemplate(
+        "prose", PROSE_TEMPLATE,
+        "Prose instructions for instruction-following image models", builtin=True
+    ),
+    "tags": SynthesisTemplate(
+        "tags", TAGS_TEMPLATE,
+        "Comma-separated tag list for Stable Diffusion-style models", builtin=True
+    ),
+}
+_lock = threading.Lock()
+
+# (template name, breed name, emphasis) -> (template, breed data, chunks);
+# the stored objects are compared by identity so a replaced template or
+# changed breed record is re-rendered rather than served stale. Only the
+# chunks are counted against the budget; the rest is shared.
+_prerendered = managed_cache(
+    "template_renders", max_entries=DEFAULT_RENDER_CACHE, sizeof=lambda entry: estimate_bytes(entry[2])
+)
+
+
+def get_template(name):
+    """Return a registered template, or None"""
+    return _templates.get(name)
+
+
+def get_template_names():
+    """Return sorted list of registered template names"""
+    return sorted(_templates)
+
+
+def register_template(name, source, description=""):
+    """
+    Validate, compile and register a template; built-in templates cannot be
+    replaced, and new names are refused once MAX_TEMPLATES are registered.
+    """
+    if not isinstance(name, str) or not _TEMPLATE_NAME.match(name):
+        raise ValueError("Template name must be 1-64 lowercase letters, digits, '_' or '-'")
+    template = SynthesisTemplate(name, source, description)
+    with _lock:
+        existing = _templates.get(name)
+        if existing is not None and existing.builtin:
+            raise ValueError(f"Cannot replace built-in template '{name}'")
+        if existing is None and sum(not t.builtin for t in _templates.values()) >= MAX_TEMPLATES:
+            raise ValueError(f"At most {MAX_TEMPLATES} templates can be registered; replace an existing one")
+        _templates[name] = template
+    return template
+
+
+def render_instruction(template_name, breed_data, emphasis_level, base_prompt):
+    """Render a registered template, reusing cached chunks for the (template, breed, emphasis)"""
+    template = _templates.get(template_name)
+    if template is None:
+        raise KeyError(template_name)
+
+    cache_key = (template_name, breed_data["name"], emphasis_level)
+    entry = _prerendered.get(cache_key, valid=lambda entry: entry[0] is template and entry[1] is breed_data)
+    if entry is not None:
+        current_span().set_attribute("template.cache_hit", True)
+        return base_prompt.join(entry[2])
+
+    current_span().set_attribute("template.cache_hit", False)
+    chunks = template.prerender(breed_data, emphasis_level)
+    _prerendered.put(cache_key, (template, breed_data, chunks))
+    return base_prompt.join(chunks)
+
+
+def clear_render_cache():
+    _prerendered.clear()
@@ -0,0 +1,256 @@
+"""
+Per-tenant custom breed registries.
+
+Custom breeds are persisted in a local SQLite file, one row per
+(tenant, breed), kept in the data directory unless configured otherwise.
+A tenant's breeds are loaded into memory as a registry (a plain
+database dict) the first time they are needed. Only recently used registries stay loaded: an LRU
+evicts the least recently used tenants once the estimated size of all
+loaded registries exceeds a configurable byte cap. The process-wide
+store's registries also count against the global cache budget.
+
+Lookups fall through tenant registry -> built-in database.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from dog_breed_aesthetics_mcp.attributes import CATEGORY_FIELDS
+from dog_breed_aesthetics_mcp.breed_data import get_breed_data
+from dog_breed_aesthetics_mcp.cache import Cache, estimate_bytes, get_cache_manager
+
+DATA_DIR_NAME = "dog-breed-aesthetics-mcp"
+DEFAULT_TENANT_DB = "custom_breeds.sqlite3"
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+MAX_TENANT_ID_LENGTH = 128
+
+REQUIRED_FIELDS = (
+    "name", "group", "proportions", "coat", "movement",
+    "temperament_aesthetic", "color_palette", "scale", "visual_essence"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS custom_breeds (
+    tenant_id TEXT NOT NULL,
+    breed_key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (tenant_id, breed_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS custom_breeds_by_update
+    ON custom_breeds (tenant_id, updated_at);
+"""
+
+
+def data_dir():
+    """
+    Directory for persistent server data: DOG_BREED_DATA_DIR, else
+    $XDG_DATA_HOME/dog-breed-aesthetics-mcp (~/.local/share by default),
+    so the server's files do not depend on its working directory.
+    """
+    configured = os.environ.get("DOG_BREED_DATA_DIR")
+    if configured:
+        return os.path.abspath(configured)
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, DATA_DIR_NAME)
+
+
+def default_tenant_db():
+    """DOG_BREED_TENANT_DB, else DEFAULT_TENANT_DB inside data_dir()"""
+    return os.environ.get("DOG_BREED_TENANT_DB") or os.path.join(data_dir(), DEFAULT_TENANT_DB)
+
+
+def validate_tenant_id(tenant_id):
+    """Raise ValueError unless tenant_id is a short non-empty string"""
+    if not isinstance(tenant_id, str) or not tenant_id.strip():
+        raise ValueError("tenant_id must be a non-empty string")
+    if len(tenant_id) > MAX_TENANT_ID_LENGTH:
+        raise ValueError(f"tenant_id must be at most {MAX_TENANT_ID_LENGTH} characters")
+
+
+def validate_breed(breed_data):
+    """Raise ValueError unless breed_data follows the BREED_DATABASE schema"""
+    missing = [field for field in REQUIRED_FIELDS if field not in breed_data]
+    if missing:
+        raise ValueError("Custom breed is missing fields: " + ", ".join(missing))
+    for field in ("name", "group", "scale", "visual_essence"):
+        if not isinstance(breed_data[field], str) or not breed_data[field].strip():
+            raise ValueError(f"'{field}' must be a non-empty string")
+    palette = breed_data["color_palette"]
+    if not isinstance(palette, list) or not palette or not all(isinstance(c, str) for c in palette):
+        raise ValueError("'color_palette' must be a non-empty list of strings")
+    for category, fields in CATEGORY_FIELDS.items():
+        values = breed_data[category]
+        if not isinstance(values, dict) or set(values) != set(fields):
+            raise ValueError(f"'{category}' must have exactly the fields: " + ", ".join(fields))
+        if not all(isinstance(value, str) and value.strip() for value in values.values()):
+            raise ValueError(f"'{category}' values must be non-empty strings")
+
+
+def merge_breed(breed_data, changes):
+    """Apply partial changes to a breed; nested categories merge per field"""
+    merged = dict(breed_data)
+    for field, value in changes.items():
+        if isinstance(value, dict) and isinstance(merged.get(field), dict):
+            merged[field] = {**merged[field], **value}
+        else:
+            merged[field] = value
+    return merged
+
+
+class TenantRegistry:
+    """One tenant's custom breeds loaded in memory"""
+
+    def __init__(self, tenant_id, database):
+        self.tenant_id = tenant_id
+        self.database = database
+        self.nbytes = estimate_bytes(database)
+
+
+class TenantStore:
+    """SQLite-backed custom breeds with an LRU of loaded tenant registries"""
+
+    def __init__(self, path=None, max_bytes=DEFAULT_CACHE_BYTES):
+        if path is None:
+            path = default_tenant_db()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        # Evicts least recently used tenants, but always keeps the one just loaded
+        self.registries = Cache("tenant_registries", max_bytes=max_bytes, sizeof=lambda registry: registry.nbytes)
+        self.loads = 0
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+            self.registries.clear()
+            if self.registries.manager is not None:
+                self.registries.manager.unregister(self.registries)
+
+    # Persistence
+
+    def _write(self, tenant_id, breed_key, breed_data):
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO custom_breeds (tenant_id, breed_key, data, updated_at)"
+                " VALUES (?, ?, ?, ?)",
+                (tenant_id, breed_key, json.dumps(breed_data), time.time()),
+            )
+        self._unload(tenant_id)
+
+    def register(self, tenant_id, breed_key, breed_data):
+        """Create or replace a tenant's custom breed"""
+        validate_tenant_id(tenant_id)
+        validate_breed(breed_data)
+        with self._lock:
+            self._write(tenant_id, breed_key, breed_data)
+
+    def update(self, tenant_id, breed_key, changes):
+        """Apply partial changes to an existing custom breed; returns the updated breed"""
+        validate_tenant_id(tenant_id)
+        with self._lock:
+            current = self.get(tenant_id, breed_key)
+            if current is None:
+                raise KeyError(breed_key)
+            updated = merge_breed(current, changes)
+            validate_breed(updated)
+            self._write(tenant_id, breed_key, updated)
+            return updated
+
+    def delete(self, tenant_id, breed_key):
+        """Delete a custom breed; returns False if it did not exist"""
+        validate_tenant_id(tenant_id)
+        with self._lock:
+            with self._connection:
+                cursor = self._connection.execute(
+                    "DELETE FROM custom_breeds WHERE tenant_id = ? AND breed_key = ?",
+                    (tenant_id, breed_key),
+                )
+            self._unload(tenant_id)
+            return cursor.rowcount > 0
+
+    # Loaded registries
+
+    def _unload(self, tenant_id):
+        self.registries.pop(tenant_id)
+
+    def registry(self, tenant_id):
+        """Return the tenant's loaded registry, reading it from SQLite if needed"""
+        with self._lock:
+            registry = self.registries.get(tenant_id)
+            if registry is not None:
+                return registry
+
+            rows = self._connection.execute(
+                "SELECT breed_key, data FROM custom_breeds WHERE tenant_id = ?",
+                (tenant_id,),
+            ).fetchall()
+            registry = TenantRegistry(tenant_id, {key: json.loads(data) for key, data in rows})
+            self.loads += 1
+            self.registries.put(tenant_id, registry)
+            return registry
+
+    def get(self, tenant_id, breed_key):
+        """Return a tenant's custom breed, or None"""
+        return self.registry(tenant_id).database.get(breed_key)
+
+    def lookup(self, tenant_id, breed_key):
+        """Resolve a breed for a tenant: custom breed first, then the built-in data"""
+        if tenant_id:
+            breed_data = self.get(tenant_id, breed_key)
+            if breed_data is not None:
+                return breed_data
+        return get_breed_data(breed_key)
+
+    def stats(self):
+        """Loaded-registry counters for introspection"""
+        with self._lock:
+            return {
+                "loaded_tenants": len(self.registries),
+                "loaded_bytes": self.registries.nbytes,
+                "max_bytes": self.registries.max_bytes,
+                "loads": self.loads,
+                "evictions": self.registries.evictions,
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_tenant_store():
+    """
+    Return the process-wide tenant store, opening it on first use.
+
+    DOG_BREED_TENANT_DB sets the SQLite path (default: see
+    default_tenant_db) and DOG_BREED_TENANT_CACHE_BYTES the memory cap for
+    loaded registries.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TenantStore(
+                default_tenant_db(),
+                int(os.environ.get("DOG_BREED_TENANT_CACHE_BYTES", DEFAULT_CACHE_BYTES)),
+            )
+            get_cache_manager().register(_store.registries)
+        return _store
+
+
+def set_tenant_store(store):
+    """Replace the process-wide tenant store (e.g. with a scratch one); returns the previous store"""
+    global _store
+    with _store_lock:
+        previous, _store = _store, store
+        if previous is not None:
+            get_cache_manager().unregister(previous.registries)
+        if store is not None:
+            get_cache_manager().register(store.registries)
+        return previous
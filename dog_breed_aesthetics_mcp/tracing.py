@@ -0,0 +1,255 @@
+"""
+Tracing spans around tool dispatch and the stages inside each tool.
+
+Every tool call gets a "tool.dispatch" span (opened by TracingMiddleware)
+with children for the tool body ("tool.body", from the @traced
+decorator), the stages the tool marks itself ("lookup", "render",
+"query", ...) and "serialize": the time between the body returning and
+FastMCP handing back the encoded result, with the response size.
+
+Spans can go to two places:
+
+- "otel": the OpenTelemetry API, for hosts that configure an SDK tracer
+  provider and exporter themselves. Spans nest under FastMCP's own
+  "tools/call" spans.
+- "console" or a file path: a built-in recorder that writes one JSON
+  object per finished span, in the same layout as the OpenTelemetry SDK's
+  ConsoleSpanExporter, to stderr or the file. No SDK or collector needed.
+
+When tracing is off, span() returns a shared no-op span and the
+middleware is not installed.
+"""
+
+import functools
+import json
+import random
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from fastmcp.server.middleware import Middleware
+
+SERVICE_NAME = "dog-breed-aesthetics"
+
+_mode = None
+_exporter = None
+_otel_tracer = None
+_middleware = None
+_random = random.Random()
+
+_current_span = ContextVar("dog_breed_current_span", default=None)
+# Per-call mutable slot the @traced body writes its end time into, so the
+# middleware can time serialization on the event loop thread
+_call_timing = ContextVar("dog_breed_call_timing", default=None)
+
+
+class _NoOpSpan:
+    """Span stand-in used while tracing is off"""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NOOP_SPAN = _NoOpSpan()
+
+
+def _iso(time_ns):
+    return datetime.fromtimestamp(time_ns / 1e9, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class LocalSpan:
+    """A span recorded by the built-in exporter"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns",
+                 "attributes", "error", "_token")
+
+    def __init__(self, name, attributes=None, start_ns=None, parent=None):
+        parent = parent if parent is not None else _current_span.get()
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else _random.getrandbits(128)
+        self.span_id = _random.getrandbits(64)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.error = None
+        self._token = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def end(self, end_ns=None):
+        self.end_ns = end_ns if end_ns is not None else time.time_ns()
+        if _exporter is not None:
+            _exporter.export(self)
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.error = exc
+            self.attributes["error.type"] = exc_type.__qualname__
+        self.end()
+        return False
+
+    def to_dict(self):
+        """The span in OpenTelemetry SDK ReadableSpan.to_json() layout"""
+        status = {"status_code": "UNSET"}
+        if self.error is not None:
+            status = {"status_code": "ERROR", "description": str(self.error)}
+        return {
+            "name": self.name,
+            "context": {
+                "trace_id": f"0x{self.trace_id:032x}",
+                "span_id": f"0x{self.span_id:016x}",
+                "trace_state": "[]",
+            },
+            "kind": "SpanKind.INTERNAL",
+            "parent_id": f"0x{self.parent_id:016x}" if self.parent_id is not None else None,
+            "start_time": _iso(self.start_ns),
+            "end_time": _iso(self.end_ns),
+            "status": status,
+            "attributes": self.attributes,
+            "events": [],
+            "links": [],
+            "resource": {"attributes": {"service.name": SERVICE_NAME}, "schema_url": ""},
+        }
+
+
+class JsonLinesExporter:
+    """Writes finished spans as one JSON object per line"""
+
+    def __init__(self, stream, close_stream=False):
+        self.stream = stream
+        self.close_stream = close_stream
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def close(self):
+        if self.close_stream:
+            self.stream.close()
+
+
+def tracing_mode():
+    """Return "otel", "local" or None when tracing is off"""
+    return _mode
+
+
+def configure_tracing(target, server=None):
+    """
+    Turn tracing on or off.
+
+    target is "otel", "console" (JSON lines on stderr), a file path to
+    append JSON lines to, or None/"" to disable. When a FastMCP server is
+    given, the dispatch middleware is added to or removed from it.
+    """
+    global _mode, _exporter, _otel_tracer, _middleware
+    if _exporter is not None:
+        _exporter.close()
+    _mode = _exporter = _otel_tracer = None
+
+    if target == "otel":
+        from opentelemetry import trace
+
+        _otel_tracer = trace.get_tracer("dog_breed_aesthetics_mcp")
+        _mode = "otel"
+    elif target == "console":
+        _exporter = JsonLinesExporter(sys.stderr)
+        _mode = "local"
+    elif target:
+        _exporter = JsonLinesExporter(open(target, "a"), close_stream=True)
+        _mode = "local"
+
+    if server is not None:
+        if _mode is None and _middleware is not None:
+            if _middleware in server.middleware:
+                server.middleware.remove(_middleware)
+            _middleware = None
+        elif _mode is not None and _middleware is None:
+            _middleware = TracingMiddleware()
+            server.add_middleware(_middleware)
+
+
+def span(name, attributes=None):
+    """Context manager for a child span of the current span"""
+    if _mode is None:
+        return NOOP_SPAN
+    if _mode == "otel":
+        return _otel_tracer.start_as_current_span(name, attributes=attributes)
+    return LocalSpan(name, attributes)
+
+
+def current_span():
+    """The innermost active span, for adding attributes (a no-op span when there is none)"""
+    if _mode is None:
+        return NOOP_SPAN
+    if _mode == "otel":
+        from opentelemetry import trace
+
+        return trace.get_current_span()
+    return _current_span.get() or NOOP_SPAN
+
+
+def record_span(name, start_ns, end_ns, attributes=None):
+    """Record an already finished span under the current span"""
+    if _mode == "otel":
+        _otel_tracer.start_span(name, attributes=attributes, start_time=start_ns).end(end_time=end_ns)
+    elif _mode == "local":
+        LocalSpan(name, attributes, start_ns=start_ns).end(end_ns)
+
+
+def traced(fn):
+    """Wrap a tool function in a "tool.body" span and note when the body returns"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _mode is None:
+            return fn(*args, **kwargs)
+        try:
+            with span("tool.body", {"mcp.tool.name": fn.__name__}):
+                return fn(*args, **kwargs)
+        finally:
+            timing = _call_timing.get()
+            if timing is not None:
+                timing.append(time.time_ns())
+    return wrapper
+
+
+def _response_bytes(result):
+    return sum(len(block.text.encode()) for block in result.content if hasattr(block, "text"))
+
+
+class TracingMiddleware(Middleware):
+    """Opens the per-call dispatch span and times result serialization"""
+
+    async def on_call_tool(self, context, call_next):
+        if _mode is None:
+            return await call_next(context)
+        tool_name = context.message.name
+        with span("tool.dispatch", {"mcp.tool.name": tool_name}) as dispatch:
+            timing = []
+            token = _call_timing.set(timing)
+            try:
+                result = await call_next(context)
+            finally:
+                _call_timing.reset(token)
+            response_bytes = _response_bytes(result)
+            dispatch.set_attribute("response.bytes", response_bytes)
+            if timing:
+                record_span("serialize", timing[-1], time.time_ns(), {"response.bytes": response_bytes})
+            return result
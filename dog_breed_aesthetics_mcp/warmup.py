@@ -0,0 +1,189 @@
+"""
+Startup warmup and readiness.
+
+Everything the tools derive from the breed database is built lazily, so
+the first calls after a deploy pay for index construction and cache
+fills. Warmup does that work up front:
+
+- builds the derived indexes (term bitmasks, feature columns, catalog
+  ordering, scoring word statistics, diversity masks, ranked breed
+  tags); a snapshot primes all of these, so they cost little
+- resolves every variant view
+- hashes the catalog for the change log
+- prerenders each registered synthesis template and compiles each
+  output format at every emphasis level for the most-requested breeds
+
+The most-requested breeds come from a call recording (see
+dog_breed_aesthetics_mcp.recording) when one is available, topped up
+from the catalog order. A Warmup runs once, in the foreground or in a
+background thread, and reports whether it has finished so HTTP
+deployments can keep load balancers away until it has.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+
+from dog_breed_aesthetics_mcp.attributes import get_term_index
+from dog_breed_aesthetics_mcp.breed_data import get_breed_data, get_variant_keys, normalize_breed_name
+from dog_breed_aesthetics_mcp.catalog import get_catalog_index
+from dog_breed_aesthetics_mcp.changelog import get_change_log
+from dog_breed_aesthetics_mcp.compilers import compile_breed, get_compiler_names, get_tag_index
+from dog_breed_aesthetics_mcp.diversity import get_diversity_index
+from dog_breed_aesthetics_mcp.features import get_feature_table
+from dog_breed_aesthetics_mcp.recording import iter_recording
+from dog_breed_aesthetics_mcp.scoring import get_word_statistics
+from dog_breed_aesthetics_mcp.templates import EMPHASIS_GUIDANCE, get_template_names, render_instruction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WARM_BREEDS = 50
+
+# Tool arguments that name breeds
+_BREED_ARGUMENTS = ("breed_name", "start_breed", "end_breed")
+
+
+def count_requested_breeds(records):
+    """Count breed keys named in recorded tool calls"""
+    counts = Counter()
+    for record in records:
+        args = record.get("args")
+        if not isinstance(args, dict):
+            continue
+        names = [args.get(argument) for argument in _BREED_ARGUMENTS]
+        if isinstance(args.get("breed_names"), list):
+            names.extend(args["breed_names"])
+        for name in names:
+            if isinstance(name, str):
+                counts[normalize_breed_name(name)] += 1
+    return counts
+
+
+def most_requested_breeds(limit=DEFAULT_WARM_BREEDS, stats_path=None):
+    """
+    Return up to `limit` breed keys to warm, most requested first.
+
+    Keys come from the recording at stats_path if it can be read; breeds
+    it does not name (or all of them, without a recording) follow in
+    catalog order. Names that do not resolve to a breed are skipped.
+    """
+    keys = []
+    if stats_path:
+        try:
+            counts = count_requested_breeds(iter_recording(stats_path))
+        except OSError as e:
+            logger.warning("Cannot read warmup stats %s (%s); using catalog order", stats_path, e)
+            counts = Counter()
+        keys = [key for key, _ in counts.most_common() if get_breed_data(key) is not None]
+    if len(keys) < limit:
+        seen = set(keys)
+        for entry in get_catalog_index().order:
+            if len(keys) >= limit:
+                break
+            if entry[3] not in seen:
+                keys.append(entry[3])
+    return keys[:limit]
+
+
+def warm_caches(breed_keys):
+    """Build the derived indexes and prerender templates and prompts for breed_keys; returns counts"""
+    get_term_index()
+    get_feature_table()
+    get_catalog_index()
+    get_word_statistics()
+    get_diversity_index()
+    get_tag_index()
+    variants = sum(get_breed_data(key) is not None for key in get_variant_keys())
+    get_change_log().sync()
+
+    templates = get_template_names()
+    output_formats = get_compiler_names()
+    prerendered = 0
+    compiled = 0
+    for key in breed_keys:
+        breed_data = get_breed_data(key)
+        if breed_data is None:
+            continue
+        for emphasis_level in EMPHASIS_GUIDANCE:
+            for template in templates:
+                render_instruction(template, breed_data, emphasis_level, "")
+                prerendered += 1
+            for output_format in output_formats:
+                compile_breed(output_format, key, breed_data, emphasis_level)
+                compiled += 1
+    return {"breeds": len(breed_keys), "variants": variants, "prerendered": prerendered, "compiled": compiled}
+
+
+class Warmup:
+    """Runs the startup warmup once and tracks whether the instance is ready"""
+
+    def __init__(self, breed_count=DEFAULT_WARM_BREEDS, stats_path=None, enabled=True):
+        self.breed_count = breed_count
+        self.stats_path = stats_path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._started = False
+        self.state = "pending"
+        self.seconds = None
+        self.warmed = None
+        self.error = None
+        if not enabled:
+            self.state = "ready"
+            self._done.set()
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    def _claim(self):
+        with self._lock:
+            if self._started or not self.enabled:
+                return False
+            self._started = True
+            self.state = "warming"
+            return True
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            self.warmed = warm_caches(most_requested_breeds(self.breed_count, self.stats_path))
+            self.state = "ready"
+        except Exception as e:
+            logger.exception("Warmup failed")
+            self.error = str(e)
+            self.state = "failed"
+        finally:
+            self.seconds = round(time.perf_counter() - start, 3)
+            self._done.set()
+        if self.ready:
+            logger.info("Warmup finished in %.3fs: %s", self.seconds, self.warmed)
+
+    def run(self):
+        """Warm up in the calling thread; returns once warmup has finished (here or elsewhere)"""
+        if self._claim():
+            self._run()
+        self._done.wait()
+        return self.ready
+
+    def start(self):
+        """Warm up in a background thread, so the server can answer health checks meanwhile"""
+        if self._claim():
+            threading.Thread(target=self._run, name="warmup", daemon=True).start()
+
+    def wait(self, timeout=None):
+        """Block until warmup has finished; returns whether the instance is ready"""
+        self._done.wait(timeout)
+        return self.ready
+
+    def status(self):
+        """Readiness report for health endpoints"""
+        status = {"ready": self.ready, "state": self.state}
+        if self.seconds is not None:
+            status["seconds"] = self.seconds
+        if self.warmed is not None:
+            status["warmed"] = self.warmed
+        if self.error is not None:
+            status["error"] = self.error
+        return status
@@ -15,6 +15,33 @@ else
     echo "pytest not available, running Python tests directly..."
     python -m tests.test_breed_data
     python -m tests.test_server_tools
+    python -m tests.test_interpolation
+    python -m tests.test_comparison
+    python -m tests.test_features
+    python -m tests.test_catalog
+    python -m tests.test_synthetic
+    python -m tests.test_snapshot
+    python -m tests.test_phrase_store
+    python -m tests.test_variants
+    python -m tests.test_tenants
+    python -m tests.test_templates
+    python -m tests.test_scoring
+    python -m tests.test_profiling
+    python -m tests.test_tracing
+    python -m tests.test_recording
+    python -m tests.test_replay
+    python -m tests.test_admission
+    python -m tests.test_models
+    python -m tests.test_encoding
+    python -m tests.test_compression
+    python -m tests.test_memory_budget
+    python -m tests.test_warmup
+    python -m tests.test_cache
+    python -m tests.test_export
+    python -m tests.test_changelog
+    python -m tests.test_diversity
+    python -m tests.test_sampling
+    python -m tests.test_compilers
 fi
 
 echo ""
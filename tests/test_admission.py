@@ -0,0 +1,158 @@
+"""
+Tests for admission module
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import Client
+from dog_breed_aesthetics_mcp import admission, server
+from dog_breed_aesthetics_mcp.admission import (
+    MAX_CLIENTS_PER_PEER,
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRejected,
+    TokenBucket,
+    client_key,
+    forwarded_client
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refill():
+    """Test bursts are allowed and the wait reflects the refill rate"""
+    bucket = TokenBucket(rate=2.0, burst=2, now=0.0)
+    assert bucket.take(0.0) == 0.0
+    assert bucket.take(0.0) == 0.0
+    assert bucket.take(0.0) == pytest.approx(0.5)
+    assert bucket.take(0.25) == pytest.approx(0.25)
+    assert bucket.take(0.5) == 0.0
+
+
+def test_clients_are_keyed_on_their_peer(monkeypatch):
+    """Test the peer address decides the key, and client ids only pick a bucket under it"""
+    headers = {}
+    monkeypatch.setattr(admission, "get_http_headers", lambda: headers)
+    monkeypatch.setattr(admission, "get_http_request", lambda: SimpleNamespace(client=SimpleNamespace(host="10.0.0.5")))
+    context = SimpleNamespace(fastmcp_context=None)
+
+    assert client_key(context) == "10.0.0.5"
+    keys = set()
+    for i in range(200):
+        headers["x-client-id"] = f"client-{i}"
+        keys.add(client_key(context))
+    assert len(keys) == MAX_CLIENTS_PER_PEER
+    assert all(key.startswith("10.0.0.5#") for key in keys)
+
+    # X-Forwarded-For counts only from a trusted proxy
+    headers = {"x-forwarded-for": "203.0.113.9, 10.0.0.2"}
+    assert client_key(context) == "10.0.0.5"
+    assert client_key(context, frozenset({"10.0.0.5", "10.0.0.2"})) == "203.0.113.9"
+
+
+def test_forwarded_client_skips_trusted_hops():
+    """Test the rightmost untrusted X-Forwarded-For entry is the client"""
+    trusted = frozenset({"10.0.0.1", "10.0.0.2"})
+    assert forwarded_client("10.0.0.1", "198.51.100.1, 203.0.113.9, 10.0.0.2", trusted) == "203.0.113.9"
+    assert forwarded_client("10.0.0.1", "10.0.0.2", trusted) == "10.0.0.2"
+    assert forwarded_client("10.0.0.1", None, trusted) == "10.0.0.1"
+    assert forwarded_client("192.0.2.7", "203.0.113.9", trusted) == "192.0.2.7"
+
+
+def test_rate_limits_are_per_client():
+    """Test one client hitting its limit does not affect another"""
+    clock = FakeClock()
+    controller = AdmissionController(rate=1.0, burst=2, clock=clock)
+    controller.check_rate("a")
+    controller.check_rate("a")
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.check_rate("a")
+    assert rejected.value.retry_after == pytest.approx(1.0)
+    assert "retry after 1.00 s" in str(rejected.value)
+    controller.check_rate("b")
+    clock.now = 1.0
+    controller.check_rate("a")
+    assert controller.metrics()["rejected_rate_limited"] == 1
+
+
+def test_concurrency_cap_and_bounded_queue():
+    """Test calls beyond the cap queue in order and a full queue rejects fast"""
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=1.0)
+        await controller.acquire()
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.metrics()["waiting"] == 1
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()
+        controller.release()
+        await queued
+        metrics = controller.metrics()
+        assert metrics["active"] == 1 and metrics["waiting"] == 0
+        controller.release()
+        return controller.metrics()
+
+    metrics = asyncio.run(run())
+    assert metrics["active"] == 0
+    assert metrics["queued"] == 1
+    assert metrics["rejected_queue_full"] == 1
+
+
+def test_queue_timeout():
+    """Test a queued call is rejected after the timeout and leaves the queue"""
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queue=5, queue_timeout=0.02)
+        await controller.acquire()
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()
+        return controller.metrics()
+
+    metrics = asyncio.run(run())
+    assert metrics["rejected_queue_timeout"] == 1
+    assert metrics["waiting"] == 0
+    assert metrics["active"] == 1
+
+
+def test_middleware_rejects_flooding_client_only():
+    """Test a flooding client gets retry-after errors while another client is served"""
+    controller = AdmissionController(rate=0.01, burst=3)
+    middleware = AdmissionMiddleware(controller, exempt_tools={"get_admission_metrics"})
+    server.mcp.add_middleware(middleware)
+    try:
+        async def run():
+            async with Client(server.mcp) as flooding, Client(server.mcp) as other:
+                results = [
+                    await flooding.call_tool_mcp(
+                        "get_breed_characteristics", {"breed_name": "Pug"}, meta={"client_id": "flooding"}
+                    )
+                    for _ in range(5)
+                ]
+                other_result = await other.call_tool_mcp(
+                    "get_breed_characteristics", {"breed_name": "Pug"}, meta={"client_id": "other"}
+                )
+                exempt = [
+                    await flooding.call_tool_mcp("get_admission_metrics", {}, meta={"client_id": "flooding"})
+                    for _ in range(5)
+                ]
+                return results, other_result, exempt
+        results, other_result, exempt = asyncio.run(run())
+    finally:
+        server.mcp.middleware.remove(middleware)
+
+    assert [result.is_error for result in results] == [False, False, False, True, True]
+    assert "retry after" in results[3].content[0].text
+    assert not other_result.is_error
+    assert not any(result.is_error for result in exempt)
+    assert controller.metrics()["admitted"] == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""
+Tests for cache module
+"""
+
+import pytest
+from dog_breed_aesthetics_mcp import server, templates
+from dog_breed_aesthetics_mcp.cache import Cache, CacheManager
+
+
+def test_cache_caps_evict_least_recently_used():
+    """Test entry and byte caps evict the LRU entry but keep the one just stored"""
+    cache = Cache("test", max_entries=2, sizeof=len)
+    cache.put("a", "x")
+    cache.put("b", "x")
+    cache.get("a")
+    cache.put("c", "x")
+    assert list(cache) == ["a", "c"]
+
+    sized = Cache("sized", max_bytes=10, sizeof=len)
+    sized.put("small", "xxxx")
+    sized.put("huge", "x" * 50)
+    assert list(sized) == ["huge"]
+    assert sized.stats()["evictions"] == 1
+
+    sized.resize(max_bytes=5)
+    assert len(sized) == 0 and sized.nbytes == 0
+
+
+def test_cache_counts_hits_and_stale_misses():
+    """Test hit rate, with values rejected by `valid` counted as misses"""
+    cache = Cache("test")
+    cache.put("k", 1)
+    assert cache.get("k") == 1
+    assert cache.get("k", valid=lambda value: value == 2) is None
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 2, 0.3333)
+
+
+def test_manager_evicts_oldest_entry_across_caches():
+    """Test the global budget evicts whichever cache holds the least recently used entry"""
+    manager = CacheManager(max_bytes=30)
+    renders = manager.register(Cache("renders", sizeof=len))
+    tenants = manager.register(Cache("tenants", sizeof=len))
+    renders.put("old", "x" * 10)
+    tenants.put("a", "x" * 10)
+    renders.put("new", "x" * 10)
+    renders.get("old")
+    tenants.put("b", "x" * 10)
+
+    assert list(renders) == ["new", "old"]
+    assert list(tenants) == ["b"]
+    assert manager.total_bytes() == 30
+
+    manager.resize(15)
+    assert manager.total_bytes() == 10
+    assert manager.stats()["caches"]["renders"]["evictions"] == 2
+
+
+def test_manager_replaces_cache_registered_under_same_name():
+    """Test a new cache of the same name (e.g. a new active database) takes over the slot"""
+    manager = CacheManager(max_bytes=10)
+    first = manager.register(Cache("decoded", sizeof=len))
+    second = manager.register(Cache("decoded", sizeof=len))
+    assert manager.get("decoded") is second and first.manager is None
+
+    first.put("k", "x" * 50)
+    assert manager.total_bytes() == 0
+    manager.unregister(first)
+    assert manager.names() == ["decoded"]
+
+
+def test_admin_tools_report_and_resize_caches():
+    """Test the cache tools list the package caches and resize, clear and validate"""
+    server.enhance_with_breed_aesthetic("Pug", "a lighthouse")
+    stats = server.get_cache_stats()
+    assert {"template_renders", "variant_views"} <= set(stats["caches"])
+    assert stats["total_bytes"] == sum(cache["bytes"] for cache in stats["caches"].values())
+
+    try:
+        stats = server.configure_caches("template_renders", max_entries=1)
+        assert stats["caches"]["template_renders"]["entries"] <= 1
+        stats = server.configure_caches("template_renders", clear=True)
+        assert stats["caches"]["template_renders"]["entries"] == 0
+    finally:
+        server.configure_caches("template_renders", max_entries=templates.DEFAULT_RENDER_CACHE)
+
+    assert "not found" in server.configure_caches("nope", clear=True)["error"]
+    assert "error" in server.configure_caches(max_entries=10)
+    assert "error" in server.configure_caches(max_bytes=-1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
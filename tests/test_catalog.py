@@ -0,0 +1,71 @@
+"""
+Tests for catalog module
+"""
+
+import pytest
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE
+from dog_breed_aesthetics_mcp.catalog import CatalogIndex, decode_cursor
+
+
+def _all_pages(index, page_size, group=None):
+    keys, cursor = [], None
+    while True:
+        page, cursor, total = index.page(cursor, page_size, group)
+        keys.extend(page)
+        if cursor is None:
+            return keys, total
+
+
+def test_pages_cover_catalog_once():
+    """Test that paging visits every breed exactly once"""
+    index = CatalogIndex(BREED_DATABASE)
+    keys, total = _all_pages(index, 4)
+
+    assert total == len(BREED_DATABASE)
+    assert len(keys) == len(set(keys)) == len(BREED_DATABASE)
+
+
+def test_pages_ordered_by_group_then_name():
+    """Test the stable ordering of the listing"""
+    index = CatalogIndex(BREED_DATABASE)
+    keys, _ = _all_pages(index, 50)
+
+    assert BREED_DATABASE[keys[0]]["group"] == "Sporting"
+    assert BREED_DATABASE[keys[-1]]["group"] == "Herding"
+    hound = [k for k in keys if BREED_DATABASE[k]["group"] == "Hound"]
+    assert hound == ["afghan_hound", "basset_hound", "greyhound"]
+
+
+def test_group_filter():
+    """Test listing a single group, case-insensitively"""
+    index = CatalogIndex(BREED_DATABASE)
+    keys, total = _all_pages(index, 2, group="non-sporting")
+
+    assert total == 3
+    assert {BREED_DATABASE[k]["group"] for k in keys} == {"Non-Sporting"}
+    assert index.page(group="Unknown")[0] == []
+
+
+def test_cursor_survives_catalog_change():
+    """Test that a cursor resumes after the last breed seen when breeds are added"""
+    index = CatalogIndex(BREED_DATABASE)
+    first, cursor, _ = index.page(page_size=3)
+
+    extended = dict(BREED_DATABASE)
+    extended["aaa_retriever"] = dict(BREED_DATABASE["golden_retriever"], name="Aaa Retriever")
+    second, _, _ = CatalogIndex(extended).page(cursor, page_size=3)
+
+    assert "aaa_retriever" not in first + second
+    assert not set(first) & set(second)
+
+
+def test_invalid_cursor():
+    """Test that malformed cursors are rejected"""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        CatalogIndex(BREED_DATABASE).page("e30=")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,81 @@
+"""
+Tests for changelog module
+"""
+
+import pytest
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE, set_database
+from dog_breed_aesthetics_mcp.changelog import ChangeLog, parse_token
+
+
+def _edited(**changes):
+    """Copy of BREED_DATABASE with breeds replaced (None removes a breed)"""
+    database = dict(BREED_DATABASE)
+    for breed_key, breed_data in changes.items():
+        if breed_data is None:
+            del database[breed_key]
+        else:
+            database[breed_key] = breed_data
+    return database
+
+
+def test_changes_since_reports_added_modified_and_removed():
+    """Test each kind of change is reported once, against the version the client has"""
+    log = ChangeLog()
+    start, keys = log.snapshot()
+    assert "greyhound" in keys and "toy_poodle" in keys
+
+    pug = {**BREED_DATABASE["pug"], "visual_essence": "edited"}
+    try:
+        set_database(_edited(pug=pug, pointer=None, studio_pug={**pug, "name": "Studio Pug"}))
+        token, changes = log.changes_since(start)
+        assert changes == {"pug": "modified", "pointer": "removed", "studio_pug": "added"}
+        assert parse_token(token)[0] == 1
+
+        # The same catalog again is not a change
+        set_database(_edited(pug=pug, pointer=None, studio_pug={**pug, "name": "Studio Pug"}))
+        assert log.changes_since(token) == (token, {})
+    finally:
+        set_database(BREED_DATABASE)
+
+    # Reverting is one more version; its content matches the start
+    final, changes = log.changes_since(token)
+    assert changes == {"pug": "modified", "pointer": "added", "studio_pug": "removed"}
+    assert log.changes_since(start) == (final, {})
+
+
+def test_unknown_or_expired_versions_need_a_full_snapshot():
+    """Test tokens the log cannot diff from return None, and malformed ones raise"""
+    log = ChangeLog(max_changes=1)
+    start, _ = log.snapshot()
+    try:
+        set_database(_edited(pug=None))
+        middle, _ = log.snapshot()
+        set_database(_edited(pug=None, pointer=None))
+        assert log.changes_since(middle)[1] == {"pointer": "removed"}
+        assert log.changes_since(start)[1] is None
+    finally:
+        set_database(BREED_DATABASE)
+
+    assert log.changes_since("3-0123456789abcdef")[1] is None
+    with pytest.raises(ValueError):
+        log.changes_since("latest")
+    for token in ("3-0123456789abcdeg", "²-0123456789abcdef"):
+        with pytest.raises(ValueError, match="Malformed version token"):
+            parse_token(token)
+
+
+def test_tool_returns_changed_breeds_or_full_catalog():
+    """Test the tool sends the whole catalog first and then only changes"""
+    full = server.get_breed_changes_since()
+    assert full["full"] is True
+    assert {"key": "greyhound", **BREED_DATABASE["greyhound"]} in full["breeds"]
+
+    unchanged = server.get_breed_changes_since(full["version"])
+    assert unchanged == {"version": full["version"], "full": False, "added": [], "modified": [], "removed": []}
+    assert "error" in server.get_breed_changes_since("not-a-version")
+    assert "Malformed" in server.get_breed_changes_since("1-zzzzzzzzzzzzzzzz")["error"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,52 @@
+"""
+Tests for comparison module
+"""
+
+import pytest
+from dog_breed_aesthetics_mcp.attributes import TermIndex, get_term_index
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE
+from dog_breed_aesthetics_mcp.comparison import compare_breed_keys
+
+
+def test_term_index_covers_all_breeds():
+    """Test that every breed gets a mask for every category"""
+    index = get_term_index()
+    assert set(index.masks) == set(BREED_DATABASE)
+    for masks in index.masks.values():
+        assert all(mask > 0 for mask in masks.values())
+
+
+def test_term_index_decode_roundtrip():
+    """Test that decoding a breed mask recovers its terms"""
+    index = TermIndex(BREED_DATABASE)
+    entries = index.decode("color_palette", index.masks["golden_retriever"]["color_palette"])
+    assert [term for _, term in entries] == BREED_DATABASE["golden_retriever"]["color_palette"]
+
+
+def test_compare_shared_attributes():
+    """Test shared attributes between breeds with common terms"""
+    result = compare_breed_keys(["golden_retriever", "cocker_spaniel"])
+    assert "moderate length" in result["shared"]["proportions"]["legs"]
+    assert "golden" in result["shared"]["color_palette"]
+    assert 0 < result["overlap"]["proportions"] < 1
+
+
+def test_compare_distinguishing_attributes():
+    """Test that distinguishing attributes exclude terms held by any other breed"""
+    result = compare_breed_keys(["greyhound", "italian_greyhound", "bulldog"])
+    greyhound_coat = result["distinguishing"]["greyhound"]["coat"]
+    italian_coat = result["distinguishing"]["italian_greyhound"]["coat"]
+    for field, terms in greyhound_coat.items():
+        assert not set(terms) & set(italian_coat.get(field, []))
+    assert result["distinguishing"]["bulldog"]["scale"] == ["medium"]
+
+
+def test_compare_many_breeds():
+    """Test comparing every breed at once"""
+    result = compare_breed_keys(list(BREED_DATABASE))
+    assert len(result["distinguishing"]) == len(BREED_DATABASE)
+    assert result["shared"]["scale"] == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+"""
+Tests for compilers module
+"""
+
+import copy
+
+import pytest
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE, set_database
+from dog_breed_aesthetics_mcp.compilers import (
+    COMPILERS,
+    EMPHASIS_TAGS,
+    MAX_TAGS,
+    join_prompt,
+    negative_terms,
+    rank_tags,
+    weighted_tags
+)
+from dog_breed_aesthetics_mcp.tenants import TenantStore, set_tenant_store
+
+
+def test_rank_tags_and_weights():
+    """Test tags leave out dogs and the breed's name, and emphasis sets their count and weights"""
+    for breed_key, breed_data in BREED_DATABASE.items():
+        ranked = rank_tags(breed_data)
+        assert 0 < len(ranked) <= MAX_TAGS, breed_key
+        for tag, _ in ranked:
+            assert not {"dog", "hound", "puppy"} & set(tag.split()), (breed_key, tag)
+            assert breed_data["name"].lower() not in tag
+
+    ranked = rank_tags(BREED_DATABASE["greyhound"])
+    assert ranked[0][0] == "aerodynamic minimalism"
+    assert "close-fitting coat" in [tag for tag, _ in ranked]
+    for emphasis_level, (count, low, high) in EMPHASIS_TAGS.items():
+        weights = [weight for _, weight in weighted_tags(ranked, emphasis_level)]
+        assert len(weights) == count
+        assert weights[0] == high and weights[-1] == low and weights == sorted(weights, reverse=True)
+
+
+def test_negative_terms_oppose_the_breed():
+    """Test negatives push away from the breed's own size and coat, never against its tags"""
+    assert negative_terms(BREED_DATABASE["pomeranian"])[:2] == ("dog", "puppy")
+    assert "animal" not in negative_terms(BREED_DATABASE["pomeranian"])
+    assert "bulky" in negative_terms(BREED_DATABASE["pomeranian"])
+    assert "tiny" in negative_terms(BREED_DATABASE["great_dane"])
+    assert "shaggy" in negative_terms(BREED_DATABASE["greyhound"])
+    assert "dainty" not in negative_terms(BREED_DATABASE["great_dane"], [("dainty build", 1.0)])
+
+
+def test_formats_and_joining():
+    """Test each output format's syntax and how base prompts are joined"""
+    weighted = [("sleek coat", 1.25), ("lean build", 1.0)]
+    assert COMPILERS["sd"].format_tags(weighted) == "(sleek coat:1.25), lean build"
+    assert COMPILERS["plain"].format_tags(weighted) == "sleek coat, lean build"
+
+    ranked = rank_tags(BREED_DATABASE["greyhound"])
+    separator, chunk, negative_prompt, tags = COMPILERS["midjourney"].compile(ranked, ("dog", "tiny"), "subtle")
+    assert separator == "::3 " and chunk.endswith(" --no dog, tiny") and negative_prompt == "dog, tiny"
+    assert all(weight == 1.0 for _, weight in tags)
+
+    assert join_prompt("a harbour, ", ", ", "sleek coat") == "a harbour, sleek coat"
+    assert join_prompt("  ", "::2 ", "sleek coat") == "sleek coat"
+
+
+def test_tools_compile_single_and_batch(tmp_path):
+    """Test the batch tool matches the single one, edits are recompiled, and custom breeds use their own tags"""
+    single = server.compile_breed_prompt("Greyhound", "a quiet harbour", "strong", "sd")
+    assert single["prompt"].startswith("a quiet harbour, (aerodynamic minimalism:1.4)")
+    batch = server.compile_breed_prompts("Greyhound", ["a quiet harbour", "a city at night"], "strong", "sd")
+    assert batch["prompts"][0] == single["prompt"]
+    assert batch["prompts"][1].startswith("a city at night, (aerodynamic minimalism:1.4)")
+    assert batch["negative_prompt"] == single["negative_prompt"] and batch["tags"] == single["tags"]
+
+    edited = dict(BREED_DATABASE)
+    edited["greyhound"] = {**BREED_DATABASE["greyhound"], "visual_essence": "nocturnal shimmer"}
+    try:
+        set_database(edited)
+        assert "(nocturnal shimmer:1.4)" in server.compile_breed_prompt("Greyhound", "x", "strong")["prompt"]
+    finally:
+        set_database(BREED_DATABASE)
+
+    previous = set_tenant_store(TenantStore(str(tmp_path / "tenants.sqlite3")))
+    try:
+        custom = copy.deepcopy(BREED_DATABASE["pug"])
+        custom["name"] = "Greyhound"
+        custom["visual_essence"] = "velvet lanterns"
+        server.register_custom_breed("acme", "Greyhound", custom)
+        tags = [tag["tag"] for tag in server.compile_breed_prompt("Greyhound", "x", tenant_id="acme")["tags"]]
+        assert "velvet lanterns" in tags and "aerodynamic minimalism" not in tags
+    finally:
+        set_tenant_store(previous).close()
+
+    assert "error" in server.compile_breed_prompt("Unknown Breed", "x")
+    assert "available_formats" in server.compile_breed_prompt("Pug", "x", output_format="dalle")
+    assert "error" in server.compile_breed_prompts("Pug", ["x"] * 10001)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,104 @@
+"""
+Tests for compression module
+"""
+
+import gzip
+
+import pytest
+from starlette.testclient import TestClient
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.compression import CompressionMiddleware, GzipStream, add_vary, negotiate
+
+HEADERS = {"accept": "application/json, text/event-stream", "content-type": "application/json"}
+
+
+def _call_tool(client, name, arguments, accept_encoding):
+    """Initialize a session and call one tool, returning the raw HTTP response"""
+    init = client.post("/mcp", headers=HEADERS, json={
+        "jsonrpc": "2.0", "id": 1, "method": "initialize",
+        "params": {"protocolVersion": "2025-06-18", "capabilities": {}, "clientInfo": {"name": "t", "version": "1"}}
+    })
+    headers = {**HEADERS, "mcp-session-id": init.headers["mcp-session-id"], "mcp-protocol-version": "2025-06-18"}
+    client.post("/mcp", headers=headers, json={"jsonrpc": "2.0", "method": "notifications/initialized"})
+    return client.post("/mcp", headers={**headers, "accept-encoding": accept_encoding}, json={
+        "jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": name, "arguments": arguments}
+    })
+
+
+def test_negotiate_honours_preference_and_q_values():
+    """Test the server's preferred encoding wins among those the client accepts"""
+    assert negotiate("gzip, deflate, br", ["zstd", "gzip"]) == "gzip"
+    assert negotiate("gzip;q=1.0, zstd;q=0.5", ["zstd", "gzip"]) == "zstd"
+    assert negotiate("zstd;q=0, gzip", ["zstd", "gzip"]) == "gzip"
+    assert negotiate("*", ["gzip"]) == "gzip"
+    assert negotiate("identity", ["zstd", "gzip"]) is None
+    assert negotiate("gzip;q=0", ["gzip"]) is None
+
+
+def test_stream_flushes_decodable_chunks():
+    """Test each flushed chunk can be decoded as soon as it arrives"""
+    stream = GzipStream()
+    first = stream.compress(b"data: one\n\n", flush=True)
+    decoder = gzip.zlib.decompressobj(31)
+    assert decoder.decompress(first) == b"data: one\n\n"
+    rest = stream.compress(b"data: two\n\n", flush=True) + stream.finish()
+    assert decoder.decompress(rest) == b"data: two\n\n"
+
+
+def test_large_tool_result_is_compressed():
+    """Test a large catalog page comes back gzip-encoded and decodes to the same events"""
+    app = server.mcp.http_app(middleware=server._http_middleware())
+    with TestClient(app) as client:
+        response = _call_tool(client, "list_breeds_page", {"page_size": 200}, "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert b'"next_cursor"' in response.content  # decoded by the HTTP client
+        assert response.num_bytes_downloaded < len(response.content) / 2
+
+        identity = _call_tool(client, "list_breeds_page", {"page_size": 200}, "identity")
+        assert "content-encoding" not in identity.headers
+
+
+def test_small_responses_stay_uncompressed():
+    """Test responses under the size threshold are passed through"""
+    app = server.mcp.http_app(middleware=server._http_middleware())
+    with TestClient(app) as client:
+        response = _call_tool(client, "list_breeds_page", {"page_size": 1}, "gzip")
+        assert "content-encoding" not in response.headers
+        assert b'"breeds"' in response.content
+
+
+def test_vary_is_merged_into_an_existing_header():
+    """Test Accept-Encoding joins the app's own Vary header instead of adding a second one"""
+    assert add_vary([(b"vary", b"Origin")]) == [(b"vary", b"Origin, Accept-Encoding")]
+    assert add_vary([(b"Vary", b"origin, accept-encoding")]) == [(b"Vary", b"origin, accept-encoding")]
+    assert add_vary([(b"vary", b"*")]) == [(b"vary", b"*")]
+    assert add_vary([]) == [(b"vary", b"Accept-Encoding")]
+
+    async def app(scope, receive, send):
+        headers = [(b"content-type", b"application/json"), (b"vary", b"Origin")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"[" + b"1," * 2000 + b"1]"})
+
+    response = TestClient(CompressionMiddleware(app)).get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers.get_list("vary") == ["Origin, Accept-Encoding"]
+
+
+def test_vary_is_sent_without_accept_encoding():
+    """Test uncompressed responses to clients that accept no encoding still vary on Accept-Encoding"""
+    async def app(scope, receive, send):
+        content_type = b"image/png" if scope["path"].endswith(".png") else b"application/json"
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", content_type)]})
+        await send({"type": "http.response.body", "body": b"[" + b"1," * 2000 + b"1]"})
+
+    client = TestClient(CompressionMiddleware(app))
+    for accept_encoding in ("", "identity"):
+        response = client.get("/", headers={"Accept-Encoding": accept_encoding})
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+    assert "vary" not in client.get("/logo.png", headers={"Accept-Encoding": ""}).headers
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,76 @@
+"""
+Tests for diversity module
+"""
+
+from itertools import combinations
+
+import pytest
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE, set_database
+from dog_breed_aesthetics_mcp.diversity import DiversityIndex, get_diversity_index
+
+
+def _spread(index, rows):
+    """Smallest pairwise distance among rows"""
+    return min(index.distance(a, b) for a, b in combinations(rows, 2))
+
+
+def test_select_picks_farthest_breed_each_time():
+    """Test every pick maximises its distance to earlier picks, and the set is near the best possible"""
+    index = DiversityIndex(BREED_DATABASE)
+    rows = index.candidates()
+    picks = index.select(rows, 4)
+    assert len({row for row, _ in picks}) == 4
+
+    for i in range(1, len(picks)):
+        chosen = [row for row, _ in picks[:i]]
+        nearest = {row: min(index.distance(row, other) for other in chosen) for row in rows if row not in chosen}
+        assert picks[i][1] == max(nearest.values())
+        assert picks[i][0] == min(row for row, distance in nearest.items() if distance == picks[i][1])
+
+    best = max(_spread(index, trio) for trio in combinations(rows, 3))
+    assert _spread(index, [row for row, _ in picks[:3]]) >= best / 2
+
+
+def test_candidates_filter_and_duplicates():
+    """Test group and key filters, and that exact duplicates are only picked once everything else is"""
+    database = dict(BREED_DATABASE)
+    database["greyhound_copy"] = BREED_DATABASE["greyhound"]
+    index = DiversityIndex(database)
+
+    hounds = index.candidates(group=" HOUND ")
+    assert {index.keys[row] for row in hounds} == {"greyhound", "greyhound_copy", "basset_hound", "afghan_hound"}
+    assert [index.keys[row] for row in index.candidates("hound", ["afghan_hound", "pug"])] == ["afghan_hound"]
+
+    picks = index.select(hounds, 4)
+    assert [distance for _, distance in picks][-1] == 0.0
+    assert sorted(index.keys[row] for row, _ in picks) == sorted(index.keys[row] for row in hounds)
+    assert index.select([], 3) == []
+
+
+def test_tool_selects_within_filters():
+    """Test the tool honours group and scale filters and rejects bad arguments"""
+    result = server.select_diverse_breeds(5)
+    assert result["count"] == 5 and result["candidates"] == len(BREED_DATABASE)
+    assert result["breeds"][0]["distance"] is None
+    assert result["min_distance"] == min(breed["distance"] for breed in result["breeds"][1:])
+
+    large = server.select_diverse_breeds(10, scale_min="large")
+    assert large["count"] == large["candidates"] < 10
+    assert {breed["name"] for breed in large["breeds"]} >= {"German Shepherd", "Greyhound"}
+    assert all(BREED_DATABASE[breed["key"]]["name"] == breed["name"] for breed in large["breeds"])
+    assert server.select_diverse_breeds(2, group="toy")["breeds"][0]["group"] == "Toy"
+
+    assert "error" in server.select_diverse_breeds(0)
+    assert "error" in server.select_diverse_breeds(3, scale_min="enormous")
+    assert "suggestion" in server.select_diverse_breeds(3, group="Unknown")
+
+    try:
+        set_database({"pug": BREED_DATABASE["pug"], "greyhound": BREED_DATABASE["greyhound"]})
+        assert get_diversity_index().keys == ["pug", "greyhound"]
+    finally:
+        set_database(BREED_DATABASE)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,69 @@
+"""
+Tests for encoding module
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastmcp import Client
+from fastmcp.tools import FunctionTool
+from dog_breed_aesthetics_mcp import encoding, server
+from dog_breed_aesthetics_mcp.encoding import FastJsonTool, dumps
+
+
+def test_dumps_is_compact_utf8_json():
+    """Test both encoders produce the same compact JSON, with non-ASCII text kept as is"""
+    value = {"name": "Löwchen", "weights": [0.5, 1.0], "next": None, "ok": True}
+    expected = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    assert dumps(value) == expected
+
+    orjson = encoding.orjson
+    encoding.orjson = None
+    try:
+        assert dumps(value) == expected
+    finally:
+        encoding.orjson = orjson
+
+
+def test_fast_result_matches_default_conversion():
+    """Test a dict result converts to the same text and structured content as FastMCP's default"""
+    fn = server.compare_breeds
+    result = fn(["Greyhound", "Pug"])
+    default = FunctionTool.from_function(fn).model_copy(update={"return_type": dict, "output_schema": None})
+    fast = FastJsonTool.from_function(fn, output_schema=None)
+
+    expected = default.convert_result(result)
+    converted = fast.convert_result(result)
+    assert converted.structured_content == expected.structured_content
+    assert json.loads(converted.content[0].text) == json.loads(expected.content[0].text)
+
+
+def test_non_dict_results_take_default_path():
+    """Test string results are still converted by FastMCP"""
+    def describe() -> str:
+        return "text"
+
+    fast = FastJsonTool.from_function(describe)
+    converted = fast.convert_result("text")
+    assert converted.content[0].text == "text"
+
+
+def test_typed_results_validate_through_client():
+    """Test success and error results are accepted by a client that checks the output schema"""
+    async def run():
+        async with Client(server.mcp) as client:
+            ok = await client.call_tool("enhance_with_breed_aesthetic", {"breed_name": "Pug", "base_prompt": "a city"})
+            missing = await client.call_tool("enhance_with_breed_aesthetic", {"breed_name": "Nope", "base_prompt": "a city"})
+            page = await client.call_tool("list_breeds_page", {"page_size": 2})
+            return ok, missing, page
+
+    ok, missing, page = asyncio.run(run())
+    assert ok.structured_content["breed_name"] == "Pug"
+    assert missing.structured_content["error"] == "Breed 'Nope' not found"
+    assert len(page.structured_content["breeds"]) == 2
+    assert json.loads(page.content[0].text) == page.structured_content
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,74 @@
+"""
+Tests for export module
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE, set_database
+from dog_breed_aesthetics_mcp.export import INDEX_FILE, content_hash, export_catalog
+
+
+def _read(out_dir, relative_path):
+    with open(os.path.join(out_dir, relative_path), "rb") as f:
+        return f.read()
+
+
+def test_export_writes_every_breed_with_hashed_names(tmp_path):
+    """Test the index lists every breed and variant, and files are named after their content"""
+    index = export_catalog(str(tmp_path), encodings=["gzip"])
+    assert json.loads(_read(tmp_path, INDEX_FILE))["breeds"] == index["breeds"]
+    assert index["breed_count"] == len(index["breeds"]) > len(BREED_DATABASE)
+
+    by_key = {entry["key"]: entry for entry in index["breeds"]}
+    assert by_key["toy_poodle"]["parent"] == "poodle"
+    assert "parent" not in by_key["greyhound"]
+
+    greyhound = by_key["greyhound"]
+    data = _read(tmp_path, greyhound["json"])
+    assert greyhound["json"] == f"breeds/greyhound.{content_hash(data)}.json"
+    assert json.loads(data) == {"key": "greyhound", **BREED_DATABASE["greyhound"]}
+
+
+def test_export_matches_tool_output_and_precompresses(tmp_path):
+    """Test text files are the catalog tools' text, with .gz siblings that decode to them"""
+    index = export_catalog(str(tmp_path), encodings=["gzip"])
+    pug = next(entry for entry in index["breeds"] if entry["key"] == "pug")
+    text = _read(tmp_path, pug["text"])
+    assert text.decode() == server.get_breed_characteristics("Pug")["text"]
+    assert gzip.decompress(_read(tmp_path, pug["text"] + ".gz")) == text
+    assert _read(tmp_path, index["listing"]).decode() == server.list_available_breeds()["text"]
+
+    assert not list(tmp_path.rglob("*.zst"))
+    export_catalog(str(tmp_path / "plain"), encodings=[])
+    assert not list((tmp_path / "plain").rglob("*.gz"))
+
+
+def test_reexport_only_adds_changed_files(tmp_path):
+    """Test an unchanged catalog rewrites only the index, and a changed breed gets a new file"""
+    first = export_catalog(str(tmp_path), encodings=["gzip"])
+    again = export_catalog(str(tmp_path), encodings=["gzip"])
+    assert again["files_written"] == 1
+    assert again["breeds"] == first["breeds"] and again["catalog"] == first["catalog"]
+
+    edited = dict(BREED_DATABASE)
+    edited["pug"] = {**BREED_DATABASE["pug"], "visual_essence": "a new essence"}
+    try:
+        set_database(edited)
+        changed = export_catalog(str(tmp_path), encodings=["gzip"])
+    finally:
+        set_database(BREED_DATABASE)
+
+    old_paths = {entry["key"]: entry["json"] for entry in first["breeds"]}
+    new_paths = {entry["key"]: entry["json"] for entry in changed["breeds"]}
+    assert new_paths["pug"] != old_paths["pug"]
+    assert new_paths["boxer"] == old_paths["boxer"]
+    assert (tmp_path / old_paths["pug"]).exists()
+    assert changed["catalog"] != first["catalog"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
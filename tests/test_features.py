@@ -0,0 +1,90 @@
+"""
+Tests for features module
+"""
+
+import math
+
+import pytest
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE
+from dog_breed_aesthetics_mcp.features import (
+    COAT_LENGTH_LEVELS,
+    ENERGY_ALIASES,
+    ENERGY_LEVELS,
+    SCALE_LEVELS,
+    FeatureTable,
+    extract_features,
+    parse_level,
+    resolve_bound
+)
+
+
+def test_parse_level_variants():
+    """Test parsing of the free-text forms used in the database"""
+    assert parse_level("medium-large", SCALE_LEVELS) == 2.5
+    assert parse_level("small-medium (but low)", SCALE_LEVELS) == 1.5
+    assert parse_level("medium (Standard), also toy and miniature varieties", SCALE_LEVELS) == 2.0
+    assert parse_level("very short", COAT_LENGTH_LEVELS) == 0.0
+    assert parse_level("medium to long, styled", COAT_LENGTH_LEVELS) == 2.5
+    assert parse_level("moderate to high, fluid", ENERGY_LEVELS) == 2.5
+    assert math.isnan(parse_level("explosive speed capability", ENERGY_LEVELS))
+    assert parse_level("explosive speed capability, calm reserve", ENERGY_LEVELS, ENERGY_ALIASES) == 4.0
+    assert parse_level("calm to lively", ENERGY_LEVELS, ENERGY_ALIASES) == 2.0
+    assert math.isnan(parse_level("variable", ENERGY_LEVELS, ENERGY_ALIASES))
+
+
+def test_extract_features_all_breeds_parse():
+    """Test that every breed in the database has a numeric value for every feature"""
+    for breed_key, breed_data in BREED_DATABASE.items():
+        for feature, value in extract_features(breed_data).items():
+            assert not math.isnan(value), f"{breed_key} {feature} did not parse"
+
+
+def test_resolve_bound():
+    """Test level names and numbers as range bounds"""
+    assert resolve_bound("scale", "Small") == 1.0
+    assert resolve_bound("energy", 2.5) == 2.5
+    assert resolve_bound("energy", None) is None
+
+    with pytest.raises(ValueError):
+        resolve_bound("scale", "enormous")
+
+
+def test_query_ranges():
+    """Test range filtering across several features"""
+    table = FeatureTable(BREED_DATABASE)
+    rows = table.query({"scale": (1.0, 2.0), "energy": (3.0, None)})
+    names = {table.names[row] for row in rows}
+
+    assert "Jack Russell Terrier" in names
+    assert "Border Collie" in names
+    assert "Scottish Terrier" not in names  # moderate energy
+    assert "Great Dane" not in names  # giant
+
+
+def test_query_sorting_missing_last():
+    """Test sorting by a feature with unparsed values placed last"""
+    greyhound = BREED_DATABASE["greyhound"]
+    database = {**BREED_DATABASE, "greyhound": {**greyhound, "movement": {**greyhound["movement"], "energy": "variable"}}}
+    table = FeatureTable(database)
+    rows = table.query(sort_by="energy", descending=True)
+    values = [table.value("energy", row) for row in rows]
+
+    assert values[0] == 4.0
+    assert values[-1] is None
+    assert table.names[rows[-1]] == "Greyhound"
+    present = [v for v in values if v is not None]
+    assert present == sorted(present, reverse=True)
+
+
+def test_tool_returns_breed_keys():
+    """Test each match carries the breed key other tools accept, next to its name"""
+    result = server.find_breeds_by_features(scale_max="small", sort_by="scale")
+    assert result["count"] == len(result["breeds"]) > 0
+    for breed in result["breeds"]:
+        assert BREED_DATABASE[breed["key"]]["name"] == breed["name"]
+        assert breed["scale"] <= 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+"""
+Tests for interpolation module
+"""
+
+import pytest
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.breed_data import get_breed_data
+from dog_breed_aesthetics_mcp.interpolation import (
+    MAX_INTERPOLATION_FRAMES,
+    BreedInterpolation,
+    frame_weights,
+    iter_interpolated_frames
+)
+
+
+def test_frame_weights_endpoints():
+    """Test that weights run from start breed to end breed"""
+    weights = frame_weights(5)
+    assert weights == [0.0, 0.25, 0.5, 0.75, 1.0]
+    assert frame_weights(1) == [0.0]
+
+    assert frame_weights(5, 3) == [0.75, 1.0]
+    with pytest.raises(ValueError):
+        frame_weights(0)
+    with pytest.raises(ValueError):
+        frame_weights(MAX_INTERPOLATION_FRAMES + 1)
+
+
+def test_first_and_last_frames_match_breeds():
+    """Test that sequence endpoints reproduce the original breeds"""
+    greyhound = get_breed_data("greyhound")
+    bulldog = get_breed_data("bulldog")
+    plan = BreedInterpolation(greyhound, bulldog, 10)
+
+    first = plan.render_frame(0, "a city street")
+    last = plan.render_frame(9, "a city street")
+
+    assert first["characteristics"]["coat"] == greyhound["coat"]
+    assert first["characteristics"]["color_palette"] == greyhound["color_palette"]
+    assert first["visual_essence"] == greyhound["visual_essence"]
+    assert last["characteristics"]["movement"] == bulldog["movement"]
+    assert last["characteristics"]["scale"] == bulldog["scale"]
+    assert last["blend"] == {"start_weight": 0.0, "end_weight": 1.0}
+
+
+def test_midpoint_frame_blends_both_breeds():
+    """Test that the middle frame carries terms from both breeds"""
+    plan = BreedInterpolation(get_breed_data("greyhound"), get_breed_data("pug"), 3)
+    middle = plan.render_frame(1, "portrait", "strong")
+
+    palette = middle["characteristics"]["color_palette"]
+    assert "fawn" in palette
+    assert "black" in palette
+    assert "Greyhound" in middle["synthesis_instruction"]
+    assert "Pug" in middle["synthesis_instruction"]
+    assert "50%" in middle["synthesis_instruction"]
+    assert "strong" in middle["synthesis_instruction"]
+
+
+def test_every_frame_has_non_empty_attributes():
+    """Test that no attribute is blended away entirely"""
+    frames = iter_interpolated_frames(
+        get_breed_data("corgi"), get_breed_data("great_dane"), "test", 7
+    )
+    for frame in frames:
+        for category in ("proportions", "coat", "movement", "temperament_aesthetic"):
+            for value in frame["characteristics"][category].values():
+                assert value, f"Empty value in frame {frame['frame']}"
+        assert frame["characteristics"]["color_palette"]
+
+
+def test_iter_interpolated_frames_window():
+    """Test that frames can be consumed a window at a time"""
+    frames = list(iter_interpolated_frames(
+        get_breed_data("poodle"), get_breed_data("boxer"), "test", 100,
+        start_frame=40, stop_frame=45
+    ))
+    assert [f["frame"] for f in frames] == [40, 41, 42, 43, 44]
+    assert "frame 41 of 100" in frames[0]["synthesis_instruction"]
+
+    # A plan only covers its window
+    plan = BreedInterpolation(get_breed_data("poodle"), get_breed_data("boxer"), 100, 40, 45)
+    assert len(plan.weights) == 5
+    with pytest.raises(IndexError):
+        plan.render_frame(45, "test")
+
+
+def test_tool_rejects_out_of_range_frames():
+    """Test the tool caps frame_count and rejects start frames outside the sequence"""
+    result = server.interpolate_breed_aesthetics("Poodle", "Boxer", "test", MAX_INTERPOLATION_FRAMES, start_frame=9998)
+    assert [f["frame"] for f in result["frames"]] == [9998, 9999] and result["next_frame"] is None
+
+    assert "error" in server.interpolate_breed_aesthetics("Poodle", "Boxer", "test", MAX_INTERPOLATION_FRAMES + 1)
+    assert "error" in server.interpolate_breed_aesthetics("Poodle", "Boxer", "test", 10, start_frame=-1)
+    assert "error" in server.interpolate_breed_aesthetics("Poodle", "Boxer", "test", 10, start_frame=10)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
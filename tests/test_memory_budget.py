@@ -0,0 +1,82 @@
+"""
+Tests for memory_budget module
+"""
+
+import asyncio
+import tracemalloc
+
+import pytest
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.memory_budget import DEFAULT_BUDGETS, check_budgets, measure_tool, run, tool_calls
+from dog_breed_aesthetics_mcp.tenants import TenantStore, set_tenant_store
+
+
+def test_every_tool_is_exercised_and_budgeted():
+    """Test the harness covers every registered tool, each with a budget"""
+    registered = {tool.name for tool in asyncio.run(server.mcp.list_tools())}
+    assert {tool_name for tool_name, _ in tool_calls()} == registered
+    assert set(DEFAULT_BUDGETS) == registered
+
+
+def test_inputs_take_the_success_path(tmp_path):
+    """Test every tool's inputs succeed across the catalog, and an error result stops measurement"""
+    previous = set_tenant_store(TenantStore(str(tmp_path / "tenants.sqlite3")))
+    try:
+        for tool_name, call in tool_calls():
+            for i in range(60):
+                result = call(i)
+                assert not (isinstance(result, dict) and "error" in result), (tool_name, i, result)
+    finally:
+        set_tenant_store(previous).close()
+
+    tracemalloc.start()
+    try:
+        with pytest.raises(ValueError):
+            measure_tool(lambda i: {"error": "not found"}, calls=10, warmup=0)
+    finally:
+        tracemalloc.stop()
+
+
+def test_measure_tool_detects_growth():
+    """Test a call that keeps something per call shows retained bytes, a bounded cache does not"""
+    kept = []
+    bounded = {}
+
+    def leaky(i):
+        kept.append("x" * 200 + str(i))
+
+    def cached(i):
+        bounded[i % 10] = "x" * 200 + str(i)
+
+    tracemalloc.start()
+    try:
+        leak = measure_tool(leaky, calls=400, warmup=20)
+        steady = measure_tool(cached, calls=400, warmup=20)
+    finally:
+        tracemalloc.stop()
+    assert leak["retained_bytes_per_call"] > 200
+    assert steady["retained_bytes_per_call"] < 8
+
+
+def test_check_budgets_reports_excess_and_missing():
+    """Test budgets are enforced per metric and unbudgeted tools fail"""
+    results = {
+        "compare_breeds": {"peak_kb": 80.0, "blocks_per_call": 10, "retained_bytes_per_call": 0.0},
+        "new_tool": {"peak_kb": 1.0, "blocks_per_call": 1, "retained_bytes_per_call": 0.0},
+    }
+    violations = check_budgets(results, {"compare_breeds": {"peak_kb": 64, "blocks_per_call": 32}})
+    assert violations == [
+        "compare_breeds: peak_kb 80.0 exceeds budget 64",
+        "new_tool: no budget configured",
+    ]
+
+
+def test_core_tools_stay_within_budget():
+    """Test the most-called tools against their default budgets"""
+    results = run(calls=200, warmup=200, tools={"enhance_with_breed_aesthetic", "compare_breeds", "list_breeds_page"})
+    assert set(results) == {"enhance_with_breed_aesthetic", "compare_breeds", "list_breeds_page"}
+    assert check_budgets(results, DEFAULT_BUDGETS) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
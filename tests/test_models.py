@@ -0,0 +1,60 @@
+"""
+Tests for models module
+"""
+
+import jsonschema
+import pytest
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.models import EnhancementResult, ErrorResult, TemplateList, output_schema
+
+
+def test_union_schema_is_an_object():
+    """Test a result-or-error union is advertised as an unwrapped object schema"""
+    schema = output_schema(EnhancementResult | ErrorResult)
+    assert schema["type"] == "object"
+    assert len(schema["anyOf"]) == 2
+    assert "x-fastmcp-wrap-result" not in schema
+
+
+def test_single_model_schema_lists_required_fields():
+    """Test a plain model's schema requires its fields"""
+    schema = output_schema(TemplateList)
+    assert schema["type"] == "object"
+    assert set(schema["required"]) == {"default", "templates", "available_placeholders"}
+
+
+def test_tool_results_match_their_schemas():
+    """Test results and errors returned by the tools validate against the declared schemas"""
+    cases = [
+        (server.list_available_breeds, ()),
+        (server.get_breed_characteristics, ("Toy Poodle",)),
+        (server.get_breed_characteristics, ("Nope",)),
+        (server.enhance_with_breed_aesthetic, ("Greyhound", "a city")),
+        (server.enhance_with_breed_aesthetic, ("Nope", "a city")),
+        (server.interpolate_breed_aesthetics, ("Greyhound", "Pug", "a city", 3)),
+        (server.compare_breeds, (["Greyhound", "Pug", "Boxer"],)),
+        (server.find_breeds_by_features, ()),
+        (server.list_breed_variants, ()),
+        (server.score_enhanced_prompts, ("Pug", ["a wrinkled fawn city", "a dog"])),
+        (server.get_admission_metrics, ()),
+    ]
+    for fn, args in cases:
+        schema = output_schema(fn.__annotations__["return"])
+        jsonschema.validate(fn(*args), schema)
+
+
+def test_catalog_tools_return_fields_and_text():
+    """Test the catalog tools return structured fields alongside their formatted text"""
+    listing = server.list_available_breeds()
+    assert listing["groups"][0]["group"] == "Sporting"
+    assert listing["breed_count"] == sum(len(entry["breeds"]) for entry in listing["groups"])
+    assert "  • Greyhound" in listing["text"]
+
+    details = server.get_breed_characteristics("greyhound")
+    assert details["name"] == "Greyhound" and details["group"] == "Hound"
+    assert details["text"].startswith("=== Greyhound ===\nGroup: Hound")
+    assert "Greyhound" in server.get_breed_characteristics("Nope")["available_breeds"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
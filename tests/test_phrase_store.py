@@ -0,0 +1,69 @@
+"""
+Tests for phrase_store module
+"""
+
+import pytest
+from dog_breed_aesthetics_mcp.breed_data import (
+    BREED_DATABASE,
+    get_breed_data,
+    get_breed_names,
+    set_database
+)
+from dog_breed_aesthetics_mcp.comparison import compare_breed_keys
+from dog_breed_aesthetics_mcp.phrase_store import PhraseStore
+from dog_breed_aesthetics_mcp.synthetic import generate_breed_database
+
+
+def test_roundtrip_builtin_database():
+    """Test that every built-in breed decodes to its original entry"""
+    store = PhraseStore(BREED_DATABASE)
+    assert len(store) == len(BREED_DATABASE)
+    assert list(store) == list(BREED_DATABASE)
+    for breed_key, breed_data in BREED_DATABASE.items():
+        assert store[breed_key] == breed_data
+    assert store.get("invalid_breed") is None
+
+
+def test_roundtrip_synthetic_database():
+    """Test round-tripping a larger generated catalog"""
+    database = generate_breed_database(500, seed=5)
+    store = PhraseStore(database, cache_size=0)
+    assert all(store[breed_key] == breed_data for breed_key, breed_data in database.items())
+
+
+def test_phrases_are_shared():
+    """Test that repeated phrases are stored once"""
+    store = PhraseStore(generate_breed_database(500, seed=6))
+    assert len(store.phrases) == len(set(store.phrases))
+    assert len(store.phrases) < 1000
+    assert "moderate length" in store.phrases
+
+
+def test_values_that_do_not_split_cleanly_are_kept_whole():
+    """Test that odd separators survive the round trip"""
+    breed_data = dict(BREED_DATABASE["pug"], visual_essence="compact,charming ,  wrinkled")
+    store = PhraseStore({"odd_pug": breed_data})
+    assert store["odd_pug"]["visual_essence"] == "compact,charming ,  wrinkled"
+
+
+def test_decode_cache_is_bounded():
+    """Test that the decoded-breed cache keeps only recent entries"""
+    store = PhraseStore(BREED_DATABASE, cache_size=2)
+    for breed_key in ("pug", "boxer", "poodle"):
+        store[breed_key]
+    assert list(store.decoded) == ["boxer", "poodle"]
+
+
+def test_store_as_active_database():
+    """Test that lookups and indexes work with a PhraseStore as the database"""
+    try:
+        set_database(PhraseStore(BREED_DATABASE))
+        assert get_breed_data("greyhound") == BREED_DATABASE["greyhound"]
+        assert len(get_breed_names()) == len(BREED_DATABASE)
+        assert compare_breed_keys(["pug", "boxer"])["shared"]["color_palette"] == ["fawn"]
+    finally:
+        set_database(BREED_DATABASE)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
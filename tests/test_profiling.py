@@ -0,0 +1,105 @@
+"""
+Tests for profiling module
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+
+import pytest
+from fastmcp import Client
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.profiling import ProfilingMiddleware, ToolProfiler, get_profiler
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sample_rate_validation(tmp_path):
+    """Test sample rates outside 0-1 are rejected and 0/1 are exact"""
+    with pytest.raises(ValueError):
+        ToolProfiler(str(tmp_path), sample_rate=1.5)
+    assert not any(ToolProfiler(str(tmp_path), sample_rate=0.0).should_sample() for _ in range(100))
+    assert all(ToolProfiler(str(tmp_path), sample_rate=1.0).should_sample() for _ in range(100))
+
+
+def test_samples_only_threads_running_the_tool(tmp_path):
+    """Test stacks are collected from the thread running the tool's code"""
+    profiler = ToolProfiler(str(tmp_path), sample_rate=1.0, interval=0.001)
+    token = profiler.begin("busy", _busy.__code__)
+    worker = threading.Thread(target=_busy, args=(0.2,))
+    worker.start()
+    worker.join()
+    profiler.end(token)
+    profiler.record_call("busy", 0.2, sampled=True)
+
+    stacks = profiler.stacks["busy"]
+    assert sum(stacks.values()) > 0
+    assert all(stack.endswith("test_profiling:_busy") for stack in stacks)
+    assert profiler.stats()["busy"]["sampled_calls"] == 1
+
+
+def test_flush_writes_folded_stacks(tmp_path):
+    """Test flush writes per-tool and combined folded stacks plus a summary"""
+    profiler = ToolProfiler(str(tmp_path))
+    profiler.stacks["compare_breeds"] = {"a;b;c": 3, "a;b": 1}
+    profiler.record_call("compare_breeds", 0.01, sampled=True)
+    profiler.flush()
+
+    assert (tmp_path / "compare_breeds.folded").read_text().splitlines() == ["a;b;c 3", "a;b 1"]
+    assert (tmp_path / "all.folded").read_text().splitlines()[0] == "compare_breeds;a;b;c 3"
+    summary = json.loads((tmp_path / "summary.json").read_text())
+    assert summary["compare_breeds"]["samples"] == 4
+
+
+def test_configure_profiling_tool(tmp_path, monkeypatch):
+    """Test enabling adds the middleware, tool calls are profiled, disabling removes it"""
+    monkeypatch.setenv("DOG_BREED_PROFILE_DIR", str(tmp_path))
+
+    async def run():
+        async with Client(server.mcp) as client:
+            await client.call_tool(
+                "configure_profiling",
+                {"enabled": True, "output_dir": "run", "sample_rate": 1.0}
+            )
+            assert any(isinstance(m, ProfilingMiddleware) for m in server.mcp.middleware)
+            await client.call_tool("compare_breeds", {"breed_names": ["Greyhound", "Pug"]})
+            result = await client.call_tool("configure_profiling", {"enabled": False})
+            return result.data
+
+    result = asyncio.run(run())
+    assert result["tools"]["compare_breeds"]["sampled_calls"] == 1
+    assert get_profiler() is None
+    assert not any(isinstance(m, ProfilingMiddleware) for m in server.mcp.middleware)
+    assert os.path.exists(tmp_path / "run" / "summary.json")
+
+
+def test_output_dir_stays_inside_the_profile_directory(tmp_path, monkeypatch):
+    """Test client-supplied output directories cannot leave the configured base"""
+    monkeypatch.setenv("DOG_BREED_PROFILE_DIR", str(tmp_path / "profiles"))
+    for output_dir in ("../elsewhere", str(tmp_path / "elsewhere"), "/etc"):
+        assert "error" in server.configure_profiling(True, output_dir)
+    assert get_profiler() is None
+    assert not os.path.exists(tmp_path / "elsewhere")
+
+
+def test_replacing_a_profiler_flushes_it(tmp_path, monkeypatch):
+    """Test enabling again writes the replaced profiler's output before switching"""
+    monkeypatch.setenv("DOG_BREED_PROFILE_DIR", str(tmp_path))
+    try:
+        server.configure_profiling(True, "first")
+        get_profiler().stacks["compare_breeds"] = {"a;b": 2}
+        server.configure_profiling(True, "second")
+        assert (tmp_path / "first" / "compare_breeds.folded").read_text() == "a;b 2\n"
+        assert get_profiler().output_dir == str(tmp_path / "second")
+    finally:
+        server.configure_profiling(False)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+"""
+Tests for recording module
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastmcp import Client
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.recording import CallRecorder, RecordingMiddleware, load_recording
+
+
+def test_recorder_appends_compact_lines(tmp_path):
+    """Test each record is one compact JSON line and the file is appended to"""
+    path = tmp_path / "calls.jsonl"
+    recorder = CallRecorder(str(path))
+    recorder.record("compare_breeds", {"breed_names": ["Pug", "Boxer"]}, 100.0, 0.0025, True)
+    recorder.close()
+    recorder = CallRecorder(str(path))
+    recorder.record("list_available_breeds", {}, 101.0, 0.001, False)
+    recorder.close()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert " " not in lines[0].replace("compare_breeds", "")
+    assert json.loads(lines[0]) == {
+        "ts": 100.0, "tool": "compare_breeds", "args": {"breed_names": ["Pug", "Boxer"]},
+        "ms": 2.5, "ok": True
+    }
+
+
+def test_close_writes_out_queued_records(tmp_path):
+    """Test records queued for the writer thread are all in the file once the recorder is closed"""
+    path = tmp_path / "calls.jsonl"
+    recorder = CallRecorder(str(path))
+    for i in range(1000):
+        recorder.record("get_breed_characteristics", {"breed_name": f"Pug {i}"}, 100.0 + i, 0.001, True)
+    recorder.close()
+    recorder.close()
+    recorder.record("list_available_breeds", {}, 2000.0, 0.001, True)
+
+    assert recorder.recorded == 1000
+    records = load_recording(str(path))
+    assert [record["args"]["breed_name"] for record in records] == [f"Pug {i}" for i in range(1000)]
+
+
+def test_load_recording_sorts_and_skips_truncated_line(tmp_path):
+    """Test records come back oldest first and a partial last line is ignored"""
+    path = tmp_path / "calls.jsonl"
+    path.write_text(
+        '{"ts":2.0,"tool":"b","args":{},"ms":1,"ok":true}\n'
+        '{"ts":1.0,"tool":"a","args":{},"ms":1,"ok":true}\n'
+        '{"ts":3.0,"tool":"c","ar'
+    )
+    assert [record["tool"] for record in load_recording(str(path))] == ["a", "b"]
+
+
+def test_middleware_records_tool_calls(tmp_path):
+    """Test calls made through the server are recorded with their arguments"""
+    path = tmp_path / "calls.jsonl"
+    recorder = CallRecorder(str(path))
+    middleware = RecordingMiddleware(recorder)
+    server.mcp.add_middleware(middleware)
+    try:
+        async def run():
+            async with Client(server.mcp) as client:
+                await client.call_tool("get_breed_characteristics", {"breed_name": "Pug"})
+                await client.call_tool("list_breeds_page", {"page_size": 5})
+        asyncio.run(run())
+    finally:
+        server.mcp.middleware.remove(middleware)
+        recorder.close()
+
+    records = load_recording(str(path))
+    assert [record["tool"] for record in records] == ["get_breed_characteristics", "list_breeds_page"]
+    assert records[0]["args"] == {"breed_name": "Pug"}
+    assert all(record["ok"] and record["ms"] > 0 for record in records)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,54 @@
+"""
+Tests for replay module
+"""
+
+import asyncio
+
+import pytest
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.replay import format_report, percentile, replay
+
+
+def _records(count, gap):
+    tools = [
+        ("get_breed_characteristics", {"breed_name": "Greyhound"}),
+        ("compare_breeds", {"breed_names": ["Greyhound", "Pug"]}),
+        ("no_such_tool", {}),
+    ]
+    return [
+        {"ts": 1000.0 + i * gap, "tool": tools[i % 3][0], "args": tools[i % 3][1], "ms": 1.0, "ok": True}
+        for i in range(count)
+    ]
+
+
+def test_percentile():
+    """Test nearest-rank percentiles"""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile(values, 1.0) == 100.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_replay_in_process_at_max_speed():
+    """Test every call is replayed and failures are counted per tool"""
+    report = asyncio.run(replay(_records(30, 1.0), server.mcp, speed=0, concurrency=4))
+    assert report["requests"] == 30
+    assert report["errors"] == 10
+    assert report["tools"]["no_such_tool"]["errors"] == 10
+    assert report["tools"]["compare_breeds"]["errors"] == 0
+    assert report["p50_ms"] <= report["p99_ms"] <= report["max_ms"]
+    assert "all" in format_report(report)
+
+
+def test_replay_keeps_scaled_timing():
+    """Test replay follows the recorded gaps divided by speed"""
+    report = asyncio.run(replay(_records(5, 0.1), server.mcp, speed=2.0))
+    assert report["requests"] == 5
+    assert report["elapsed_s"] >= 0.2
+    with pytest.raises(ValueError):
+        asyncio.run(replay([], server.mcp, speed=-1))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
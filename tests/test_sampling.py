@@ -0,0 +1,89 @@
+"""
+Tests for sampling module
+"""
+
+import json
+from collections import Counter
+
+import pytest
+from dog_breed_aesthetics_mcp import server
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE
+from dog_breed_aesthetics_mcp.sampling import AliasTable, WeightedSampler, breed_weights, get_sampler
+
+
+def test_alias_table_draws_in_proportion_to_weights():
+    """Test draw frequencies follow the weights and zero-weight rows are never drawn"""
+    sampler = WeightedSampler(["a", "b", "c", "d"], ["A", "B", "C", "D"], [1.0, 0.0, 3.0, 6.0])
+    assert sampler.keys == ["a", "c", "d"]
+    counts = Counter(sampler.sample(50000, seed=3))
+    for row, expected in enumerate([0.1, 0.3, 0.6]):
+        assert abs(counts[row] / 50000 - expected) < 0.01
+    assert sampler.probability(2) == 0.6
+
+    with pytest.raises(ValueError):
+        AliasTable([0.0, 0.0])
+
+
+def test_sampling_without_replacement_is_distinct_and_seeded():
+    """Test distinct draws, reproducibility per seed, and drawing every positive row"""
+    sampler = WeightedSampler([str(i) for i in range(50)], [str(i) for i in range(50)], [1.0] * 49 + [1000.0])
+    first = sampler.sample(10, seed=11, replace=False)
+    assert len(set(first)) == 10 and 49 in first
+    assert sampler.sample(10, seed=11, replace=False) == first
+    assert sampler.sample(10, seed=12, replace=False) != first
+
+    # Taking the heavy row forces a rebuild over the rest
+    assert sorted(sampler.sample(50, seed=5, replace=False)) == list(range(50))
+    with pytest.raises(ValueError):
+        sampler.sample(51, seed=5, replace=False)
+
+
+def test_breed_weights_combine_criteria(tmp_path):
+    """Test group, scale and popularity weights multiply, and unknown names are rejected"""
+    keys, names, weights = breed_weights({"Toy": 2, "hound": 0}, {"giant": 0.5})
+    weight = dict(zip(keys, weights))
+    assert weight["pug"] == 2.0 and weight["greyhound"] == 0.0
+    assert weight["great_dane"] == 0.5 and weight["boxer"] == 1.0
+    assert names[keys.index("pug")] == "Pug"
+
+    recording = tmp_path / "calls.jsonl"
+    recording.write_text("\n".join(
+        json.dumps({"tool": "get_breed_characteristics", "args": {"breed_name": "Boxer"}}) for _ in range(3)
+    ) + "\n")
+    sampler = get_sampler(popularity=1.0, stats_path=str(recording))
+    boxer, pug = sampler.keys.index("boxer"), sampler.keys.index("pug")
+    assert sampler.probability(boxer) == pytest.approx(4 * sampler.probability(pug))
+
+    with pytest.raises(ValueError):
+        breed_weights({"Toys": 1})
+    with pytest.raises(ValueError):
+        breed_weights(scale_weights={"huge": 1})
+    with pytest.raises(ValueError):
+        breed_weights({"Toy": -1})
+
+
+def test_tool_draws_reproducibly_with_payloads():
+    """Test the tool returns the seed it used, repeats draws per seed, and builds payloads"""
+    result = server.sample_breeds(20, group_weights={"Toy": 0})
+    again = server.sample_breeds(20, seed=result["seed"], group_weights={"Toy": 0})
+    assert again["breeds"] == result["breeds"]
+    assert not {"pug", "pomeranian", "italian_greyhound"} & {breed["key"] for breed in result["breeds"]}
+    assert all(BREED_DATABASE[breed["key"]]["name"] == breed["name"] for breed in result["breeds"])
+    assert set(result["probabilities"]) == {breed["key"] for breed in result["breeds"]}
+    assert sum(server.sample_breeds(1, group_weights={"Toy": 0})["probabilities"].values()) <= 1
+
+    distinct = server.sample_breeds(3, seed=1, replace=False, base_prompt="a quiet harbour", template="tags")
+    keys = [breed["key"] for breed in distinct["breeds"]]
+    assert len(set(keys)) == 3
+    assert set(distinct["payloads"]) == set(keys)
+    payload = distinct["payloads"][keys[0]]
+    assert payload == server.enhance_with_breed_aesthetic(keys[0], "a quiet harbour", template="tags")
+
+    assert "error" in server.sample_breeds(0)
+    assert "error" in server.sample_breeds(30, replace=False)
+    assert "error" in server.sample_breeds(1, base_prompt="x", template="missing")
+    assert "error" in server.sample_breeds(1, group_weights={"Unknown": 1})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,72 @@
+"""
+Tests for scoring module
+"""
+
+import pytest
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE, get_breed_data, set_database
+from dog_breed_aesthetics_mcp.scoring import (
+    WordStatistics,
+    content_words,
+    get_word_statistics,
+    score_prompts
+)
+
+
+def test_content_words():
+    """Test tokenizing drops short words, stop words and punctuation"""
+    assert content_words("A Sleek, free-swinging stride with the wind") == [
+        "sleek", "free", "swinging", "stride", "wind"
+    ]
+
+
+def test_idf_favours_distinctive_words():
+    """Test words used by many breeds weigh less than rare ones"""
+    statistics = get_word_statistics()
+    assert statistics.breed_count == len(BREED_DATABASE)
+    assert statistics.idf("aerodynamic") > statistics.idf("medium")
+    assert statistics.idf("unseen") > max(statistics.idf(w) for w in statistics.document_frequency)
+
+
+def test_scores_rise_with_breed_vocabulary():
+    """Test richer prompts score higher and flags follow the emphasis ranges"""
+    breed = get_breed_data("greyhound")
+    prompts = [
+        "A quiet harbour at dawn, soft fog over still water.",
+        "A harbour at dawn, sleek boats gliding with effortless grace.",
+        "A harbour at dawn in aerodynamic minimalism: sleek, streamlined hulls glide with "
+        "liquid grace and effortless speed, an elegant restraint in the light.",
+    ]
+    subtle = score_prompts(breed, prompts, "subtle")
+    strong = score_prompts(breed, prompts, "strong")
+    assert subtle[0]["score"] < subtle[1]["score"] < subtle[2]["score"]
+    assert [r["flag"] for r in subtle] == ["ok", "ok", "over"]
+    assert [r["flag"] for r in strong] == ["under", "under", "ok"]
+    assert subtle[2]["matched_terms"][0] == "aerodynamic"
+    assert all(0.0 <= r["score"] <= 1.0 for r in subtle)
+
+
+def test_literal_dog_detection():
+    """Test prompts adding a dog or naming the breed are marked"""
+    breed = get_breed_data("golden_retriever")
+    results = score_prompts(breed, [
+        "a golden retriever on the beach",
+        "puppies in a field",
+        "golden light over a field",
+    ])
+    assert [r["mentions_dog"] for r in results] == [True, True, False]
+
+
+def test_statistics_follow_active_database():
+    """Test word statistics are rebuilt for a new database"""
+    small = {"greyhound": BREED_DATABASE["greyhound"]}
+    try:
+        set_database(small)
+        assert get_word_statistics().breed_count == 1
+    finally:
+        set_database(BREED_DATABASE)
+    assert get_word_statistics().breed_count == len(BREED_DATABASE)
+    assert WordStatistics({}).breed_count == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
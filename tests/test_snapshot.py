@@ -0,0 +1,154 @@
+"""
+Tests for snapshot module
+"""
+
+import subprocess
+import sys
+
+import pytest
+from dog_breed_aesthetics_mcp.attributes import TermIndex, get_term_index
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE, get_database, set_database
+from dog_breed_aesthetics_mcp.catalog import CatalogIndex, get_catalog_index
+from dog_breed_aesthetics_mcp.changelog import breed_hash, get_change_log
+from dog_breed_aesthetics_mcp.compilers import BreedTagIndex, get_tag_index
+from dog_breed_aesthetics_mcp.diversity import DiversityIndex, get_diversity_index
+from dog_breed_aesthetics_mcp.features import FeatureTable, get_feature_table
+from dog_breed_aesthetics_mcp.scoring import WordStatistics, get_word_statistics
+from dog_breed_aesthetics_mcp.snapshot import (
+    Snapshot,
+    SnapshotError,
+    SnapshotVersionError,
+    build_snapshot,
+    describe_source,
+    install_snapshot
+)
+from dog_breed_aesthetics_mcp.synthetic import generate_breed_database
+
+
+@pytest.fixture
+def restore_database():
+    """Put the built-in database back after a test swaps it out"""
+    yield
+    set_database(BREED_DATABASE)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = tmp_path / "breeds.snap"
+    build_snapshot(BREED_DATABASE, path, describe_source())
+    return path
+
+
+def test_snapshot_database_roundtrip(snapshot_path):
+    """Test that every breed decodes back to the original entry"""
+    database = Snapshot(snapshot_path).database()
+    assert len(database) == len(BREED_DATABASE)
+    for breed_key, breed_data in BREED_DATABASE.items():
+        assert database[breed_key] == breed_data
+    assert database.get("invalid_breed") is None
+
+
+def test_install_snapshot_indexes_match_rebuild(snapshot_path, restore_database):
+    """Test that snapshot indexes answer exactly like freshly built ones"""
+    install_snapshot(snapshot_path, expected_source=describe_source())
+
+    term_index = get_term_index()
+    rebuilt = TermIndex(BREED_DATABASE)
+    assert term_index.vocabulary == rebuilt.vocabulary
+    for breed_key in BREED_DATABASE:
+        assert term_index.masks[breed_key] == rebuilt.masks[breed_key]
+
+    ranges = {"scale": (1.0, 2.5)}
+    assert get_feature_table().query(ranges, sort_by="energy") == \
+        FeatureTable(BREED_DATABASE).query(ranges, sort_by="energy")
+
+    catalog = CatalogIndex(BREED_DATABASE)
+    _, cursor, _ = catalog.page(page_size=5)
+    assert get_catalog_index().page(cursor, 5) == catalog.page(cursor, 5)
+    assert get_catalog_index().page(group="Toy") == catalog.page(group="Toy")
+
+    diversity = DiversityIndex(BREED_DATABASE)
+    assert get_diversity_index().masks == diversity.masks
+    assert get_diversity_index().select(get_diversity_index().candidates(group="toy"), 4) == \
+        diversity.select(diversity.candidates(group="toy"), 4)
+
+    statistics = WordStatistics(BREED_DATABASE)
+    assert get_word_statistics().breed_count == statistics.breed_count
+    assert get_word_statistics().document_frequency == statistics.document_frequency
+
+    tags = BreedTagIndex(BREED_DATABASE).tags
+    for breed_key in BREED_DATABASE:
+        assert get_tag_index().tags[breed_key] == tags[breed_key]
+
+
+def test_snapshot_stores_change_log_hashes(snapshot_path, restore_database):
+    """Test that stored hashes match rehashing, so installing the same catalog is no change"""
+    token, _ = get_change_log().snapshot()
+    snapshot = install_snapshot(snapshot_path, expected_source=describe_source())
+
+    database = snapshot.database()
+    assert database.content_hashes() == {
+        breed_key: breed_hash(breed_key, breed_data) for breed_key, breed_data in BREED_DATABASE.items()
+    }
+    assert get_change_log().changes_since(token)[1] == {}
+
+
+def test_snapshot_tags_use_snapshot_database_statistics(tmp_path, restore_database):
+    """Test that tags snapshotted for another database are ranked against that database"""
+    database = generate_breed_database(200, seed=3)
+    path = tmp_path / "synthetic.snap"
+    build_snapshot(database, path, describe_source(200, 3))
+    install_snapshot(path)
+
+    rebuilt = BreedTagIndex(database)
+    for breed_key in list(database)[:20]:
+        assert get_tag_index().tags[breed_key] == rebuilt.tags[breed_key]
+
+
+def test_snapshot_rejects_other_source(tmp_path, restore_database):
+    """Test that a snapshot of another database is refused and nothing changes"""
+    path = tmp_path / "synthetic.snap"
+    build_snapshot(generate_breed_database(20, seed=4), path, describe_source(20, 4))
+
+    with pytest.raises(SnapshotVersionError):
+        install_snapshot(path, expected_source=describe_source())
+    assert get_database() is BREED_DATABASE
+
+
+def test_snapshot_rejects_other_format(snapshot_path):
+    """Test that a snapshot with a different format version is refused"""
+    data = bytearray(snapshot_path.read_bytes())
+    data[8] += 1
+    snapshot_path.write_bytes(bytes(data))
+
+    with pytest.raises(SnapshotVersionError):
+        Snapshot(snapshot_path)
+
+
+def test_snapshot_rejects_corrupt_file(tmp_path):
+    """Test that non-snapshot and truncated files raise SnapshotError"""
+    path = tmp_path / "bad.snap"
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(SnapshotError):
+        Snapshot(path)
+
+    path.write_bytes(b"")
+    with pytest.raises(SnapshotError):
+        Snapshot(path)
+
+
+
+def test_command_line_builds_a_loadable_snapshot(tmp_path):
+    """Test the CLI module writes a snapshot without runpy's double-import warning"""
+    path = tmp_path / "breeds.snap"
+    completed = subprocess.run(
+        [sys.executable, "-W", "error::RuntimeWarning", "-m", "dog_breed_aesthetics_mcp.snapshot_cli", str(path)],
+        capture_output=True, text=True, check=True
+    )
+    assert completed.stderr == ""
+    assert "Wrote snapshot of" in completed.stdout
+    assert len(Snapshot(str(path)).database()) == len(BREED_DATABASE)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,70 @@
+"""
+Tests for synthetic module
+"""
+
+import math
+
+import pytest
+from dog_breed_aesthetics_mcp.breed_data import (
+    BREED_DATABASE,
+    get_breed_data,
+    get_database,
+    get_database_version,
+    set_database
+)
+from dog_breed_aesthetics_mcp.catalog import get_catalog_index
+from dog_breed_aesthetics_mcp.features import extract_features
+from dog_breed_aesthetics_mcp.synthetic import generate_breed_database
+
+
+@pytest.fixture
+def restore_database():
+    """Put the built-in database back after a test swaps it out"""
+    yield
+    set_database(BREED_DATABASE)
+
+
+def test_generator_is_deterministic():
+    """Test that the same seed yields the same database"""
+    assert generate_breed_database(50, seed=7) == generate_breed_database(50, seed=7)
+    assert generate_breed_database(50, seed=7) != generate_breed_database(50, seed=8)
+
+
+def test_generated_schema_matches_database():
+    """Test that synthetic breeds have the same structure as real ones"""
+    reference = BREED_DATABASE["golden_retriever"]
+    database = generate_breed_database(200, seed=1)
+
+    assert len(database) == 200
+    for breed_key, breed_data in database.items():
+        assert list(breed_data) == list(reference), f"{breed_key} has a different schema"
+        for category in ("proportions", "coat", "movement", "temperament_aesthetic"):
+            assert set(breed_data[category]) == set(reference[category])
+            assert all(breed_data[category].values())
+        assert breed_data["color_palette"]
+        assert breed_data["group"] in {b["group"] for b in BREED_DATABASE.values()}
+
+
+def test_generated_features_parse():
+    """Test that synthetic scale and coat length values parse numerically"""
+    for breed_data in generate_breed_database(100, seed=2).values():
+        features = extract_features(breed_data)
+        assert not math.isnan(features["scale"])
+        assert not math.isnan(features["coat_length"])
+
+
+def test_set_database_rebuilds_indexes(restore_database):
+    """Test that swapping the active database is picked up by lookups and indexes"""
+    database = generate_breed_database(30, seed=3)
+    version = get_database_version()
+
+    set_database(database)
+
+    assert get_database() is database
+    assert get_database_version() != version
+    assert get_breed_data("golden_retriever") is None
+    assert get_catalog_index().page(page_size=100)[2] == 30
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
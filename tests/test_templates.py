@@ -0,0 +1,113 @@
+"""
+Tests for templates module
+"""
+
+import pytest
+from dog_breed_aesthetics_mcp import server, templates
+from dog_breed_aesthetics_mcp.breed_data import get_breed_data
+from dog_breed_aesthetics_mcp.templates import (
+    MAX_TEMPLATES,
+    PLACEHOLDERS,
+    SynthesisTemplate,
+    register_template,
+    render_instruction
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_templates():
+    """Drop templates registered by a test"""
+    saved = dict(templates._templates)
+    yield
+    templates._templates.clear()
+    templates._templates.update(saved)
+    templates.clear_render_cache()
+
+
+def test_builtin_templates_render_breed_fields():
+    """Test both built-in templates fill in breed data and the base prompt"""
+    breed = get_breed_data("greyhound")
+    for name in ("prose", "tags"):
+        text = render_instruction(name, breed, "strong", "a quiet harbour")
+        assert "Greyhound" in text
+        assert '"a quiet harbour"' in text
+        assert breed["visual_essence"] in text
+        assert "{" not in text
+
+
+def test_every_placeholder_renders():
+    """Test a template using every placeholder"""
+    source = " | ".join("{" + placeholder + "}" for placeholder in PLACEHOLDERS)
+    template = SynthesisTemplate("all", source)
+    breed = get_breed_data("corgi")
+    text = template.render(breed, "subtle", "BASE")
+    assert text.startswith("Pembroke Welsh Corgi | Herding | ")
+    assert breed["coat"]["texture"] in text
+    assert text.endswith("subtle | Gentle influence, mostly preserve original tone | BASE")
+
+
+def test_validation_errors():
+    """Test malformed templates are rejected at registration"""
+    invalid = [
+        "",
+        "no prompt placeholder for {breed_name}",
+        "{base_prompt} {unknown}",
+        "{base_prompt} {breed_name!r}",
+        "{base_prompt} {breed_name:>10}",
+        "{base_prompt} {unclosed",
+    ]
+    for source in invalid:
+        with pytest.raises(ValueError):
+            register_template("custom", source)
+    with pytest.raises(ValueError):
+        register_template("Bad Name", "{base_prompt}")
+    with pytest.raises(ValueError):
+        register_template("prose", "{base_prompt}")
+
+
+def test_literal_braces_and_base_prompt_not_interpreted():
+    """Test escaped braces render literally and the base prompt is inserted verbatim"""
+    register_template("json", '{{"prompt": "{base_prompt}", "style": "{breed_name}"}}')
+    text = render_instruction("json", get_breed_data("pug"), "moderate", "{breed_name}")
+    assert text == '{"prompt": "{breed_name}", "style": "Pug"}'
+
+
+def test_render_cache_follows_template_and_breed_changes():
+    """Test cached chunks are reused, and replaced when the template or breed changes"""
+    breed = get_breed_data("boxer")
+    register_template("short", "{breed_name}: {base_prompt}")
+    assert render_instruction("short", breed, "moderate", "one") == "Boxer: one"
+    assert render_instruction("short", breed, "moderate", "two") == "Boxer: two"
+    assert len(templates._prerendered) == 1
+
+    register_template("short", "{base_prompt} ({breed_name})")
+    assert render_instruction("short", breed, "moderate", "three") == "three (Boxer)"
+
+    edited = {**breed, "name": "Boxer", "group": "Edited"}
+    register_template("grouped", "{breed_group}: {base_prompt}")
+    assert render_instruction("grouped", breed, "moderate", "x") == "Working: x"
+    assert render_instruction("grouped", edited, "moderate", "x") == "Edited: x"
+
+    with pytest.raises(KeyError):
+        render_instruction("missing", breed, "moderate", "x")
+
+
+
+def test_registered_templates_are_capped():
+    """Test new names are refused past MAX_TEMPLATES while existing ones can still be replaced"""
+    for name in templates.get_template_names():
+        if not templates.get_template(name).builtin:
+            del templates._templates[name]
+    for i in range(MAX_TEMPLATES):
+        register_template(f"custom-{i}", "{base_prompt} " + str(i))
+    result = server.register_synthesis_template("one-too-many", "{base_prompt}")
+    assert str(MAX_TEMPLATES) in result["error"]
+    assert server.register_synthesis_template("custom-0", "{breed_name}: {base_prompt}")["status"] == "registered"
+
+    missing = server.enhance_with_breed_aesthetic("Pug", "x", template="one-too-many")
+    assert missing["error"] == "Template 'one-too-many' not found"
+    assert server.enhance_with_breed_aesthetic("Pug", "x", template="custom-0")["synthesis_instruction"] == "Pug: x"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
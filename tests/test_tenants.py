@@ -0,0 +1,114 @@
+"""
+Tests for tenants module
+"""
+
+import copy
+
+import pytest
+from dog_breed_aesthetics_mcp.breed_data import BREED_DATABASE
+from dog_breed_aesthetics_mcp.tenants import DATA_DIR_NAME, TenantStore, default_tenant_db, merge_breed, validate_breed
+
+
+def _custom_breed(name="Studio Whippet"):
+    breed_data = copy.deepcopy(BREED_DATABASE["italian_greyhound"])
+    breed_data["name"] = name
+    return breed_data
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TenantStore(str(tmp_path / "tenants.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_register_and_lookup_falls_through(store):
+    """Test tenant breeds first, then built-in breeds"""
+    store.register("acme", "studio_whippet", _custom_breed())
+
+    assert store.lookup("acme", "studio_whippet")["name"] == "Studio Whippet"
+    assert store.lookup("acme", "greyhound")["name"] == "Greyhound"
+    assert store.lookup("other", "studio_whippet") is None
+    assert store.lookup(None, "pug")["name"] == "Pug"
+
+
+def test_tenant_breed_shadows_builtin(store):
+    """Test that a tenant can override a built-in breed for itself only"""
+    store.register("acme", "pug", _custom_breed("Acme Pug"))
+    assert store.lookup("acme", "pug")["name"] == "Acme Pug"
+    assert store.lookup("other", "pug")["name"] == "Pug"
+
+
+def test_update_merges_nested_fields(store):
+    """Test partial updates and their persistence"""
+    store.register("acme", "studio_whippet", _custom_breed())
+    store.update("acme", "studio_whippet", {"coat": {"length": "long"}, "scale": "small"})
+
+    reopened = TenantStore(store.path)
+    breed_data = reopened.get("acme", "studio_whippet")
+    reopened.close()
+    assert breed_data["coat"]["length"] == "long"
+    assert breed_data["coat"]["texture"] == BREED_DATABASE["italian_greyhound"]["coat"]["texture"]
+    assert breed_data["scale"] == "small"
+
+    with pytest.raises(KeyError):
+        store.update("acme", "missing", {"scale": "toy"})
+
+
+def test_delete(store):
+    """Test deleting custom breeds"""
+    store.register("acme", "studio_whippet", _custom_breed())
+    assert store.delete("acme", "studio_whippet") is True
+    assert store.delete("acme", "studio_whippet") is False
+    assert store.get("acme", "studio_whippet") is None
+
+
+def test_default_path_is_in_the_data_directory(tmp_path, monkeypatch):
+    """Test the database defaults to the data directory rather than the working directory"""
+    monkeypatch.delenv("DOG_BREED_TENANT_DB", raising=False)
+    monkeypatch.delenv("DOG_BREED_DATA_DIR", raising=False)
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "xdg"))
+    assert default_tenant_db() == str(tmp_path / "xdg" / DATA_DIR_NAME / "custom_breeds.sqlite3")
+
+    monkeypatch.setenv("DOG_BREED_DATA_DIR", str(tmp_path / "data"))
+    store = TenantStore()
+    store.close()
+    assert store.path == str(tmp_path / "data" / "custom_breeds.sqlite3")
+    assert (tmp_path / "data" / "custom_breeds.sqlite3").exists()
+
+    monkeypatch.setenv("DOG_BREED_TENANT_DB", str(tmp_path / "explicit.sqlite3"))
+    assert default_tenant_db() == str(tmp_path / "explicit.sqlite3")
+
+
+def test_validation():
+    """Test schema validation of custom breeds"""
+    validate_breed(_custom_breed())
+
+    with pytest.raises(ValueError, match="missing"):
+        validate_breed({"name": "Incomplete"})
+    with pytest.raises(ValueError, match="coat"):
+        validate_breed(merge_breed(_custom_breed(), {"coat": {"colour": "red"}}))
+    with pytest.raises(ValueError, match="color_palette"):
+        validate_breed(dict(_custom_breed(), color_palette="red"))
+
+
+def test_lru_evicts_under_memory_cap(tmp_path):
+    """Test that least recently used registries are unloaded past the byte cap"""
+    store = TenantStore(str(tmp_path / "tenants.sqlite3"), max_bytes=1)
+    for tenant_id in ("a", "b", "c"):
+        store.register(tenant_id, "studio_whippet", _custom_breed())
+
+    store.registry("a")
+    store.registry("b")
+    stats = store.stats()
+    assert stats["loaded_tenants"] == 1
+    assert stats["evictions"] == 1
+
+    # Evicted tenants reload transparently
+    assert store.get("a", "studio_whippet")["name"] == "Studio Whippet"
+    assert store.stats()["loads"] == 3
+    store.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+"""
+Tests for tracing module
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastmcp import Client
+from dog_breed_aesthetics_mcp import server, tracing
+from dog_breed_aesthetics_mcp.tracing import (
+    NOOP_SPAN,
+    TracingMiddleware,
+    configure_tracing,
+    current_span,
+    span
+)
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    """Trace to a temporary JSON-lines file, switching tracing off afterwards"""
+    path = tmp_path / "spans.jsonl"
+    configure_tracing(str(path), server.mcp)
+    yield path
+    configure_tracing(None, server.mcp)
+
+
+def _spans(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_disabled_tracing_is_noop():
+    """Test spans are a shared no-op and no middleware is installed when off"""
+    configure_tracing(None, server.mcp)
+    assert span("lookup") is NOOP_SPAN
+    assert current_span() is NOOP_SPAN
+    assert not any(isinstance(m, TracingMiddleware) for m in server.mcp.middleware)
+    assert server.get_breed_characteristics("Pug")["name"] == "Pug"
+
+
+def test_local_spans_nest_and_export(trace_file):
+    """Test nested spans share a trace, link to their parent and carry attributes"""
+    with span("outer", {"a": 1}) as outer:
+        with span("inner") as inner:
+            inner.set_attribute("b", True)
+            assert current_span() is inner
+        assert current_span() is outer
+    inner_span, outer_span = _spans(trace_file)
+    assert inner_span["name"] == "inner"
+    assert inner_span["parent_id"] == outer_span["context"]["span_id"]
+    assert inner_span["context"]["trace_id"] == outer_span["context"]["trace_id"]
+    assert outer_span["parent_id"] is None
+    assert inner_span["attributes"] == {"b": True}
+    assert outer_span["start_time"] <= inner_span["start_time"]
+
+
+def test_exceptions_mark_span_as_error(trace_file):
+    """Test a failing stage is exported with error status"""
+    with pytest.raises(KeyError):
+        with span("lookup"):
+            raise KeyError("missing")
+    (exported,) = _spans(trace_file)
+    assert exported["status"]["status_code"] == "ERROR"
+    assert exported["attributes"]["error.type"] == "KeyError"
+
+
+def test_tool_call_stages(trace_file):
+    """Test a tool call yields dispatch, body, lookup, render and serialize spans"""
+    async def run():
+        async with Client(server.mcp) as client:
+            for _ in range(2):
+                await client.call_tool(
+                    "enhance_with_breed_aesthetic",
+                    {"breed_name": "Greyhound", "base_prompt": "a harbour", "emphasis_level": "strong"}
+                )
+    asyncio.run(run())
+
+    spans = _spans(trace_file)
+    by_name = {}
+    for exported in spans:
+        by_name.setdefault(exported["name"], []).append(exported)
+    dispatch = by_name["tool.dispatch"][0]
+    body = by_name["tool.body"][0]
+    lookup = by_name["lookup"][0]
+    assert body["parent_id"] == dispatch["context"]["span_id"]
+    assert lookup["parent_id"] == body["context"]["span_id"]
+    assert lookup["attributes"]["breed.key"] == "greyhound"
+    assert lookup["attributes"]["lookup.hit"] is True
+    assert by_name["render"][0]["attributes"]["emphasis_level"] == "strong"
+    assert by_name["render"][1]["attributes"]["template.cache_hit"] is True
+    serialize = by_name["serialize"][0]
+    assert serialize["parent_id"] == dispatch["context"]["span_id"]
+    assert serialize["attributes"]["response.bytes"] == dispatch["attributes"]["response.bytes"] > 0
+
+
+def test_otel_mode_uses_api_tracer():
+    """Test otel mode hands spans to the OpenTelemetry API"""
+    try:
+        configure_tracing("otel")
+        assert tracing.tracing_mode() == "otel"
+        with span("lookup", {"breed.key": "pug"}) as active:
+            active.set_attribute("lookup.hit", True)
+        assert server.get_breed_characteristics("Pug")["name"] == "Pug"
+    finally:
+        configure_tracing(None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,103 @@
+"""
+Tests for breed variants
+"""
+
+import copy
+
+import pytest
+from dog_breed_aesthetics_mcp.breed_data import (
+    BREED_DATABASE,
+    VARIANT_DATABASE,
+    get_breed_data,
+    get_breed_names,
+    get_variant_keys,
+    invalidate_variants,
+    normalize_breed_name,
+    register_variant,
+    resolve_variant,
+    set_database
+)
+
+
+@pytest.fixture
+def restore_variants():
+    """Undo variant registrations and database swaps made by a test"""
+    saved = copy.deepcopy(VARIANT_DATABASE)
+    yield
+    VARIANT_DATABASE.clear()
+    VARIANT_DATABASE.update(saved)
+    set_database(BREED_DATABASE)
+    invalidate_variants()
+
+
+def test_variant_inherits_and_overrides():
+    """Test that variants take parent fields and apply their own"""
+    poodle = BREED_DATABASE["poodle"]
+    toy = get_breed_data("toy_poodle")
+
+    assert toy["name"] == "Toy Poodle"
+    assert toy["group"] == "Toy"
+    assert toy["scale"] == "toy"
+    assert toy["proportions"]["build"] == "fine-boned, dainty, refined"
+    assert toy["proportions"]["head"] == poodle["proportions"]["head"]
+    assert toy["color_palette"] == poodle["color_palette"]
+
+
+def test_variant_shares_unchanged_fields():
+    """Test that unchanged categories are shared with the parent, not copied"""
+    poodle = BREED_DATABASE["poodle"]
+    toy = get_breed_data("toy_poodle")
+
+    assert toy["coat"] is poodle["coat"]
+    assert toy["proportions"] is not poodle["proportions"]
+    assert poodle["proportions"]["build"] == "elegant, athletic, refined"
+
+
+def test_nested_variant_resolution():
+    """Test variants of variants"""
+    apricot = get_breed_data("apricot_toy_poodle")
+    assert apricot["scale"] == "toy"
+    assert apricot["color_palette"][0] == "apricot"
+    assert "apricot_toy_poodle" in get_variant_keys("poodle")
+    assert get_variant_keys("toy_poodle") == ["apricot_toy_poodle"]
+
+
+def test_resolved_views_are_cached_and_follow_parent_changes(restore_variants):
+    """Test caching and invalidation when the parent entry is replaced"""
+    assert resolve_variant("toy_poodle") is resolve_variant("toy_poodle")
+
+    database = dict(BREED_DATABASE)
+    database["poodle"] = dict(BREED_DATABASE["poodle"], visual_essence="changed essence")
+    set_database(database)
+    assert get_breed_data("miniature_poodle")["visual_essence"] != "changed essence"
+
+    del VARIANT_DATABASE["miniature_poodle"]["overrides"]["visual_essence"]
+    invalidate_variants("miniature_poodle")
+    assert get_breed_data("miniature_poodle")["visual_essence"] == "changed essence"
+
+
+def test_register_variant_and_bad_chains(restore_variants):
+    """Test registering variants, including ones that cannot resolve"""
+    register_variant("fawn_pug", "pug", "Fawn Pug", {"color_palette": ["fawn"]})
+    assert get_breed_data("fawn_pug")["color_palette"] == ["fawn"]
+
+    register_variant("orphan", "no_such_breed", "Orphan", {})
+    assert get_breed_data("orphan") is None
+
+    register_variant("loop_a", "loop_b", "A", {})
+    register_variant("loop_b", "loop_a", "B", {})
+    assert get_breed_data("loop_a") is None
+    # Listing walks each ancestry once, so a cycle cannot hang it
+    assert get_variant_keys("pug") == ["fawn_pug"]
+    assert "loop_a" not in get_variant_keys("poodle")
+
+
+def test_variants_do_not_change_breed_listing():
+    """Test that variants resolve by name but are not listed as breeds"""
+    assert normalize_breed_name("Cardigan Welsh Corgi") == "cardigan_corgi"
+    assert get_breed_data(normalize_breed_name("Toy Poodle"))["name"] == "Toy Poodle"
+    assert len(get_breed_names()) == len(BREED_DATABASE)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
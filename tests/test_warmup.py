@@ -0,0 +1,97 @@
+"""
+Tests for warmup module
+"""
+
+import json
+import threading
+
+import pytest
+from starlette.testclient import TestClient
+from dog_breed_aesthetics_mcp import server, templates
+from dog_breed_aesthetics_mcp.breed_data import get_breed_data
+from dog_breed_aesthetics_mcp.warmup import Warmup, count_requested_breeds, most_requested_breeds, warm_caches
+
+
+def _write_recording(path, calls):
+    with open(path, "w", encoding="utf-8") as f:
+        for i, (tool, args) in enumerate(calls):
+            f.write(json.dumps({"ts": float(i), "tool": tool, "args": args, "ms": 1.0, "ok": True}) + "\n")
+        f.write('{"ts": 99, "tool": "trunc')
+
+
+def test_count_requested_breeds_reads_every_breed_argument():
+    """Test breed names are counted from all breed arguments and normalized"""
+    counts = count_requested_breeds([
+        {"args": {"breed_name": "Greyhound"}},
+        {"args": {"start_breed": "greyhound", "end_breed": "Pembroke Welsh Corgi"}},
+        {"args": {"breed_names": ["Pug", "Corgi"]}},
+        {"args": {"page_size": 10}},
+    ])
+    assert counts == {"greyhound": 2, "corgi": 2, "pug": 1}
+
+
+def test_most_requested_breeds_ranks_recorded_breeds_first(tmp_path):
+    """Test recorded breeds come first, unknown names are dropped and the catalog fills the rest"""
+    path = tmp_path / "calls.jsonl"
+    _write_recording(path, [
+        ("enhance_with_breed_aesthetic", {"breed_name": "Pug"}),
+        ("enhance_with_breed_aesthetic", {"breed_name": "Pug"}),
+        ("get_breed_characteristics", {"breed_name": "Toy Poodle"}),
+        ("get_breed_characteristics", {"breed_name": "Not A Breed"}),
+    ])
+    keys = most_requested_breeds(5, str(path))
+    assert keys[:2] == ["pug", "toy_poodle"]
+    assert len(keys) == 5 and len(set(keys)) == 5
+
+    assert most_requested_breeds(3, str(tmp_path / "missing.jsonl")) == most_requested_breeds(3)
+
+
+def test_warm_caches_prerenders_every_template_and_emphasis():
+    """Test warmup fills the render cache so the first real call is a cache hit"""
+    templates.clear_render_cache()
+    warmed = warm_caches(["greyhound", "pug"])
+    assert warmed["prerendered"] == 2 * len(templates.get_template_names()) * 3
+    assert warmed["compiled"] == 2 * 3 * 3
+    assert ("prose", get_breed_data("pug")["name"], "strong") in templates._prerendered
+
+
+def test_warmup_runs_once_and_reports_status():
+    """Test a Warmup runs a single time however it is started, and disabled warmup is ready at once"""
+    warmup = Warmup(breed_count=3)
+    assert warmup.status() == {"ready": False, "state": "pending"}
+    warmup.start()
+    assert warmup.run() is True
+    warmup.start()
+    status = warmup.status()
+    assert status["state"] == "ready" and status["warmed"]["breeds"] == 3
+
+    assert Warmup(enabled=False).status() == {"ready": True, "state": "ready"}
+
+
+def test_readyz_reports_ready_only_after_warmup(monkeypatch):
+    """Test /healthz is always up and /readyz returns 503 until warmup finishes"""
+    release = threading.Event()
+    warmup = Warmup(breed_count=3)
+    original = warmup._run
+
+    def slow_run():
+        release.wait(5)
+        original()
+
+    monkeypatch.setattr(warmup, "_run", slow_run)
+    monkeypatch.setattr(server, "_warmup", warmup)
+    with TestClient(server.http_app()) as client:
+        assert client.get("/healthz").json() == {"status": "ok"}
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["state"] == "warming"
+
+        release.set()
+        assert warmup.wait(5)
+        response = client.get("/readyz")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])